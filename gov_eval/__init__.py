@@ -0,0 +1,33 @@
+"""watsonx Governance prompt evaluation core (UI-independent)
+
+The names below are loaded from their modules on first access, so importing
+one submodule (such as ``gov_eval.instrumentation``) does not pull in the
+guardrail and evaluator stacks.
+"""
+import importlib
+
+_EXPORTS = {
+    'Detector': 'gov_eval.detectors',
+    'evaluate_guardrails_batch': 'gov_eval.guardrails',
+    'evaluate_guardrails_realtime': 'gov_eval.guardrails',
+    'evaluate_guardrails_stream': 'gov_eval.guardrails',
+    'get_available_evaluators': 'gov_eval.evaluators',
+    'get_detectors': 'gov_eval.detectors',
+    'register_detector': 'gov_eval.detectors',
+    'scan_text': 'gov_eval.guardrails',
+    'simulate_evaluation': 'gov_eval.evaluators',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
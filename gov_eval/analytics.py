@@ -0,0 +1,109 @@
+"""Aggregations behind the evaluation analytics dashboard
+
+Everything here reduces history rows to small frames on the server so the
+browser only receives aggregates. Per-bucket means and failure counts come
+from ``EvaluationHistory.bucket_stats`` (SQLite ``GROUP BY``); the functions
+below derive trends, rates, percentiles and histograms from those or from the
+raw values of a single evaluator and metric, using grouped pandas and NumPy
+operations rather than Python loops over rows. ``downsample`` bounds the
+points in any series that is still too long to plot.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Bucket sizes the dashboard picks from, smallest first
+BUCKET_SECONDS = (60, 5 * 60, 15 * 60, 60 * 60, 6 * 60 * 60, 24 * 60 * 60, 7 * 24 * 60 * 60)
+TARGET_BUCKETS = 200
+MAX_PLOT_POINTS = 2000
+
+SERIES_KEYS = ['model', 'evaluator', 'metric']
+
+
+def choose_bucket_seconds(span_seconds: float, target_buckets: int = TARGET_BUCKETS) -> int:
+    """Smallest standard bucket that splits ``span_seconds`` into at most ``target_buckets`` buckets"""
+    for seconds in BUCKET_SECONDS:
+        if span_seconds / seconds <= target_buckets:
+            return seconds
+    return BUCKET_SECONDS[-1]
+
+
+def rolling_trend(stats: pd.DataFrame, window: int = 5) -> pd.DataFrame:
+    """Add a count-weighted ``rolling_mean`` over the last ``window`` buckets of each series in ``bucket_stats``"""
+    stats = stats[stats['metric'].notna() & (stats['count'] > 0)].sort_values('bucket').copy()
+    stats['weighted'] = stats['mean'] * stats['count']
+    rolled = (stats.groupby(SERIES_KEYS, sort=False)[['weighted', 'count']]
+              .rolling(window, min_periods=1).sum()
+              .reset_index(level=list(range(len(SERIES_KEYS))), drop=True))
+    stats['rolling_mean'] = rolled['weighted'] / rolled['count']
+    return stats.drop(columns='weighted')
+
+
+def failure_rates(stats: pd.DataFrame, keys: Sequence[str] = ('evaluator', 'metric'),
+                  over_time: bool = True) -> pd.DataFrame:
+    """Share of failing rows per ``keys`` (and per bucket when ``over_time``), from ``bucket_stats``.
+
+    For guardrails rows the metric is the detector, so this is the violation
+    rate per detector; for evaluators it is the failure or timeout rate.
+    """
+    group_keys = list(keys) + (['bucket'] if over_time else [])
+    totals = stats.groupby(group_keys, dropna=False, sort=True)[['failures', 'rows']].sum().reset_index()
+    totals['rate'] = totals['failures'] / totals['rows']
+    return totals
+
+
+def metric_percentiles(values: pd.DataFrame, quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+                       by: str = 'model') -> pd.DataFrame:
+    """Quantiles of ``value`` per ``by`` group, one column per quantile (``p5``, ``p50``, ...), plus ``count``"""
+    values = values[values['value'].notna()]
+    grouped = values.groupby(by)['value']
+    table = grouped.quantile(list(quantiles)).unstack()
+    table.columns = [f"p{q * 100:g}" for q in quantiles]
+    table['mean'] = grouped.mean()
+    table['count'] = grouped.size()
+    return table.reset_index()
+
+
+def metric_histogram(values: pd.DataFrame, bins: int = 30, by: str = 'model') -> pd.DataFrame:
+    """Histogram counts of ``value`` per ``by`` group over shared bin edges"""
+    values = values[values['value'].notna()]
+    if values.empty:
+        return pd.DataFrame(columns=[by, 'bin_start', 'bin_end', 'count'])
+    edges = np.histogram_bin_edges(values['value'].to_numpy(), bins=bins)
+    # Bin every value at once, then count per (group, bin)
+    bin_index = np.clip(np.searchsorted(edges, values['value'].to_numpy(), side='right') - 1, 0, len(edges) - 2)
+    counts = (pd.DataFrame({by: values[by].to_numpy(), 'bin': bin_index})
+              .groupby([by, 'bin']).size().rename('count').reset_index())
+    counts['bin_start'] = edges[counts['bin']]
+    counts['bin_end'] = edges[counts['bin'] + 1]
+    return counts[[by, 'bin_start', 'bin_end', 'count']]
+
+
+def downsample(frame: pd.DataFrame, x: str, y: str, max_points: int = MAX_PLOT_POINTS,
+               by: Optional[List[str]] = None) -> pd.DataFrame:
+    """Keep at most about ``max_points`` rows per series, preserving each bucket's minimum and maximum.
+
+    Each series (``by`` groups, sorted on ``x``) is cut into ``max_points / 2``
+    equal-count buckets and only the rows holding each bucket's lowest and
+    highest ``y`` are kept, so spikes survive. Short series are returned whole.
+    """
+    frame = frame.sort_values((by or []) + [x])
+    if by:
+        position = frame.groupby(by, sort=False).cumcount().to_numpy()
+        size = frame.groupby(by, sort=False)[x].transform('size').to_numpy()
+    else:
+        position = np.arange(len(frame))
+        size = np.full(len(frame), len(frame))
+    if size.max(initial=0) <= max_points:
+        return frame
+
+    buckets = max(max_points // 2, 1)
+    bucket = position * buckets // size
+    keys = ([frame[key].to_numpy() for key in by] if by else []) + [bucket]
+    y_values = frame[y].reset_index(drop=True)
+    grouped = y_values.groupby(keys, sort=False)
+    keep = np.union1d(grouped.idxmin().dropna().to_numpy(dtype=int), grouped.idxmax().dropna().to_numpy(dtype=int))
+    # Series short enough already are kept whole
+    keep = np.union1d(keep, np.flatnonzero(size <= max_points))
+    return frame.iloc[keep]
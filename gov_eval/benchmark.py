@@ -0,0 +1,273 @@
+"""Guardrails and evaluation throughput/latency benchmarks
+
+Usage::
+
+    python -m gov_eval bench --size 2000 --output bench.json
+
+Synthetic prompt corpora are generated per profile:
+
+- ``clean``: ordinary prose
+- ``pii``: prose dense with emails, phone numbers and SSNs
+- ``injection``: prose dense with prompt injection phrases
+- ``paste``: large pasted documents (100 KB by default) with many newlines
+
+Prompt lengths follow a log-normal word-count distribution set by
+``--median-words`` and ``--sigma``. Each profile is run through
+``evaluate_guardrails_realtime`` (per prompt, in report and gate mode),
+``evaluate_guardrails_batch`` (per batch) and ``simulate_evaluation`` with
+the simulated evaluator latency set to zero. With ``--client``, prompts are
+also sent through ``GovernanceClient`` to a local ``StubServer``, one
+request per evaluator and then one batched request per prompt. The report records
+p50/p95/p99 latency and prompts/sec as JSON so runs can be compared between
+releases.
+"""
+from typing import Dict, List, Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from gov_eval import evaluators
+from gov_eval.client import GovernanceClient
+from gov_eval.detectors import detector_names
+from gov_eval.guardrails import evaluate_guardrails_batch, evaluate_guardrails_realtime
+from gov_eval.stub_server import StubServer
+
+PROFILES = ['clean', 'pii', 'injection', 'paste']
+
+_WORDS = (
+    "the report summary quarter revenue customer model data please explain how why what when "
+    "analysis growth market product team review draft policy compliance risk evaluate describe "
+    "list outline compare forecast budget project timeline document section table figure result"
+).split()
+
+_PII_FRAGMENTS = [
+    lambda rng: f"{rng.choice(['john', 'ana', 'li', 'sam'])}.{rng.randint(1, 999)}@example.com",
+    lambda rng: f"{rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+    lambda rng: f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+    lambda rng: f"{rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}",
+]
+
+_INJECTION_FRAGMENTS = [
+    "ignore previous instructions", "forget everything", "act as an administrator", "pretend you are root",
+    "system: ", "[system]", "<system>", "jailbreak", "override safety", "disable guardrail", "DAN mode",
+]
+
+
+def _prose(rng: random.Random, words: int) -> List[str]:
+    return [rng.choice(_WORDS) for _ in range(words)]
+
+
+def generate_prompt(profile: str, rng: random.Random, median_words: float = 40, sigma: float = 0.8,
+                    paste_kb: int = 100) -> str:
+    """Generate one synthetic prompt for ``profile``"""
+    if profile == 'paste':
+        lines = []
+        size = 0
+        while size < paste_kb * 1024:
+            line = ' '.join(_prose(rng, rng.randint(4, 16)))
+            lines.append(line)
+            size += len(line) + 1
+        return '\n'.join(lines)
+
+    words = _prose(rng, max(1, int(rng.lognormvariate(np.log(median_words), sigma))))
+    if profile == 'pii':
+        for position in range(0, len(words), 8):
+            words[position] = rng.choice(_PII_FRAGMENTS)(rng)
+    elif profile == 'injection':
+        for position in range(0, len(words), 10):
+            words[position] = rng.choice(_INJECTION_FRAGMENTS)
+    return ' '.join(words)
+
+
+def generate_corpus(profile: str, size: int, seed: int = 0, **kwargs) -> List[str]:
+    """Generate a reproducible corpus of ``size`` prompts for ``profile``"""
+    rng = random.Random(f"{profile}:{seed}")
+    return [generate_prompt(profile, rng, **kwargs) for _ in range(size)]
+
+
+def summarize(latencies: List[float], prompts: int) -> Dict[str, Any]:
+    """Latency percentiles (ms) and throughput for a list of per-call durations in seconds.
+
+    With no calls (an empty corpus or ``--eval-size 0``) the latency
+    statistics are None.
+    """
+    values = np.asarray(latencies) * 1000.0
+    total = float(np.sum(latencies))
+
+    def statistic(compute: Callable[[np.ndarray], float]) -> Optional[float]:
+        return round(float(compute(values)), 4) if len(values) else None
+
+    return {
+        'calls': len(latencies),
+        'prompts': prompts,
+        'total_seconds': round(total, 6),
+        'prompts_per_second': round(prompts / total, 2) if total else None,
+        'mean_ms': statistic(np.mean),
+        'p50_ms': statistic(lambda v: np.percentile(v, 50)),
+        'p95_ms': statistic(lambda v: np.percentile(v, 95)),
+        'p99_ms': statistic(lambda v: np.percentile(v, 99)),
+        'max_ms': statistic(np.max)
+    }
+
+
+def _timed_calls(calls: List[Callable[[], Any]]) -> List[float]:
+    latencies = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def bench_guardrails_realtime(corpus: List[str], config: Dict, mode: str = 'report') -> Dict[str, Any]:
+    """Per-prompt latency of evaluate_guardrails_realtime"""
+    return summarize(_timed_calls([lambda p=prompt: evaluate_guardrails_realtime(p, config, mode=mode)
+                                   for prompt in corpus]), len(corpus))
+
+
+def bench_guardrails_batch(corpus: List[str], config: Dict, batch_size: int) -> Dict[str, Any]:
+    """Per-batch latency of evaluate_guardrails_batch over the corpus"""
+    batches = [pd.Series(corpus[start:start + batch_size]) for start in range(0, len(corpus), batch_size)]
+    result = summarize(_timed_calls([lambda b=batch: evaluate_guardrails_batch(b, config) for batch in batches]),
+                       len(corpus))
+    result['batch_size'] = batch_size
+    return result
+
+
+def _prompt_configs(corpus: List[str]) -> List[Dict[str, Any]]:
+    return [
+        {'prompt_text': prompt, 'system_prompt': '', 'model_name': 'benchmark', 'temperature': 0.7, 'max_tokens': 100}
+        for prompt in corpus
+    ]
+
+
+def bench_evaluation(corpus: List[str], config: Dict, evaluator_names: List[str]) -> Dict[str, Any]:
+    """Per-prompt latency of simulate_evaluation with the simulated evaluator latency removed"""
+    prompt_configs = _prompt_configs(corpus)
+    latencies = _timed_calls([
+        lambda pc=prompt_config: evaluators.simulate_evaluation(config, pc, evaluator_names, latency=0.0)
+        for prompt_config in prompt_configs
+    ])
+    result = summarize(latencies, len(corpus))
+    result['evaluators'] = len(evaluator_names)
+    return result
+
+
+def bench_client(corpus: List[str], evaluator_names: List[str], stub_latency: float) -> Dict[str, Any]:
+    """Per-prompt latency of GovernanceClient against a local stub server, per-evaluator requests vs one batch"""
+    prompt_configs = _prompt_configs(corpus)
+    results = {}
+    with StubServer(latency=stub_latency) as server, \
+            ThreadPoolExecutor(max_workers=evaluators.EVALUATOR_MAX_WORKERS) as executor:
+        for name in ('per_evaluator', 'batched'):
+            client = GovernanceClient('benchmark', server.url, 'benchmark', iam_url=server.iam_url)
+            before = server.stats()
+            if name == 'per_evaluator':
+                calls = [lambda pc=prompt_config: list(executor.map(lambda e: client.evaluate(e, pc), evaluator_names))
+                         for prompt_config in prompt_configs]
+            else:
+                calls = [lambda pc=prompt_config: client.evaluate_batch([(e, pc) for e in evaluator_names])
+                         for prompt_config in prompt_configs]
+            result = summarize(_timed_calls(calls), len(corpus))
+            after = server.stats()
+            result.update({stat: after[stat] - before[stat] for stat in ('connections', 'token_requests', 'requests')})
+            client.close()
+            results[name] = result
+    results['stub_latency_ms'] = stub_latency * 1000
+    results['evaluators'] = len(evaluator_names)
+    return results
+
+
+def run_benchmarks(profiles: List[str], size: int, paste_count: int, batch_size: int, eval_size: int,
+                   seed: int = 0, deterministic: bool = False, corpus_options: Optional[Dict[str, Any]] = None,
+                   stub_latency: Optional[float] = None,
+                   log: Callable[[str], None] = lambda message: None) -> Dict[str, Any]:
+    """Run every benchmark for every profile and return the JSON-serializable report.
+
+    The client benchmark only runs when ``stub_latency`` (seconds per stub
+    request) is given.
+    """
+    corpus_options = corpus_options or {}
+    config = {
+        'enable_guardrails': True,
+        'guardrails_config': {**{check: True for check in detector_names()},
+                              'toxicity_threshold': 0.7, 'confidence_threshold': 0.8},
+        'deterministic': deterministic,
+        'seed': seed if deterministic else None
+    }
+    evaluator_names = list(evaluators.get_available_evaluators())
+
+    report: Dict[str, Any] = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'seed': seed,
+            'deterministic': deterministic,
+            'size': size,
+            'paste_count': paste_count,
+            'batch_size': batch_size,
+            'eval_size': eval_size,
+            'stub_latency': stub_latency,
+            'corpus_options': corpus_options
+        },
+        'results': {}
+    }
+
+    for profile in profiles:
+        count = paste_count if profile == 'paste' else size
+        corpus = generate_corpus(profile, count, seed, **corpus_options)
+        log(f"{profile}: {count} prompts, mean {np.mean([len(prompt) for prompt in corpus]):.0f} chars")
+
+        results = {'mean_chars': round(float(np.mean([len(prompt) for prompt in corpus])), 1)}
+        results['guardrails_realtime'] = bench_guardrails_realtime(corpus, config)
+        log(f"  guardrails_realtime: {results['guardrails_realtime']['prompts_per_second']} prompts/s")
+        results['guardrails_gate'] = bench_guardrails_realtime(corpus, config, mode='gate')
+        log(f"  guardrails_gate: {results['guardrails_gate']['prompts_per_second']} prompts/s")
+        results['guardrails_batch'] = bench_guardrails_batch(corpus, config, batch_size)
+        log(f"  guardrails_batch: {results['guardrails_batch']['prompts_per_second']} prompts/s")
+        results['simulate_evaluation'] = bench_evaluation(corpus[:eval_size], config, evaluator_names)
+        log(f"  simulate_evaluation: {results['simulate_evaluation']['prompts_per_second']} prompts/s")
+        if stub_latency is not None:
+            results['client'] = bench_client(corpus[:eval_size], evaluator_names, stub_latency)
+            log(f"  client: {results['client']['per_evaluator']['prompts_per_second']} prompts/s per evaluator, "
+                f"{results['client']['batched']['prompts_per_second']} prompts/s batched")
+        report['results'][profile] = results
+
+    return report
+
+
+def run_bench_command(args: argparse.Namespace) -> int:
+    """``python -m gov_eval bench`` handler"""
+    profiles = [profile.strip() for profile in (args.profiles or ','.join(PROFILES)).split(',') if profile.strip()]
+    unknown = [profile for profile in profiles if profile not in PROFILES]
+    if unknown:
+        print(f"Unknown profiles: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    report = run_benchmarks(
+        profiles, args.size, args.paste_count, args.batch_size, args.eval_size,
+        seed=args.seed, deterministic=args.deterministic,
+        stub_latency=args.stub_latency_ms / 1000 if args.client else None,
+        corpus_options={'median_words': args.median_words, 'sigma': args.sigma, 'paste_kb': args.paste_kb},
+        log=lambda message: print(message, file=sys.stderr)
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output + '\n')
+        print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
@@ -0,0 +1,167 @@
+"""Content-hash result cache for guardrail and evaluator outputs
+
+Entries are keyed on a SHA-256 of the inputs that determine a result and held
+in a bounded in-memory LRU tier, optionally backed by an SQLite file shared
+between processes. Both tiers expire entries after a TTL. Values must be JSON
+serializable; they are stored as JSON text so callers always get a fresh copy.
+"""
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from gov_eval.scoring import scoring_signature
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# Expired disk rows are purged once every this many writes
+_PURGE_EVERY = 500
+
+_default_cache: Optional['ResultCache'] = None
+_default_cache_pid: Optional[int] = None
+_default_cache_lock = threading.Lock()
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 hex digest of JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def guardrails_cache_key(prompt_text: str, config: Dict, mode: str = 'report') -> str:
+    """Cache key for a guardrails result; guardrails only depend on the prompt and their own settings"""
+    return content_hash('guardrails', prompt_text, config.get('enable_guardrails', False),
+                        config.get('guardrails_config', {}), scoring_signature(config), mode)
+
+
+def evaluator_content_key(prompt_config: Dict, evaluator: str) -> str:
+    """Hash of everything one evaluator's result depends on for a prompt and model configuration"""
+    return content_hash('evaluator', evaluator, prompt_config.get('prompt_text'), prompt_config.get('system_prompt'),
+                        prompt_config.get('model_name'), prompt_config.get('temperature'),
+                        prompt_config.get('max_tokens'))
+
+
+def evaluator_cache_key(prompt_config: Dict, evaluator: str, config: Dict) -> str:
+    """Cache key for one evaluator's result, kept apart per scoring mode and seed"""
+    return content_hash(evaluator_content_key(prompt_config, evaluator), scoring_signature(config))
+
+
+class ResultCache:
+    """Bounded LRU cache with TTL and an optional SQLite tier"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+            self._db.commit()
+
+    def _expiry(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds else None
+
+    def _remember(self, key: str, payload: str, expires_at: Optional[float]):
+        """Insert into the memory tier, evicting the least recently used entries"""
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key``, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM results WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under ``key`` in every tier"""
+        payload = json.dumps(value)
+        expires_at = self._expiry()
+        with self._lock:
+            self._remember(key, payload, expires_at)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, payload, expires_at))
+                self._writes += 1
+                if self._writes % _PURGE_EVERY == 0:
+                    self._db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+
+    def clear(self):
+        """Drop every entry from both tiers and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory tier size"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries)
+            }
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, configured from the environment on first use.
+
+    ``GOV_EVAL_CACHE_PATH`` enables the SQLite tier, ``GOV_EVAL_CACHE_MAX_ENTRIES``
+    bounds the memory tier and ``GOV_EVAL_CACHE_TTL_SECONDS`` sets the TTL
+    (0 disables expiry). A forked child builds its own instance rather than
+    sharing the parent's SQLite connection.
+    """
+    global _default_cache, _default_cache_pid
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache_pid != os.getpid():
+            _default_cache_pid = os.getpid()
+            _default_cache = ResultCache(
+                max_entries=int(os.getenv("GOV_EVAL_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                ttl_seconds=float(os.getenv("GOV_EVAL_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                path=os.getenv("GOV_EVAL_CACHE_PATH") or None
+            )
+        return _default_cache
@@ -0,0 +1,525 @@
+"""Headless command line interface
+
+Usage::
+
+    python -m gov_eval batch --input prompts.jsonl --output results.jsonl \\
+        --evaluators "Quality Evaluation,Guardrails Evaluation" --workers 4
+
+Each input line is a JSON object with a ``prompt`` (or ``prompt_text``) field
+and optional ``id``, ``system_prompt``, ``model_name``, ``temperature`` and
+``max_tokens`` fields. Records are read lazily, evaluated in chunks on a
+process pool and written out in input order as each chunk completes, so
+memory stays bounded by ``workers * chunk_size`` records.
+
+Every output record carries the zero-based ``offset`` of its input record.
+``--resume`` picks up after the last offset already present in the output,
+so a crashed run can be restarted with the same command line; without it an
+output that already holds results is refused rather than appended to.
+``--fairness-data`` points Fairness Evaluation at a labeled CSV or Parquet
+dataset, which is reduced to per-group confusion counts once up front, and
+``--quality-data`` scores Quality Evaluation on a dataset of outputs and
+references, also once up front, as ``--rag-data`` does RAG Metrics
+Evaluation on a dataset of questions, retrieved contexts and answers.
+``--metrics-output`` turns on instrumentation and writes per-stage timings,
+merged from every worker, as Prometheus text (or JSON for a ``.json`` path).
+
+``python -m gov_eval export`` streams rows of an evaluation history file to
+CSV, JSONL or Parquet a chunk at a time, for histories too large to load.
+
+``python -m gov_eval bench`` runs the synthetic benchmarks in
+``gov_eval.benchmark`` and prints a JSON report; ``python -m gov_eval startup``
+times cold starts of the Streamlit app with ``gov_eval.startup``.
+``python -m gov_eval stub`` serves the local stub of the watsonx endpoints
+from ``gov_eval.stub_server``. Each subcommand's module is imported by its
+handler, and pandas only when a dataset or Parquet output needs it, so a
+command never loads another one's dependencies.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+from gov_eval.cache import get_result_cache
+from gov_eval.evaluators import get_available_evaluators, simulate_evaluation
+from gov_eval.detectors import detector_names
+from gov_eval.export import EXPORT_FORMATS, write_export
+from gov_eval.fairness import FAIRNESS_CONFIDENCE
+from gov_eval.guardrails import GUARDRAIL_MODES, evaluate_guardrails_realtime
+from gov_eval.history import COLUMNS, EvaluationHistory
+from gov_eval.instrumentation import get_instrumentation, set_enabled, time_stage, write_metrics_file
+from gov_eval.quality import QUALITY_AVERAGES
+
+DEFAULT_MODEL_NAME = "meta-llama/llama-2-70b-chat"
+DEFAULT_CHUNK_SIZE = 100
+PARQUET_PART_PREFIX = 'part-'
+
+
+def iter_records(path: str, start_offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(offset, record)`` pairs from a JSONL file, skipping blank lines and records before ``start_offset``"""
+    with open(path, encoding='utf-8') as handle:
+        offset = 0
+        for line in handle:
+            if not line.strip():
+                continue
+            if offset >= start_offset:
+                yield offset, json.loads(line)
+            offset += 1
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to ``size`` consecutive items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_prompt_config(record: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the prompt_config dict the evaluators expect from an input record"""
+    return {
+        'prompt_text': record.get('prompt', record.get('prompt_text', '')),
+        'system_prompt': record.get('system_prompt', ''),
+        'model_type': record.get('model_type', defaults['model_type']),
+        'model_name': record.get('model_name', defaults['model_name']),
+        'temperature': record.get('temperature', defaults['temperature']),
+        'max_tokens': record.get('max_tokens', defaults['max_tokens'])
+    }
+
+
+def evaluate_record(offset: int, record: Dict[str, Any], config: Dict, evaluators: List[str],
+                    defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Screen one record with guardrails and, if it passes, run the evaluators"""
+    prompt_config = build_prompt_config(record, defaults)
+    output = {'offset': offset, 'id': record.get('id')}
+
+    guardrails_results = None
+    if config.get('enable_guardrails', False):
+        guardrails_results = evaluate_guardrails_realtime(prompt_config['prompt_text'], config, cache=get_result_cache(),
+                                                          mode=config.get('guardrails_mode', 'report'))
+        if not guardrails_results['passed']:
+            output.update({
+                'status': 'blocked',
+                'prompt': prompt_config['prompt_text'],
+                'model': prompt_config['model_name'],
+                'evaluations': {},
+                'guardrails': guardrails_results
+            })
+            return output
+
+    results = simulate_evaluation(config, prompt_config, evaluators, cache=get_result_cache(),
+                                  guardrails=guardrails_results)
+    if guardrails_results is not None:
+        results['guardrails'] = guardrails_results
+    output['status'] = 'evaluated'
+    output.update(results)
+    return output
+
+
+def evaluate_chunk(chunk: List[Tuple[int, Dict[str, Any]]], config: Dict, evaluators: List[str],
+                   defaults: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Evaluate a chunk of records; runs inside worker processes"""
+    return [evaluate_record(offset, record, config, evaluators, defaults) for offset, record in chunk]
+
+
+def evaluate_chunk_instrumented(chunk: List[Tuple[int, Dict[str, Any]]], config: Dict, evaluators: List[str],
+                                defaults: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Evaluate a chunk and hand back the worker's instrumentation statistics for it, to merge in the parent"""
+    return evaluate_chunk(chunk, config, evaluators, defaults), get_instrumentation().drain()
+
+
+class JsonlWriter:
+    """Write evaluation records to a JSONL file, one line per record, appending to it when resuming"""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.handle = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    @staticmethod
+    def has_records(path: str) -> bool:
+        """Whether ``path`` is a non-empty file"""
+        return os.path.isfile(path) and os.path.getsize(path) > 0
+
+    @staticmethod
+    def resume_offset(path: str) -> int:
+        """Return the offset after the last complete record, dropping any torn trailing line"""
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb+') as handle:
+            end = handle.seek(0, os.SEEK_END)
+            position, tail = end, b''
+            # Read backwards until the last two newlines (or the file start) are in view
+            while position > 0 and tail.count(b'\n') < 2:
+                step = min(64 * 1024, position)
+                position -= step
+                handle.seek(position)
+                tail = handle.read(step) + tail
+            if not tail.endswith(b'\n'):
+                # The last line was cut short by a crash; discard it
+                keep = tail.rfind(b'\n') + 1
+                handle.truncate(position + keep)
+                tail = tail[:keep]
+            lines = tail.splitlines()
+            if not lines:
+                return 0
+            return json.loads(lines[-1])['offset'] + 1
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Write a chunk of records and flush it to disk"""
+        for record in records:
+            self.handle.write(json.dumps(record) + '\n')
+        self.handle.flush()
+
+    def close(self):
+        self.handle.close()
+
+
+class ParquetWriter:
+    """Write evaluation records as a directory of Parquet part files, one per chunk.
+
+    Nested guardrails and evaluation results are stored as JSON strings so
+    every part shares one schema. Parts are written to a temporary name and
+    renamed into place, so a crash never leaves a truncated part behind.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def has_records(path: str) -> bool:
+        """Whether ``path`` is a directory holding part files"""
+        return os.path.isdir(path) and any(
+            name.startswith(PARQUET_PART_PREFIX) and name.endswith('.parquet') for name in os.listdir(path)
+        )
+
+    @staticmethod
+    def resume_offset(path: str) -> int:
+        """Return the offset after the last record of the highest part file"""
+        if not os.path.isdir(path):
+            return 0
+        last_offsets = [
+            int(name[:-len('.parquet')].split('-')[2])
+            for name in os.listdir(path)
+            if name.startswith(PARQUET_PART_PREFIX) and name.endswith('.parquet')
+        ]
+        return max(last_offsets) + 1 if last_offsets else 0
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Write a chunk of records as one part file"""
+        import pandas as pd
+
+        frame = pd.DataFrame({
+            'offset': [record['offset'] for record in records],
+            'id': [None if record.get('id') is None else str(record['id']) for record in records],
+            'status': [record['status'] for record in records],
+            'prompt': [record['prompt'] for record in records],
+            'model': [record['model'] for record in records],
+            'guardrails_passed': [record.get('guardrails', {}).get('passed') for record in records],
+            'guardrails': [json.dumps(record.get('guardrails')) for record in records],
+            'evaluations': [json.dumps(record['evaluations']) for record in records],
+        })
+        name = f"{PARQUET_PART_PREFIX}{records[0]['offset']:012d}-{records[-1]['offset']:012d}.parquet"
+        temporary = os.path.join(self.path, f".{name}.tmp")
+        frame.to_parquet(temporary, index=False)
+        os.replace(temporary, os.path.join(self.path, name))
+
+    def close(self):
+        pass
+
+
+def output_writer_class(args: argparse.Namespace):
+    """Pick the writer for ``--format``, inferring it from the output path when omitted"""
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'jsonl')
+    return ParquetWriter if output_format == 'parquet' else JsonlWriter
+
+
+def build_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Build the same config dict render_configuration_sidebar produces"""
+    guardrails_config = {}
+    if not args.no_guardrails:
+        enabled = set(args.guardrails.split(','))
+        guardrails_config = {check: check in enabled for check in detector_names()}
+        guardrails_config['toxicity_threshold'] = args.toxicity_threshold
+        guardrails_config['confidence_threshold'] = args.confidence_threshold
+
+    config = {
+        'api_key': os.getenv("WATSONX_API_KEY", ""),
+        'project_id': os.getenv("WATSONX_PROJECT_ID", ""),
+        'instance_id': os.getenv("WATSONX_INSTANCE_ID", ""),
+        'base_url': os.getenv("WATSONX_BASE_URL", "https://us-south.ml.cloud.ibm.com"),
+        'enable_guardrails': not args.no_guardrails,
+        'guardrails_config': guardrails_config,
+        'guardrails_mode': args.guardrails_mode,
+        'deterministic': args.deterministic,
+        'seed': args.seed
+    }
+    if args.fairness_data:
+        from gov_eval.fairness import confusion_counts, load_labeled_dataset
+
+        columns = (args.group_column, args.label_column, args.prediction_column)
+        config['fairness_counts'] = confusion_counts(load_labeled_dataset(args.fairness_data, *columns), *columns)
+        config['fairness_confidence'] = args.fairness_confidence
+    if args.quality_data:
+        from gov_eval.quality import load_quality_dataset, quality_metrics
+
+        columns = (args.reference_column, args.output_column, args.slice_column)
+        config['quality_scores'] = quality_metrics(load_quality_dataset(args.quality_data, *columns), *columns,
+                                                   average=args.average)
+    if args.rag_data:
+        from gov_eval.rag import load_rag_dataset, rag_metrics
+
+        columns = (args.question_column, args.contexts_column, args.answer_column, args.ground_truth_column)
+        config['rag_scores'] = rag_metrics(load_rag_dataset(args.rag_data, *columns), *columns)
+    return config
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Evaluate every record of ``--input`` and stream results to ``--output``"""
+    evaluators = [name.strip() for name in args.evaluators.split(',') if name.strip()]
+    unknown = [name for name in evaluators if name not in get_available_evaluators()]
+    if unknown:
+        print(f"Unknown evaluators: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    if args.cache_path:
+        # Worker processes build their own cache from the inherited environment
+        os.environ["GOV_EVAL_CACHE_PATH"] = args.cache_path
+    if args.metrics_output:
+        os.environ["GOV_EVAL_INSTRUMENTATION"] = "1"
+        set_enabled(True)
+    history = EvaluationHistory(args.history_path) if args.history_path else None
+    history_session = f"batch-{uuid.uuid4().hex}"
+
+    config = build_config(args)
+    defaults = {
+        'model_type': "IBM watsonx.ai",
+        'model_name': args.model,
+        'temperature': args.temperature,
+        'max_tokens': args.max_tokens
+    }
+
+    writer_class = output_writer_class(args)
+    if not args.resume and writer_class.has_records(args.output):
+        print(f"{args.output} already holds results; pass --resume to continue it or choose a new --output",
+              file=sys.stderr)
+        return 2
+    start_offset = args.start_offset
+    if args.resume:
+        start_offset = max(start_offset, writer_class.resume_offset(args.output))
+    if start_offset:
+        print(f"Resuming from offset {start_offset}", file=sys.stderr)
+
+    chunks = chunked(iter_records(args.input, start_offset), args.chunk_size)
+    writer = writer_class(args.output, resume=args.resume)
+    export_stage = 'export.parquet' if writer_class is ParquetWriter else 'export.jsonl'
+    executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    in_flight: deque = deque()
+    counts = {'evaluated': 0, 'blocked': 0}
+    started = time.monotonic()
+
+    def write(records: List[Dict[str, Any]]):
+        with time_stage(export_stage):
+            writer.write(records)
+        if history is not None:
+            history.extend(records, session_id=history_session)
+        for record in records:
+            counts[record['status']] += 1
+        total = counts['evaluated'] + counts['blocked']
+        print(f"{total} records ({total / max(time.monotonic() - started, 1e-9):.1f}/s), "
+              f"last offset {records[-1]['offset']}", file=sys.stderr)
+        write_metrics_file(args.metrics_output)
+
+    def write_from_worker(future: Future):
+        records, statistics = future.result()
+        get_instrumentation().merge(statistics)
+        write(records)
+
+    try:
+        for chunk in chunks:
+            if executor is None:
+                write(evaluate_chunk(chunk, config, evaluators, defaults))
+                continue
+            in_flight.append(executor.submit(evaluate_chunk_instrumented, chunk, config, evaluators, defaults))
+            # Keep a bounded window of chunks in flight and write them in input order
+            if len(in_flight) >= 2 * args.workers:
+                write_from_worker(in_flight.popleft())
+        while in_flight:
+            write_from_worker(in_flight.popleft())
+    finally:
+        writer.close()
+        if history is not None:
+            history.close()
+        if executor is not None:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown()
+        write_metrics_file(args.metrics_output, force=True)
+
+    print(f"Done: {counts['evaluated']} evaluated, {counts['blocked']} blocked by guardrails", file=sys.stderr)
+    return 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """``python -m gov_eval export`` handler"""
+    export_format = args.format or os.path.splitext(args.output)[1].lstrip('.').lower()
+    if export_format not in EXPORT_FORMATS:
+        print(f"Cannot tell the export format from {args.output}; pass --format", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.history_path):
+        print(f"No evaluation history at {args.history_path}", file=sys.stderr)
+        return 2
+    history = EvaluationHistory(args.history_path)
+    try:
+        rows = history.iter_rows(model=args.model, evaluator=args.evaluator, session_id=args.session_id,
+                                 since=args.since, until=args.until, chunk_size=args.chunk_size)
+        with open(args.output, 'wb') as sink:
+            write_export(rows, COLUMNS, export_format, sink)
+    finally:
+        history.close()
+    print(f"Exported history to {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    """``python -m gov_eval bench`` handler"""
+    from gov_eval.benchmark import run_bench_command
+
+    return run_bench_command(args)
+
+
+def run_startup(args: argparse.Namespace) -> int:
+    """``python -m gov_eval startup`` handler"""
+    from gov_eval.startup import run_startup_command
+
+    return run_startup_command(args)
+
+
+def run_stub(args: argparse.Namespace) -> int:
+    """``python -m gov_eval stub`` handler"""
+    from gov_eval.stub_server import StubServer
+
+    server = StubServer(port=args.port, token_ttl=args.token_ttl, latency=args.latency_ms / 1000,
+                        error_rate=args.error_rate, fail_status=args.fail_status, max_batch_size=args.max_batch_size,
+                        retry_after=args.retry_after)
+    print(f"Serving on {server.url} (IAM: {server.iam_url})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``python -m gov_eval`` argument parser"""
+    parser = argparse.ArgumentParser(prog='python -m gov_eval', description="watsonx Governance prompt evaluator")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    batch = subcommands.add_parser('batch', help="Evaluate a JSONL prompt dataset")
+    batch.add_argument('--input', required=True, help="JSONL file with one prompt record per line")
+    batch.add_argument('--output', required=True, help="JSONL file or Parquet directory to write results to")
+    batch.add_argument('--format', choices=['jsonl', 'parquet'], help="Output format (default: from --output suffix)")
+    batch.add_argument('--evaluators', default="", help="Comma-separated evaluator names")
+    batch.add_argument('--model', default=DEFAULT_MODEL_NAME, help="Model name for records without model_name")
+    batch.add_argument('--temperature', type=float, default=0.7)
+    batch.add_argument('--max-tokens', type=int, default=100)
+    batch.add_argument('--no-guardrails', action='store_true', help="Skip real-time guardrails")
+    batch.add_argument('--guardrails', default=','.join(detector_names()), help="Comma-separated guardrail checks to enable")
+    batch.add_argument('--guardrails-mode', choices=GUARDRAIL_MODES, default='report',
+                       help="report: score every check; gate: stop at the first violation")
+    batch.add_argument('--toxicity-threshold', type=float, default=0.7)
+    batch.add_argument('--confidence-threshold', type=float, default=0.8)
+    batch.add_argument('--deterministic', action='store_true', help="Derive simulated scores from a hash of each record")
+    batch.add_argument('--seed', type=int, help="Seed for deterministic or seeded random scores")
+    batch.add_argument('--workers', type=int, default=1, help="Worker processes (default: 1, in-process)")
+    batch.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Records per worker task")
+    batch.add_argument('--start-offset', type=int, default=0, help="Skip input records before this offset")
+    batch.add_argument('--cache-path', help="SQLite file for the on-disk result cache, shared by all workers")
+    batch.add_argument('--history-path', help="SQLite evaluation history to append every result to")
+    batch.add_argument('--metrics-output',
+                       help="File for per-stage timings: Prometheus text, or JSON for a .json path")
+    batch.add_argument('--fairness-data', help="Labeled CSV or Parquet dataset for Fairness Evaluation")
+    batch.add_argument('--group-column', default='group', help="Protected group column of --fairness-data")
+    batch.add_argument('--label-column', default='label', help="True label column of --fairness-data")
+    batch.add_argument('--prediction-column', default='prediction', help="Prediction column of --fairness-data")
+    batch.add_argument('--fairness-confidence', type=float, default=FAIRNESS_CONFIDENCE,
+                       help="Confidence level of the fairness metrics' bootstrap intervals")
+    batch.add_argument('--quality-data', help="Dataset of model outputs and references for Quality Evaluation")
+    batch.add_argument('--reference-column', default='reference', help="Reference answer column of --quality-data")
+    batch.add_argument('--output-column', default='output', help="Model output column of --quality-data")
+    batch.add_argument('--slice-column', help="Optional column of --quality-data to break the metrics down by")
+    batch.add_argument('--average', choices=QUALITY_AVERAGES, default='macro',
+                       help="Averaging for Quality Evaluation precision, recall and F1")
+    batch.add_argument('--rag-data', help="Dataset of questions, retrieved contexts and answers for RAG Metrics Evaluation")
+    batch.add_argument('--question-column', default='question', help="Question column of --rag-data")
+    batch.add_argument('--contexts-column', default='contexts',
+                       help="Retrieved contexts column of --rag-data: a list, or a JSON list in CSV")
+    batch.add_argument('--answer-column', default='answer', help="Generated answer column of --rag-data")
+    batch.add_argument('--ground-truth-column', help="Optional reference answer column of --rag-data")
+    batch.add_argument('--resume', action='store_true', help="Continue after the last offset already in --output")
+    batch.set_defaults(handler=run_batch)
+
+    bench = subcommands.add_parser('bench', help="Benchmark guardrails and evaluation on synthetic prompts")
+    bench.add_argument('--output', default='-', help="JSON report file (default: stdout)")
+    bench.add_argument('--profiles', help="Comma-separated corpus profiles (default: all)")
+    bench.add_argument('--size', type=int, default=1000, help="Prompts per profile")
+    bench.add_argument('--paste-count', type=int, default=20, help="Prompts in the paste profile")
+    bench.add_argument('--paste-kb', type=int, default=100, help="Size of each pasted document in KB")
+    bench.add_argument('--median-words', type=float, default=40, help="Median prompt length in words")
+    bench.add_argument('--sigma', type=float, default=0.8, help="Log-normal spread of prompt lengths")
+    bench.add_argument('--batch-size', type=int, default=500, help="Prompts per evaluate_guardrails_batch call")
+    bench.add_argument('--eval-size', type=int, default=200, help="Prompts per profile run through simulate_evaluation")
+    bench.add_argument('--deterministic', action='store_true', help="Benchmark with deterministic scoring")
+    bench.add_argument('--seed', type=int, default=0, help="Corpus seed")
+    bench.add_argument('--client', action='store_true', help="Also benchmark the API client against a local stub server")
+    bench.add_argument('--stub-latency-ms', type=float, default=5.0, help="Stub server latency per request")
+    bench.set_defaults(handler=run_bench)
+
+    startup = subcommands.add_parser('startup', help="Benchmark cold start import and first render of the app")
+    startup.add_argument('--app', help="Streamlit app script (default: the bundled app.py)")
+    startup.add_argument('--output', default='-', help="JSON report file (default: stdout)")
+    startup.add_argument('--repeat', type=int, default=5, help="Cold starts, each in a new interpreter")
+    startup.add_argument('--unconfigured', action='store_true', help="Render without watsonx credentials")
+    startup.add_argument('--prompt', help="Prompt typed before the rerun, so it includes the guardrails check")
+    startup.add_argument('--timeout', type=float, default=60.0, help="Seconds allowed for each script run")
+    startup.set_defaults(handler=run_startup)
+
+    export = subcommands.add_parser('export', help="Stream an evaluation history to CSV, JSONL or Parquet")
+    export.add_argument('--history-path', required=True, help="SQLite evaluation history to read")
+    export.add_argument('--output', required=True, help="File to write")
+    export.add_argument('--format', choices=EXPORT_FORMATS, help="Output format (default: from --output suffix)")
+    export.add_argument('--model', help="Only rows for this model")
+    export.add_argument('--evaluator', help="Only rows for this evaluator")
+    export.add_argument('--session-id', help="Only rows for this session")
+    export.add_argument('--since', type=float, help="Only rows at or after this epoch time")
+    export.add_argument('--until', type=float, help="Only rows before this epoch time")
+    export.add_argument('--chunk-size', type=int, default=10000, help="Rows read and written at a time")
+    export.set_defaults(handler=run_export)
+
+    stub = subcommands.add_parser('stub', help="Serve a local stub of the watsonx endpoints")
+    stub.add_argument('--port', type=int, default=8080)
+    stub.add_argument('--latency-ms', type=float, default=0.0, help="Delay added to every evaluations request")
+    stub.add_argument('--error-rate', type=float, default=0.0, help="Share of evaluations requests that fail")
+    stub.add_argument('--fail-status', type=int, default=503, help="HTTP status of injected failures")
+    stub.add_argument('--retry-after', type=float, default=0.0, help="Retry-After seconds sent with injected failures")
+    stub.add_argument('--token-ttl', type=float, default=3600.0, help="Lifetime of issued IAM tokens in seconds")
+    stub.add_argument('--max-batch-size', type=int, help="Reject requests with more evaluations than this")
+    stub.set_defaults(handler=run_stub)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
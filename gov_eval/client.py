@@ -0,0 +1,341 @@
+"""Pooled watsonx governance client
+
+One ``GovernanceClient`` per set of credentials is shared by every session,
+thread and evaluator using them. It keeps connections alive and reuses IAM
+tokens, throttles requests per project, retries transient failures and sends
+evaluations in batches. ``gov_eval.stub_server`` serves the same endpoints
+locally for tests and benchmarks.
+"""
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import hashlib
+import os
+import random
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from gov_eval.evaluators import EVALUATOR_MAX_WORKERS
+
+DEFAULT_BASE_URL = "https://us-south.ml.cloud.ibm.com"
+DEFAULT_IAM_URL = "https://iam.cloud.ibm.com/identity/token"
+EVALUATIONS_PATH = "/v1/evaluations"
+
+# Sized for the evaluator thread pool, so concurrent calls reuse keep-alive
+# connections instead of paying a TLS handshake each time
+CLIENT_POOL_MAXSIZE = EVALUATOR_MAX_WORKERS
+CLIENT_MAX_BATCH_SIZE = 32
+CLIENT_TIMEOUT_SECONDS = (5.0, 60.0)  # (connect, read)
+
+# Fetch a new IAM token once this share of the current one's lifetime is used
+TOKEN_REFRESH_FRACTION = 0.8
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+DEFAULT_RATE_LIMIT_PER_SECOND = 10.0
+DEFAULT_RATE_LIMIT_BURST = 20
+
+ClientKey = Tuple[str, str, str, str, str]
+
+_clients: Dict[ClientKey, 'GovernanceClient'] = {}
+_client_holders: Dict[ClientKey, int] = {}
+_clients_lock = threading.Lock()
+_rate_limiters: Dict[str, 'TokenBucket'] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+class GovernanceAPIError(Exception):
+    """A watsonx request that failed after any retries"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, holding at most ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available and return 0, or return the seconds until they will be"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are taken; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+def get_rate_limiter(project_id: str) -> Optional[TokenBucket]:
+    """Return the process-wide rate limiter for a project, or None if rate limiting is off.
+
+    Clients from ``get_client`` share it, so every session using a project
+    shares its rate limit.
+
+    ``WATSONX_RATE_LIMIT_PER_SECOND`` sets the sustained request rate (0
+    disables limiting) and ``WATSONX_RATE_LIMIT_BURST`` the bucket size.
+    """
+    rate = float(os.getenv("WATSONX_RATE_LIMIT_PER_SECOND", DEFAULT_RATE_LIMIT_PER_SECOND))
+    if rate <= 0:
+        return None
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(project_id)
+        if limiter is None:
+            burst = float(os.getenv("WATSONX_RATE_LIMIT_BURST", DEFAULT_RATE_LIMIT_BURST))
+            limiter = _rate_limiters[project_id] = TokenBucket(rate, max(burst, 1.0))
+        return limiter
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry ``attempt`` (0-based): ``Retry-After`` if given, else full-jitter backoff"""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def client_key(api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+               iam_url: Optional[str] = None) -> ClientKey:
+    """Pool key for a set of credentials; the API key is only kept as a hash"""
+    return (
+        hashlib.sha256(api_key.encode('utf-8')).hexdigest(),
+        (base_url or DEFAULT_BASE_URL).rstrip('/'),
+        project_id,
+        instance_id or '',
+        iam_url or os.getenv("WATSONX_IAM_URL", DEFAULT_IAM_URL)
+    )
+
+
+class GovernanceClient:
+    """HTTP client for one set of watsonx credentials, safe to share between threads"""
+
+    def __init__(self, api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+                 iam_url: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 pool_maxsize: int = CLIENT_POOL_MAXSIZE, max_retries: int = MAX_RETRIES,
+                 max_batch_size: int = CLIENT_MAX_BATCH_SIZE):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.project_id = project_id
+        self.instance_id = instance_id or ''
+        self.iam_url = iam_url or os.getenv("WATSONX_IAM_URL", DEFAULT_IAM_URL)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.max_batch_size = max_batch_size
+        self._api_key = api_key
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._token: Optional[str] = None
+        self._token_refresh_at = 0.0
+        self._token_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'token_requests': 0, 'throttled_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _count(self, name: str, amount: float = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self) -> Dict[str, float]:
+        """Request, retry, IAM token and rate-limit wait counters"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def token(self, force_refresh: bool = False) -> str:
+        """Current IAM bearer token, fetched when missing, due for refresh or forced.
+
+        Only one token request is in flight however many threads need a token.
+        """
+        with self._token_lock:
+            if force_refresh or self._token is None or time.time() >= self._token_refresh_at:
+                self._count('token_requests')
+                response = self.session.post(
+                    self.iam_url,
+                    data={'grant_type': 'urn:ibm:params:oauth:grant-type:apikey', 'apikey': self._api_key},
+                    headers={'Accept': 'application/json'},
+                    timeout=CLIENT_TIMEOUT_SECONDS
+                )
+                if response.status_code != 200:
+                    raise GovernanceAPIError(f"IAM token request failed with HTTP {response.status_code}",
+                                             response.status_code)
+                payload = response.json()
+                self._token = payload['access_token']
+                self._token_refresh_at = time.time() + TOKEN_REFRESH_FRACTION * float(payload.get('expires_in', 3600))
+            return self._token
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Authenticated, rate-limited request with retries on connection errors, 401 and 429/5xx"""
+        kwargs.setdefault('timeout', CLIENT_TIMEOUT_SECONDS)
+        params = {'project_id': self.project_id, **kwargs.pop('params', {})}
+        extra_headers = kwargs.pop('headers', {})
+        refreshed = False
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self._count('throttled_seconds', self.rate_limiter.acquire())
+            self._count('requests')
+            headers = {'Authorization': f"Bearer {self.token()}", **extra_headers}
+            try:
+                response = self.session.request(method, self.url(path), params=params, headers=headers, **kwargs)
+            except requests.ConnectionError as e:
+                if attempt >= self.max_retries:
+                    raise GovernanceAPIError(f"Connection failed: {e}") from e
+                time.sleep(backoff_delay(attempt))
+            else:
+                if response.status_code == 401 and not refreshed:
+                    # Token revoked or expired early: fetch a new one once
+                    refreshed = True
+                    self.token(force_refresh=True)
+                    continue
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code >= 400:
+                        raise GovernanceAPIError(f"HTTP {response.status_code}: {response.text[:200]}",
+                                                 response.status_code)
+                    return response
+                if attempt >= self.max_retries:
+                    raise GovernanceAPIError(f"HTTP {response.status_code} after {attempt + 1} attempts",
+                                             response.status_code)
+                time.sleep(backoff_delay(attempt, response.headers.get('Retry-After')))
+            attempt += 1
+            self._count('retries')
+
+    def evaluate_batch(self, items: Sequence[tuple]) -> List[Dict[str, Any]]:
+        """Run ``(evaluator, prompt_config)`` items, ``max_batch_size`` per request, and return results in order.
+
+        Items from a ``RequestCoalescer`` may carry the submitting run's scorer
+        as a third element; the service scores requests itself, so it is
+        ignored, and the client can back a coalescer directly.
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(items), self.max_batch_size):
+            batch = items[start:start + self.max_batch_size]
+            response = self.request('POST', EVALUATIONS_PATH, json={
+                'evaluations': [{'evaluator': item[0], 'prompt': item[1]} for item in batch]
+            })
+            batch_results = response.json().get('results', [])
+            if len(batch_results) != len(batch):
+                raise GovernanceAPIError(f"Expected {len(batch)} results, got {len(batch_results)}")
+            results.extend(batch_results)
+        return results
+
+    def evaluate(self, evaluator: str, prompt_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one evaluator on one prompt"""
+        return self.evaluate_batch([(evaluator, prompt_config)])[0]
+
+    def close(self):
+        """Close pooled connections; a closed client reconnects if it is used again"""
+        self.session.close()
+
+
+def _pooled_client(key: ClientKey, api_key: str, base_url: Optional[str], project_id: str, instance_id: str,
+                   iam_url: Optional[str]) -> GovernanceClient:
+    """The client for ``key``, created on first use; callers hold ``_clients_lock``"""
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = GovernanceClient(api_key, base_url, project_id, instance_id, iam_url,
+                                                  rate_limiter=get_rate_limiter(project_id))
+    return client
+
+
+def get_client(api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+               iam_url: Optional[str] = None) -> GovernanceClient:
+    """Return the process-wide client for these credentials, creating it on first use"""
+    key = client_key(api_key, base_url, project_id, instance_id, iam_url)
+    with _clients_lock:
+        return _pooled_client(key, api_key, base_url, project_id, instance_id, iam_url)
+
+
+def acquire_client(api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+                   iam_url: Optional[str] = None) -> GovernanceClient:
+    """``get_client``, also counting the caller as a holder until it calls ``release_client``"""
+    key = client_key(api_key, base_url, project_id, instance_id, iam_url)
+    with _clients_lock:
+        _client_holders[key] = _client_holders.get(key, 0) + 1
+        return _pooled_client(key, api_key, base_url, project_id, instance_id, iam_url)
+
+
+def release_client(api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+                   iam_url: Optional[str] = None) -> bool:
+    """Give back a client from ``acquire_client``, closing it when no holder is left; returns whether it was closed.
+
+    Only holders are counted: code that keeps a client from ``get_client``
+    without acquiring it must not rely on it staying open.
+    """
+    key = client_key(api_key, base_url, project_id, instance_id, iam_url)
+    with _clients_lock:
+        holders = _client_holders.get(key, 0) - 1
+        if holders > 0:
+            _client_holders[key] = holders
+            return False
+        _client_holders.pop(key, None)
+        client = _clients.pop(key, None)
+    if client is None:
+        return False
+    client.close()
+    return True
+
+
+class ClientLease:
+    """A hold on the pooled client for one set of credentials, from ``acquire_client``.
+
+    The hold is given back by ``release`` or, failing that, when the lease is
+    garbage-collected, so a lease kept in a Streamlit session's state lets go
+    of its client once a session that ended without releasing it is dropped.
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+                 iam_url: Optional[str] = None):
+        self.client = acquire_client(api_key, base_url, project_id, instance_id, iam_url)
+        self._finalizer = weakref.finalize(self, release_client, api_key, base_url, project_id, instance_id, iam_url)
+
+    @property
+    def released(self) -> bool:
+        """Whether the hold has been given back"""
+        return not self._finalizer.alive
+
+    def release(self) -> bool:
+        """Give the client back now, as ``release_client`` does; later calls do nothing and return False"""
+        return bool(self._finalizer())
+
+
+def invalidate_client(api_key: str, base_url: Optional[str], project_id: str, instance_id: str = '',
+                      iam_url: Optional[str] = None) -> bool:
+    """Drop and close the client for these credentials, however many holders it has; returns whether one existed"""
+    key = client_key(api_key, base_url, project_id, instance_id, iam_url)
+    with _clients_lock:
+        _client_holders.pop(key, None)
+        client = _clients.pop(key, None)
+    if client is None:
+        return False
+    client.close()
+    return True
@@ -0,0 +1,160 @@
+"""Micro-batching coalescer for evaluator requests
+
+Callers submit single evaluator requests and get a ``Future`` back. A
+dispatcher thread sends the queued requests to the backend as one batch once
+``max_items`` are waiting or the oldest has waited ``max_wait`` seconds, so
+runs evaluating at once share a handful of backend round-trips.
+"""
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Deque, Hashable, NamedTuple, Optional, Sequence
+import threading
+import time
+
+from gov_eval.cache import evaluator_content_key
+from gov_eval.scoring import Scorer
+
+COALESCE_MAX_WAIT_SECONDS = 0.01
+COALESCE_MAX_ITEMS = 32
+# Batches dispatched at once, so a slow backend call does not hold up the next
+COALESCE_MAX_IN_FLIGHT = 4
+
+# Takes a list of items and returns one result dict per item, in order, like
+# GovernanceClient.evaluate_batch. Items are (evaluator, prompt_config), plus
+# the scorer for requests submitted with one, which simulated backends score
+# with and remote ones ignore.
+BatchBackend = Callable[[Sequence[tuple]], List[Dict[str, Any]]]
+
+
+class _Pending(NamedTuple):
+    evaluator: str
+    prompt_config: Dict[str, Any]
+    scorer: Optional[Scorer]
+    key: Hashable
+    future: Future
+    enqueued_at: float
+
+    def item(self) -> tuple:
+        if self.scorer is None:
+            return self.evaluator, self.prompt_config
+        return self.evaluator, self.prompt_config, self.scorer
+
+
+class RequestCoalescer:
+    """Collects single evaluator requests into batched backend calls"""
+
+    def __init__(self, backend: BatchBackend, max_wait: float = COALESCE_MAX_WAIT_SECONDS,
+                 max_items: int = COALESCE_MAX_ITEMS, evaluator_limits: Optional[Dict[str, int]] = None,
+                 max_in_flight: int = COALESCE_MAX_IN_FLIGHT):
+        self.backend = backend
+        self.max_wait = max_wait
+        self.max_items = max_items
+        self.evaluator_limits = dict(evaluator_limits or {})
+        self._queue: Deque[_Pending] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {'submitted': 0, 'batches': 0, 'items': 0, 'deduplicated': 0, 'failed_batches': 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='coalescer')
+        self._thread = threading.Thread(target=self._run, name='coalescer-dispatch', daemon=True)
+        self._thread.start()
+
+    def submit(self, evaluator: str, prompt_config: Dict[str, Any], scorer: Optional[Scorer] = None) -> Future:
+        """Queue one evaluator request, scored with ``scorer`` if given; the future resolves to its result dict"""
+        future: Future = Future()
+        # Scorers are part of the key: a seeded run's scores must not come from another run's stream
+        key = (evaluator_content_key(prompt_config, evaluator), scorer)
+        pending = _Pending(evaluator, prompt_config, scorer, key, future, time.monotonic())
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Coalescer is closed")
+            self._queue.append(pending)
+            self._stats['submitted'] += 1
+            self._cond.notify()
+        return future
+
+    def evaluate(self, evaluator: str, prompt_config: Dict[str, Any], timeout: Optional[float] = None,
+                 scorer: Optional[Scorer] = None) -> Dict[str, Any]:
+        """Submit one request and wait for its result"""
+        return self.submit(evaluator, prompt_config, scorer).result(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Submitted requests, dispatched batches and items, and duplicates shared within a batch"""
+        with self._cond:
+            return dict(self._stats)
+
+    def close(self):
+        """Dispatch what is queued, then stop the dispatcher"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _take_batch(self) -> 'OrderedDict[Hashable, List[_Pending]]':
+        """Remove the next batch from the queue, grouped by item key; call with the lock held.
+
+        Identical items (same evaluator and prompt content and equal scorers)
+        are sent once and share the result. ``evaluator_limits`` caps the items
+        of one evaluator in a batch; the rest keep their place in the queue.
+        """
+        groups: 'OrderedDict[Hashable, List[_Pending]]' = OrderedDict()
+        per_evaluator: Dict[str, int] = {}
+        remaining: Deque[_Pending] = deque()
+        for pending in self._queue:
+            if pending.key in groups:
+                groups[pending.key].append(pending)
+                continue
+            limit = self.evaluator_limits.get(pending.evaluator, self.max_items)
+            if len(groups) >= self.max_items or per_evaluator.get(pending.evaluator, 0) >= limit:
+                remaining.append(pending)
+                continue
+            groups[pending.key] = [pending]
+            per_evaluator[pending.evaluator] = per_evaluator.get(pending.evaluator, 0) + 1
+        self._queue = remaining
+        return groups
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                while not self._closed and len(self._queue) < self.max_items:
+                    wait_for = self._queue[0].enqueued_at + self.max_wait - time.monotonic()
+                    if wait_for <= 0:
+                        break
+                    self._cond.wait(wait_for)
+                batch = self._take_batch()
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, groups: 'OrderedDict[Hashable, List[_Pending]]'):
+        # Drop requests cancelled while they were queued
+        live = OrderedDict()
+        for key, waiting in groups.items():
+            waiting = [pending for pending in waiting if pending.future.set_running_or_notify_cancel()]
+            if waiting:
+                live[key] = waiting
+        if not live:
+            return
+
+        items = [waiting[0].item() for waiting in live.values()]
+        with self._cond:
+            self._stats['batches'] += 1
+            self._stats['items'] += len(items)
+            self._stats['deduplicated'] += sum(len(waiting) - 1 for waiting in live.values())
+        try:
+            results = self.backend(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Backend returned {len(results)} results for {len(items)} requests")
+        except Exception as e:
+            with self._cond:
+                self._stats['failed_batches'] += 1
+            for waiting in live.values():
+                for pending in waiting:
+                    pending.future.set_exception(e)
+            return
+
+        for waiting, result in zip(live.values(), results):
+            for pending in waiting:
+                pending.future.set_result(dict(result))
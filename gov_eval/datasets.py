@@ -0,0 +1,45 @@
+"""Reading evaluation datasets
+
+Dataset-based evaluators read CSV or Parquet files, either from a path or an
+uploaded file object. Only the columns an evaluator needs are read, which
+keeps multi-million-row files cheap to load. pandas is imported on the
+first read rather than with this module.
+"""
+from typing import TYPE_CHECKING, List, Any, Optional, Sequence, Union
+import os
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DatasetSource = Union[str, os.PathLike, Any]
+
+
+def is_parquet(source: DatasetSource, name: Optional[str] = None) -> bool:
+    """Whether ``source`` (or the file ``name``) is a Parquet file rather than CSV"""
+    name = name or (os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', ''))
+    return str(name).lower().endswith(('.parquet', '.pq'))
+
+
+def dataset_columns(source: DatasetSource, name: Optional[str] = None) -> List[str]:
+    """Column names of a CSV or Parquet dataset, without reading its rows"""
+    if is_parquet(source, name):
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(source).names)
+    import pandas as pd
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+def read_dataset(source: DatasetSource, columns: Sequence[str], name: Optional[str] = None,
+                 **csv_options: Any) -> 'pd.DataFrame':
+    """Read only ``columns`` of a CSV or Parquet dataset.
+
+    ``source`` is a path or a file-like object; ``name`` overrides the file
+    name used to tell the two formats apart. ``csv_options`` are passed to
+    ``pd.read_csv``.
+    """
+    import pandas as pd
+
+    columns = list(dict.fromkeys(columns))
+    if is_parquet(source, name):
+        return pd.read_parquet(source, columns=columns)
+    return pd.read_csv(source, usecols=columns, **csv_options)
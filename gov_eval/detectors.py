@@ -0,0 +1,596 @@
+"""Guardrail detector protocol and registry
+
+Each content safety check is a ``Detector``: UI metadata, a ``load`` hook for
+heavy resources, and feature extraction and scoring over a batch of prompts,
+one by one, vectorized with pandas or streamed in windows. Detectors are
+reported in the order ``register_detector`` added them.
+"""
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Any, Iterable, NamedTuple, Optional, Sequence, Tuple, Union
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+from gov_eval.scoring import Scorer, make_scorer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TOXIC_KEYWORDS = ['hate', 'kill', 'violent', 'attack', 'destroy']
+HATE_KEYWORDS = ['discrimination', 'prejudice', 'supremacy']
+PROFANITY_WORDS = ['damn', 'hell', 'shit', 'fuck', 'bitch']
+
+# Injection patterns run against the lowercased prompt. They stay within the
+# RE2 subset so pyarrow-backed Series can match them natively. RE2 gives \w,
+# \d, \s and \b their ASCII meaning while the local scanners keep Python's
+# Unicode one, so only ASCII prompts take the vectorized path.
+INJECTION_PATTERNS = [
+    r'ignore\s+(?:previous|above|all)\s+(?:instructions?|prompts?)',
+    r'forget\s+(?:everything|all|previous)',
+    r'act\s+as\s+(?:if\s+you\s+are\s+)?\w+',
+    r'pretend\s+(?:to\s+be|you\s+are)',
+    r'system\s*:\s*',
+    r'admin\s*:\s*',
+    r'root\s*:\s*',
+    r'\[\s*system\s*\]',
+    r'<\s*system\s*>',
+    r'jailbreak',
+    r'override\s+(?:safety|security)',
+    r'disable\s+(?:filter|safety|guardrail)',
+    r'\b(?:dan|devmode|developer mode)\b',
+]
+
+# Literal-first equivalents used by the single-prompt scanner. A branch that
+# opens with ``\b`` stops the regex engine from skipping ahead to candidate
+# positions, so the word boundary is checked by a lookbehind after the first
+# character instead.
+_SCANNER_REWRITES = {
+    r'\b(?:dan|devmode|developer mode)\b': r'd(?<!\w.)(?:an|evmode|eveloper mode)\b',
+}
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+PHONE_PATTERN = r'\b\d{3}-\d{3}-\d{4}\b|\b\(\d{3}\)\s*\d{3}-\d{4}\b'
+SSN_PATTERN = r'\b\d{3}-\d{2}-\d{4}\b'
+
+PUNCTUATION_RUN_PATTERN = r'[!@#$%^&*()]{3,}'
+
+NON_ASCII_PATTERN = r'[^\x00-\x7f]'
+
+# Batches smaller than this are matched prompt by prompt; pandas string
+# methods only pay off once their per-call overhead is amortized.
+VECTORIZED_MIN_ROWS = 256
+
+# Weight of the newest measurement in a detector's running cost and
+# violation rate averages
+COST_SMOOTHING = 0.2
+
+# Floor on the violation rate used for ordering, so detectors that have not
+# flagged anything lately still order by cost among themselves
+MIN_VIOLATION_RATE = 1e-3
+
+Texts = Union['pd.Series', Sequence[str]]
+
+
+class Hit(NamedTuple):
+    """A single detector match inside a prompt"""
+    detector: str
+    label: str
+    start: int
+    end: int
+
+
+class PreparedTexts(NamedTuple):
+    """Prompts normalized once for every detector that runs over them"""
+    texts: Texts  # pyarrow-backed Series when vectorized, else a list of str
+    lower: Texts
+    vectorized: bool
+    # Rows with non-ASCII text, which the vectorized path scans prompt by prompt
+    non_ascii: Optional[np.ndarray] = None
+
+    def subset(self, rows: np.ndarray) -> 'PreparedTexts':
+        """The prepared rows at positions ``rows``, dropping to per-prompt scanning once the batch is small"""
+        if not self.vectorized:
+            return PreparedTexts([self.texts[row] for row in rows], [self.lower[row] for row in rows], False)
+        texts, lower = self.texts.iloc[rows], self.lower.iloc[rows]
+        if len(rows) >= VECTORIZED_MIN_ROWS:
+            return PreparedTexts(texts, lower, True, self.non_ascii[rows])
+        return PreparedTexts(texts.tolist(), [simple_lower(text) for text in texts.tolist()], False)
+
+
+class DetectorScores(NamedTuple):
+    """One detector's verdict over a batch of prompts"""
+    scores: np.ndarray
+    violated: np.ndarray
+    messages: List[str]  # one per violated row, in row order
+
+
+def _trie_alternation(words: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie over ``words``"""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if terminal else '')
+
+    return emit(trie)
+
+
+def _named_scanner(patterns: Dict[str, str], flags: int = 0) -> re.Pattern:
+    """Merge patterns into one alternation tagged by trailing empty named groups.
+
+    The marker group goes at the end of each branch so every branch still
+    begins with its own literal, which keeps the engine's prefix skipping.
+    """
+    return re.compile('|'.join(f'(?:{pattern})(?P<{name}>)' for name, pattern in patterns.items()), flags)
+
+
+def _iter_matches(scanner: re.Pattern, text: str, pos: int = 0, stop: Optional[int] = None):
+    """Yield every match of ``scanner`` starting in ``text[pos:stop]``, including overlapping ones.
+
+    With ``stop`` short of the end, ``text`` is a window cut from a longer
+    input, and a match running into the window's end is skipped: the engine
+    never saw what follows it, so the match may not exist in the full text.
+    """
+    truncated = stop is not None and stop < len(text)
+    while True:
+        match = scanner.search(text, pos)
+        if match is None or (stop is not None and match.start() >= stop):
+            return
+        if not (truncated and match.end() >= len(text)):
+            yield match
+        pos = match.start() + 1
+
+
+def _contains_where(texts: 'pd.Series', pattern: str, prefilter: str) -> np.ndarray:
+    """Vectorized ``pattern`` match, run only on the rows that contain the ``prefilter`` literal"""
+    matched = np.zeros(len(texts), dtype=bool)
+    candidates = texts.str.contains(prefilter, regex=False).to_numpy(dtype=bool)
+    if candidates.any():
+        matched[candidates] = texts[candidates].str.contains(pattern).to_numpy(dtype=bool)
+    return matched
+
+
+def simple_lower(text: str) -> str:
+    """Lowercase without changing the length of the text.
+
+    ``str.lower`` maps U+0130 to ``i`` plus a combining dot, which would
+    shift hit spans, so that character is left as is; like the two code
+    points, it never completes a keyword that needs a plain ``i``.
+    """
+    if '\u0130' in text:
+        return '\u0130'.join(part.lower() for part in text.split('\u0130'))
+    return text.lower()
+
+
+def is_series(value: Any) -> bool:
+    """Whether ``value`` is a pandas Series, without importing pandas: no Series exists until it is loaded"""
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and isinstance(value, pandas.Series)
+
+
+def as_string_series(prompts: Union['pd.Series', Iterable[str]]) -> 'pd.Series':
+    """Coerce prompts to a pyarrow-backed string Series with missing values as empty strings"""
+    import pandas as pd
+
+    if not isinstance(prompts, pd.Series):
+        prompts = pd.Series(list(prompts), dtype=object)
+    return prompts.astype('string[pyarrow]').fillna('')
+
+
+class Detector(ABC):
+    """A guardrail check over prompt text"""
+
+    name = ''
+    label = ''
+    description = ''
+    default_enabled = True
+    # Rough seconds per prompt, used for ordering until a run has been measured
+    cost_hint = 1e-5
+
+    def __init__(self):
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._costs: Dict[bool, float] = {}
+        self._violation_rate = 0.5
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self):
+        """Build heavy resources such as compiled patterns or models; called once, when first enabled"""
+
+    def ensure_loaded(self) -> 'Detector':
+        """Run ``load`` if it has not run yet and return the detector"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+                    self._loaded = True
+        return self
+
+    def cost(self, vectorized: bool = False) -> float:
+        """Running average seconds per prompt on the given feature path"""
+        return self._costs.get(vectorized, self.cost_hint)
+
+    def violation_rate(self) -> float:
+        """Running average share of prompts this detector flagged"""
+        return self._violation_rate
+
+    def record_cost(self, seconds: float, rows: int, vectorized: bool = False, violations: int = 0):
+        """Fold one timed run over ``rows`` prompts, ``violations`` of them flagged, into the running averages"""
+        if rows:
+            previous = self._costs.get(vectorized)
+            per_row = seconds / rows
+            self._costs[vectorized] = per_row if previous is None else previous + COST_SMOOTHING * (per_row - previous)
+            self._violation_rate += COST_SMOOTHING * (violations / rows - self._violation_rate)
+
+    @abstractmethod
+    def scan(self, text: str, text_lower: str) -> List[Hit]:
+        """Every match in one prompt, with spans"""
+
+    @abstractmethod
+    def features(self, texts: Sequence[str], texts_lower: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Per-row match features, computed prompt by prompt"""
+
+    def features_vectorized(self, texts: 'pd.Series', texts_lower: 'pd.Series') -> Dict[str, np.ndarray]:
+        """The same features as ``features``, computed over a whole pyarrow-backed Series"""
+        return self.features(texts.tolist(), texts_lower.tolist())
+
+    @abstractmethod
+    def score_features(self, features: Dict[str, np.ndarray], guardrails_config: Dict, scorer: Scorer,
+                       row_keys: np.ndarray) -> DetectorScores:
+        """Turn per-row features into scores and violations.
+
+        ``row_keys`` are the prompts as prepared by ``scorer``; simulated
+        scores draw one value per row from it.
+        """
+
+    def stream_state(self) -> Dict[str, Any]:
+        """Fresh accumulator for ``feed``.
+
+        The default keeps the owned text, so detectors without streaming
+        support still work on streamed input, just without bounded memory.
+        """
+        return {'parts': [], 'lower_parts': []}
+
+    def feed(self, state: Dict[str, Any], text: str, text_lower: str, start: int, stop: int, offset: int):
+        """Accumulate the matches that start in ``text[start:stop]``.
+
+        ``text`` is a window that carries context on both sides of that range,
+        so patterns crossing a chunk seam still match; ``offset`` is the
+        window's position in the whole input.
+        """
+        state['parts'].append(text[start:stop])
+        state['lower_parts'].append(text_lower[start:stop])
+
+    def stream_features(self, state: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """One-row features for everything fed into ``state``"""
+        return self.features([''.join(state['parts'])], [''.join(state['lower_parts'])])
+
+    def evaluate(self, prepared: PreparedTexts, guardrails_config: Dict, scorer: Scorer,
+                 row_keys: np.ndarray) -> DetectorScores:
+        """Extract features on the prepared path, score them and record the time taken"""
+        started = time.perf_counter()
+        if prepared.vectorized:
+            features = self.features_vectorized(prepared.texts, prepared.lower)
+            rows = np.flatnonzero(prepared.non_ascii)
+            if len(rows):
+                texts = prepared.texts.iloc[rows].tolist()
+                local = self.features(texts, [simple_lower(text) for text in texts])
+                features = {key: np.array(values) for key, values in features.items()}
+                for key, values in local.items():
+                    features[key][rows] = values
+        else:
+            features = self.features(prepared.texts, prepared.lower)
+        result = self.score_features(features, guardrails_config, scorer, row_keys)
+        self.record_cost(time.perf_counter() - started, len(prepared.texts), prepared.vectorized, len(result.messages))
+        return result
+
+    def score_batch(self, texts: Texts, config: Dict, scorer: Optional[Scorer] = None) -> DetectorScores:
+        """Score many prompts with this detector alone"""
+        if is_series(texts):
+            texts = as_string_series(texts)
+        else:
+            texts = [text if isinstance(text, str) else '' for text in texts]
+        self.ensure_loaded()
+        scorer = scorer or make_scorer(config)
+        return self.evaluate(prepare_texts(texts), config.get('guardrails_config', {}), scorer, scorer.prepare(texts))
+
+    def score(self, text: str, config: Dict, scorer: Optional[Scorer] = None) -> Tuple[float, Optional[str]]:
+        """Score one prompt; returns the score and the violation message, if any"""
+        result = self.score_batch([text], config, scorer)
+        return float(result.scores[0]), (result.messages[0] if result.violated[0] else None)
+
+
+def prepare_texts(texts: Texts) -> PreparedTexts:
+    """Normalize and lowercase prompts once for all detectors.
+
+    A Series of at least ``VECTORIZED_MIN_ROWS`` rows takes the vectorized
+    path, apart from its non-ASCII rows; anything smaller is scanned prompt
+    by prompt.
+    """
+    if is_series(texts) and len(texts) >= VECTORIZED_MIN_ROWS:
+        texts = as_string_series(texts)
+        return PreparedTexts(texts, texts.str.lower(), True, texts.str.contains(NON_ASCII_PATTERN).to_numpy(dtype=bool))
+
+    texts = [text if isinstance(text, str) else '' for text in texts]
+    return PreparedTexts(texts, [simple_lower(text) for text in texts], False)
+
+
+class KeywordDetector(Detector):
+    """Matches a keyword list anywhere in the lowercased prompt, substrings included"""
+
+    keywords: Sequence[str] = ()
+    cost_hint = 5e-6
+
+    def load(self):
+        self.pattern = _trie_alternation(self.keywords)
+        self.scanner = re.compile(self.pattern)
+
+    def scan(self, text: str, text_lower: str) -> List[Hit]:
+        return [Hit(self.name, match.group(), match.start(), match.end())
+                for match in _iter_matches(self.scanner, text_lower)]
+
+    def features(self, texts: Sequence[str], texts_lower: Sequence[str]) -> Dict[str, np.ndarray]:
+        search = self.scanner.search
+        return {'matched': np.fromiter((search(text) is not None for text in texts_lower), dtype=int, count=len(texts))}
+
+    def features_vectorized(self, texts: 'pd.Series', texts_lower: 'pd.Series') -> Dict[str, np.ndarray]:
+        return {'matched': texts_lower.str.contains(self.pattern).to_numpy(dtype=int)}
+
+    def stream_state(self):
+        return {'words': set()}
+
+    def feed(self, state, text, text_lower, start, stop, offset):
+        state['words'].update(match.group() for match in _iter_matches(self.scanner, text_lower, start, stop))
+
+    def stream_features(self, state):
+        return {'matched': np.array([int(bool(state['words']))])}
+
+
+class ToxicityDetector(KeywordDetector):
+    name = 'toxicity'
+    label = "Toxicity Detection"
+    description = "Toxic or violent language, scored against the toxicity threshold"
+    keywords = TOXIC_KEYWORDS
+
+    def score_features(self, features, guardrails_config, scorer, row_keys):
+        # Simulated score; in actual implementation, this would use watsonx governance SDK
+        toxic = features['matched'] > 0
+        scores = scorer.uniform(np.where(toxic, 0.6, 0.0), np.where(toxic, 0.9, 0.3), row_keys, 'toxicity')
+        violated = scores > guardrails_config.get('toxicity_threshold', 0.7)
+        return DetectorScores(scores, violated,
+                              [f"High toxicity detected (score: {score:.3f})" for score in scores[violated]])
+
+
+class HateSpeechDetector(KeywordDetector):
+    name = 'hate_speech'
+    label = "Hate Speech Detection"
+    description = "Discriminatory or supremacist language"
+    keywords = HATE_KEYWORDS
+
+    def score_features(self, features, guardrails_config, scorer, row_keys):
+        hateful = features['matched'] > 0
+        scores = scorer.uniform(np.where(hateful, 0.7, 0.0), np.where(hateful, 0.95, 0.2), row_keys, 'hate_speech')
+        violated = scores > 0.5
+        return DetectorScores(scores, violated,
+                              [f"Hate speech detected (score: {score:.3f})" for score in scores[violated]])
+
+
+class ProfanityDetector(KeywordDetector):
+    name = 'profanity'
+    label = "Profanity Filter"
+    description = "Profane words; each distinct word adds 0.3 to the score"
+    keywords = PROFANITY_WORDS
+
+    def features(self, texts, texts_lower):
+        counts = [len({match.group() for match in _iter_matches(self.scanner, text)}) for text in texts_lower]
+        return {'words': np.array(counts, dtype=int).reshape(len(texts))}
+
+    def features_vectorized(self, texts, texts_lower):
+        return {'words': sum(texts_lower.str.contains(word, regex=False).to_numpy(dtype=int) for word in self.keywords)}
+
+    def stream_features(self, state):
+        return {'words': np.array([len(state['words'])])}
+
+    def score_features(self, features, guardrails_config, scorer, row_keys):
+        scores = np.minimum(features['words'] * 0.3, 1.0)
+        violated = scores > 0.3
+        return DetectorScores(scores, violated,
+                              [f"Profanity detected (score: {score:.3f})" for score in scores[violated]])
+
+
+class PIIDetector(Detector):
+    name = 'pii'
+    label = "PII Detection"
+    description = "Email addresses, phone numbers and US social security numbers"
+
+    kinds = ('email', 'phone', 'ssn')
+    cost_hint = 2e-5
+
+    def load(self):
+        self.email_scanner = _named_scanner({'email': EMAIL_PATTERN})
+        self.phone_ssn_scanner = _named_scanner({'phone': PHONE_PATTERN, 'ssn': SSN_PATTERN})
+
+    def scan(self, text: str, text_lower: str, start: int = 0, stop: Optional[int] = None) -> List[Hit]:
+        # Each scanner is skipped unless its required literal is in the prompt
+        hits = []
+        if '@' in text:
+            hits.extend(Hit(self.name, match.lastgroup, match.start(), match.end())
+                        for match in _iter_matches(self.email_scanner, text, start, stop))
+        if '-' in text:
+            hits.extend(Hit(self.name, match.lastgroup, match.start(), match.end())
+                        for match in _iter_matches(self.phone_ssn_scanner, text, start, stop))
+        return hits
+
+    def features(self, texts, texts_lower):
+        rows = []
+        for text, text_lower in zip(texts, texts_lower):
+            found = {hit.label for hit in self.scan(text, text_lower)}
+            rows.append([kind in found for kind in self.kinds])
+        columns = np.array(rows, dtype=int).reshape(len(texts), len(self.kinds)).T
+        return dict(zip(self.kinds, columns))
+
+    def features_vectorized(self, texts, texts_lower):
+        return {
+            'email': _contains_where(texts, EMAIL_PATTERN, '@').astype(int),
+            'phone': _contains_where(texts, PHONE_PATTERN, '-').astype(int),
+            'ssn': _contains_where(texts, SSN_PATTERN, '-').astype(int),
+        }
+
+    def stream_state(self):
+        return {'kinds': set()}
+
+    def feed(self, state, text, text_lower, start, stop, offset):
+        state['kinds'].update(hit.label for hit in self.scan(text, text_lower, start, stop))
+
+    def stream_features(self, state):
+        return {kind: np.array([int(kind in state['kinds'])]) for kind in self.kinds}
+
+    def score_features(self, features, guardrails_config, scorer, row_keys):
+        pii_count = sum(features[kind] for kind in self.kinds)
+        violated = pii_count > 0
+        messages = [
+            f"PII detected: {', '.join(kind for kind in self.kinds if features[kind][row])}"
+            for row in np.flatnonzero(violated)
+        ]
+        return DetectorScores(np.minimum(pii_count * 0.5, 1.0), violated, messages)
+
+
+class PromptInjectionDetector(Detector):
+    name = 'prompt_injection'
+    label = "Prompt Injection Detection"
+    description = "Attempts to override instructions, plus punctuation and newline heuristics"
+    cost_hint = 1.5e-5
+
+    def load(self):
+        self.groups = {f'inj{i}': pattern for i, pattern in enumerate(INJECTION_PATTERNS)}
+        patterns = {name: _SCANNER_REWRITES.get(pattern, pattern) for name, pattern in self.groups.items()}
+        self.scanner = _named_scanner(patterns)
+        # Lowercasing leaves a few characters that still match case-insensitively,
+        # such as U+0130 and the long s, so non-ASCII text keeps IGNORECASE
+        self.unicode_scanner = _named_scanner(patterns, re.IGNORECASE)
+        self.punctuation_scanner = re.compile(PUNCTUATION_RUN_PATTERN)
+
+    def scan(self, text: str, text_lower: str, start: int = 0, stop: Optional[int] = None) -> List[Hit]:
+        scanner = self.scanner if text_lower.isascii() else self.unicode_scanner
+        return [Hit(self.name, self.groups[match.lastgroup], match.start(), match.end())
+                for match in _iter_matches(scanner, text_lower, start, stop)]
+
+    def features(self, texts, texts_lower):
+        rows = [
+            (len({hit.label for hit in self.scan(text, text_lower)}),
+             len(self.punctuation_scanner.findall(text)),
+             text.count('\n'),
+             len(text))
+            for text, text_lower in zip(texts, texts_lower)
+        ]
+        columns = np.array(rows, dtype=int).reshape(len(texts), 4).T
+        return dict(zip(['patterns', 'punctuation_runs', 'newlines', 'length'], columns))
+
+    def features_vectorized(self, texts, texts_lower):
+        return {
+            'patterns': sum(texts_lower.str.contains(pattern).to_numpy(dtype=int) for pattern in INJECTION_PATTERNS),
+            'punctuation_runs': texts.str.count(PUNCTUATION_RUN_PATTERN).to_numpy(dtype=int),
+            'newlines': texts.str.count('\n').to_numpy(dtype=int),
+            'length': texts.str.len().to_numpy(dtype=int),
+        }
+
+    def stream_state(self):
+        return {'patterns': set(), 'punctuation_runs': 0, 'punctuation_end': 0, 'newlines': 0, 'length': 0}
+
+    def feed(self, state, text, text_lower, start, stop, offset):
+        state['patterns'].update(hit.label for hit in self.scan(text, text_lower, start, stop))
+        # Runs are counted without overlap, like findall, so the search
+        # resumes after the last run even when it reached into this window
+        pos = max(start, state['punctuation_end'] - offset)
+        for match in self.punctuation_scanner.finditer(text, pos):
+            if match.start() >= stop:
+                break
+            state['punctuation_runs'] += 1
+            state['punctuation_end'] = offset + match.end()
+        state['newlines'] += text.count('\n', start, stop)
+        state['length'] += stop - start
+
+    def stream_features(self, state):
+        return {
+            'patterns': np.array([len(state['patterns'])]),
+            'punctuation_runs': np.array([state['punctuation_runs']]),
+            'newlines': np.array([state['newlines']]),
+            'length': np.array([state['length']]),
+        }
+
+    def score_features(self, features, guardrails_config, scorer, row_keys):
+        scores = features['patterns'] * 0.3
+
+        # Additional heuristics
+        scores = scores + np.where(features['punctuation_runs'] > 2, 0.2, 0.0)
+        scores = scores + np.where((features['newlines'] > 10) & (features['length'] < 500), 0.1, 0.0)
+
+        scores = np.minimum(scores, 1.0)
+        violated = scores > 0.5
+        return DetectorScores(scores, violated,
+                              [f"Prompt injection detected (score: {score:.3f})" for score in scores[violated]])
+
+
+_registry: Dict[str, Detector] = {}
+_registry_lock = threading.Lock()
+
+
+def register_detector(detector: Detector, replace: bool = False) -> Detector:
+    """Add a detector to the registry; its ``name`` becomes its ``guardrails_config`` key"""
+    with _registry_lock:
+        if detector.name in _registry and not replace:
+            raise ValueError(f"Detector already registered: {detector.name}")
+        _registry[detector.name] = detector
+    return detector
+
+
+def get_detectors() -> List[Detector]:
+    """Every registered detector in reporting order, loaded or not"""
+    return list(_registry.values())
+
+
+def detector_names() -> List[str]:
+    """Names of every registered detector in reporting order"""
+    return list(_registry)
+
+
+def get_detector(name: str) -> Detector:
+    """Return a registered detector, loading it first if needed"""
+    return _registry[name].ensure_loaded()
+
+
+def by_cost(detectors: Sequence[Detector], vectorized: bool = False) -> List[Detector]:
+    """``detectors`` ordered for stopping at the first violation.
+
+    Ranked by measured seconds per prompt divided by violation rate, which
+    minimises the expected time to reach a verdict on a violating prompt;
+    prompts that pass every check cost the same in any order.
+    """
+    return sorted(detectors, key=lambda detector: detector.cost(vectorized) / max(detector.violation_rate(),
+                                                                                   MIN_VIOLATION_RATE))
+
+
+def enabled_detectors(guardrails_config: Dict) -> List[Detector]:
+    """Loaded detectors switched on in ``guardrails_config``, in reporting order"""
+    return [detector.ensure_loaded() for detector in get_detectors() if guardrails_config.get(detector.name, False)]
+
+
+for _detector in (ToxicityDetector(), HateSpeechDetector(), ProfanityDetector(), PIIDetector(),
+                  PromptInjectionDetector()):
+    register_detector(_detector)
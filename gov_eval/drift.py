@@ -0,0 +1,246 @@
+"""Streaming drift detection over evaluated runs
+
+A ``DriftMonitor`` compares each model's latest runs against a reference
+window of its first ones, feature by feature. Drift depends on the order runs
+arrive in, so drift results are never cached or batched.
+"""
+from collections import deque
+from typing import Dict, List, Any, Deque, Optional, Tuple
+import math
+import os
+import threading
+
+import numpy as np
+
+DRIFT_EVALUATOR = "Drift Evaluation"
+
+DRIFT_REFERENCE_RUNS = 200
+DRIFT_WINDOW_RUNS = 100
+
+# PSI at or above this marks a feature as drifted; 0.1 is usually read as
+# moderate drift and 0.25 as significant drift
+DRIFT_PSI_THRESHOLD = 0.25
+
+# Bin proportions are floored at this before taking logs, so empty bins do not make PSI infinite
+DRIFT_EPSILON = 1e-4
+
+# Scores and metrics live in [0, 1]; lengths and counts are binned on a log scale
+UNIT_EDGES = np.linspace(0.0, 1.0, 26)
+COUNT_EDGES = np.concatenate(([0.0], np.geomspace(1.0, 1e6, 25)))
+
+DATA, PREDICTION, ACCURACY = 'data', 'prediction', 'accuracy'
+
+_monitors: Dict[str, 'DriftMonitor'] = {}
+_monitors_lock = threading.Lock()
+
+
+class StreamingHistogram:
+    """Counts over fixed bin edges; values outside the edges land in the first or last bin"""
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1)
+
+    @property
+    def total(self) -> float:
+        return float(self.counts.sum())
+
+    def bin_index(self, value: float) -> int:
+        return int(np.clip(np.searchsorted(self.edges, value, side='right') - 1, 0, len(self.counts) - 1))
+
+    def add(self, index: int, weight: float = 1.0):
+        self.counts[index] += weight
+
+    def copy(self) -> 'StreamingHistogram':
+        histogram = StreamingHistogram(self.edges)
+        histogram.counts = self.counts.copy()
+        return histogram
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    if total <= 0:
+        return np.full(len(counts), 1.0 / len(counts))
+    return counts / total
+
+
+def population_stability_index(reference: np.ndarray, current: np.ndarray) -> float:
+    """PSI between two count vectors over the same bins"""
+    p = np.maximum(_proportions(reference), DRIFT_EPSILON)
+    q = np.maximum(_proportions(current), DRIFT_EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_statistic(reference: np.ndarray, current: np.ndarray) -> float:
+    """Largest gap between the two binned cumulative distributions"""
+    return float(np.max(np.abs(np.cumsum(_proportions(reference)) - np.cumsum(_proportions(current)))))
+
+
+def js_distance(reference: np.ndarray, current: np.ndarray) -> float:
+    """Jensen-Shannon distance (base 2, in [0, 1]) between two count vectors"""
+    p, q = _proportions(reference), _proportions(current)
+    m = (p + q) / 2
+
+    def kl(a: np.ndarray) -> float:
+        mask = a > 0
+        return float(np.sum(a[mask] * np.log2(a[mask] / m[mask])))
+
+    return math.sqrt(max((kl(p) + kl(q)) / 2, 0.0))
+
+
+def run_features(results: Dict[str, Any]) -> Dict[Tuple[str, str], float]:
+    """``(group, feature) -> value`` for one run.
+
+    Data features describe the prompt (its length, whitespace token count and
+    guardrail scores), prediction features are the other evaluators' metrics
+    and accuracy features the ``accuracy`` metrics among them.
+    """
+    prompt = results.get('prompt') or ''
+    features = {
+        (DATA, 'prompt_length'): float(len(prompt)),
+        (DATA, 'token_count'): float(len(prompt.split())),
+    }
+    guardrails = results.get('guardrails') or {}
+    for detector, score in (guardrails.get('scores') or {}).items():
+        features[(DATA, f"guardrails.{detector}")] = float(score)
+
+    for evaluator, evaluation in results.get('evaluations', {}).items():
+        if evaluator == DRIFT_EVALUATOR or evaluation.get('status') != 'completed':
+            continue
+        for metric, value in evaluation.items():
+            if metric != 'status' and isinstance(value, (int, float)) and not isinstance(value, bool):
+                group = ACCURACY if metric == 'accuracy' else PREDICTION
+                features[(group, f"{evaluator}.{metric}")] = float(value)
+    return features
+
+
+class DriftMonitor:
+    """Reference and sliding-window histograms per feature, updated one run at a time; thread-safe.
+
+    The first ``reference_runs`` runs become the reference and a sliding
+    window then holds the latest ``window_runs``. Each run moves one count per
+    feature into the window and, once it is full, one out, so the statistics
+    come from the counts without rescanning earlier runs.
+    """
+
+    def __init__(self, reference_runs: int = DRIFT_REFERENCE_RUNS, window_runs: int = DRIFT_WINDOW_RUNS):
+        self.reference_runs = reference_runs
+        self.window_runs = window_runs
+        self._reference: Dict[Tuple[str, str], StreamingHistogram] = {}
+        self._current: Dict[Tuple[str, str], StreamingHistogram] = {}
+        # Bin of every feature of each run in the window, to take it back out when the run leaves
+        self._window: Deque[List[Tuple[Tuple[str, str], int]]] = deque()
+        self._reference_size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _edges(feature: Tuple[str, str]) -> np.ndarray:
+        return COUNT_EDGES if feature[0] == DATA and not feature[1].startswith('guardrails.') else UNIT_EDGES
+
+    def _histogram(self, histograms: Dict[Tuple[str, str], StreamingHistogram],
+                   feature: Tuple[str, str]) -> StreamingHistogram:
+        histogram = histograms.get(feature)
+        if histogram is None:
+            histogram = histograms[feature] = StreamingHistogram(self._edges(feature))
+        return histogram
+
+    @property
+    def ready(self) -> bool:
+        """Whether the reference window is complete"""
+        return self._reference_size >= self.reference_runs
+
+    def observe(self, results: Dict[str, Any]):
+        """Add one finished run to the reference, or to the sliding window once the reference is full"""
+        features = run_features(results)
+        with self._lock:
+            if not self.ready:
+                for feature, value in features.items():
+                    histogram = self._histogram(self._reference, feature)
+                    histogram.add(histogram.bin_index(value))
+                self._reference_size += 1
+                return
+
+            bins = []
+            for feature, value in features.items():
+                histogram = self._histogram(self._current, feature)
+                index = histogram.bin_index(value)
+                histogram.add(index)
+                bins.append((feature, index))
+            self._window.append(bins)
+            if len(self._window) > self.window_runs:
+                for feature, index in self._window.popleft():
+                    self._current[feature].add(index, -1.0)
+
+    def rebaseline(self):
+        """Make the current window the reference and start a new window"""
+        with self._lock:
+            if not self._window:
+                return
+            self._reference = {feature: histogram.copy() for feature, histogram in self._current.items()}
+            self._reference_size = max(len(self._window), self.reference_runs)
+            self._current = {}
+            self._window.clear()
+
+    def feature_drift(self) -> Dict[str, Dict[str, Any]]:
+        """PSI, KS and JS distance of every feature seen in both the reference and the window"""
+        with self._lock:
+            pairs = [(feature, self._reference[feature].counts.copy(), histogram.counts.copy())
+                     for feature, histogram in self._current.items()
+                     if feature in self._reference and histogram.total > 0 and self._reference[feature].total > 0]
+        return {
+            name: {
+                'group': group,
+                'psi': population_stability_index(reference, current),
+                'ks': ks_statistic(reference, current),
+                'js': js_distance(reference, current),
+            }
+            for (group, name), reference, current in pairs
+        }
+
+    def evaluate(self) -> Dict[str, Any]:
+        """Drift Evaluation result for the runs observed so far: the largest PSI in each feature group"""
+        with self._lock:
+            ready, reference_size, window_size = self.ready, self._reference_size, len(self._window)
+        if not ready:
+            return {'status': 'baseline',
+                    'message': f"Collecting drift reference: {reference_size} of {self.reference_runs} runs"}
+        if window_size == 0:
+            return {'status': 'baseline', 'message': "Drift reference complete; waiting for new runs to compare"}
+
+        drift = self.feature_drift()
+
+        def largest(group: str) -> float:
+            return round(max((stats['psi'] for stats in drift.values() if stats['group'] == group), default=0.0), 4)
+
+        return {
+            'data_drift': largest(DATA),
+            'prediction_drift': largest(PREDICTION),
+            'accuracy_drift': largest(ACCURACY),
+            'ks_statistic': round(max((stats['ks'] for stats in drift.values()), default=0.0), 4),
+            'js_distance': round(max((stats['js'] for stats in drift.values()), default=0.0), 4),
+            'drifted_features': sorted(name for name, stats in drift.items() if stats['psi'] >= DRIFT_PSI_THRESHOLD),
+            'status': 'completed'
+        }
+
+    def update(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Observe one finished run and return the drift result that includes it"""
+        self.observe(results)
+        return self.evaluate()
+
+
+def get_drift_monitor(model: Optional[str]) -> DriftMonitor:
+    """Return the process-wide drift monitor for ``model``, created on first use.
+
+    ``GOV_EVAL_DRIFT_REFERENCE_RUNS`` and ``GOV_EVAL_DRIFT_WINDOW_RUNS`` size
+    the reference and sliding windows of new monitors. Batch workers started
+    with ``--workers`` each keep their own monitors.
+    """
+    key = model or ''
+    with _monitors_lock:
+        monitor = _monitors.get(key)
+        if monitor is None:
+            monitor = _monitors[key] = DriftMonitor(
+                int(os.getenv("GOV_EVAL_DRIFT_REFERENCE_RUNS", DRIFT_REFERENCE_RUNS)),
+                int(os.getenv("GOV_EVAL_DRIFT_WINDOW_RUNS", DRIFT_WINDOW_RUNS))
+            )
+        return monitor
@@ -0,0 +1,117 @@
+"""Streaming report exports
+
+Exports are written from an iterator of row chunks (lists of tuples in
+``columns`` order) straight into a binary sink, one chunk at a time, so
+neither a DataFrame nor the whole file as a string is ever built:
+
+- ``csv`` and ``jsonl`` encode each chunk and write it before the next is
+  read
+- ``parquet`` writes each chunk as a row group through ``pyarrow``
+
+``result_chunks`` flattens one results dict with the same rows as the
+history, and ``EvaluationHistory.iter_rows`` reads stored runs a chunk at a
+time, so a history export of any size costs one chunk of memory plus the
+output. ``export_file`` writes to a temporary file that stays in memory
+while it is small and spills to disk after ``EXPORT_SPOOL_BYTES``.
+"""
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator, Sequence
+import csv
+import io
+import json
+import math
+import tempfile
+
+from gov_eval.history import flatten_results
+from gov_eval.instrumentation import time_stage
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+EXPORT_MIME_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+RESULT_COLUMNS = ['evaluator', 'metric', 'value', 'status', 'error']
+
+# Columns written as floats; every other column is text
+FLOAT_COLUMNS = {'timestamp', 'value'}
+
+# Exports up to this size stay in memory; larger ones spill to a temporary file
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def result_chunks(results: Dict[str, Any]) -> Iterator[List[tuple]]:
+    """``RESULT_COLUMNS`` rows of one results dict, guardrails included, as a single chunk"""
+    yield flatten_results(results)
+
+
+def iter_csv(chunks: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    """UTF-8 CSV with a header row, one encoded piece per chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    # The header alone, for an export with no rows
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _json_value(value: Any) -> Any:
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def iter_jsonl(chunks: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    """One JSON object per row and line, one encoded piece per chunk"""
+    for chunk in chunks:
+        yield ''.join(json.dumps(dict(zip(columns, map(_json_value, row)))) + '\n' for row in chunk).encode('utf-8')
+
+
+def write_parquet(chunks: Iterable[List[tuple]], columns: Sequence[str], sink: BinaryIO):
+    """Parquet file with one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.float64() if column in FLOAT_COLUMNS else pa.string()) for column in columns])
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+def write_export(chunks: Iterable[List[tuple]], columns: Sequence[str], export_format: str, sink: BinaryIO):
+    """Stream rows into ``sink`` as ``csv``, ``jsonl`` or ``parquet``"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {export_format!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    with time_stage(f"export.{export_format}"):
+        if export_format == 'parquet':
+            write_parquet(chunks, columns, sink)
+        else:
+            for piece in (iter_csv if export_format == 'csv' else iter_jsonl)(chunks, columns):
+                sink.write(piece)
+
+
+def export_file(chunks: Iterable[List[tuple]], columns: Sequence[str], export_format: str) -> BinaryIO:
+    """Temporary file holding the export, rewound to the start; close it when done"""
+    sink = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    write_export(chunks, columns, export_format, sink)
+    sink.seek(0)
+    return sink
+
+
+def export_bytes(chunks: Iterable[List[tuple]], columns: Sequence[str], export_format: str) -> bytes:
+    """The whole export, for download buttons that need the content up front"""
+    with export_file(chunks, columns, export_format) as sink:
+        return sink.read()
+
+
+def json_report(results: Dict[str, Any]) -> bytes:
+    """The results dict as an indented JSON document"""
+    with time_stage('export.json'):
+        return json.dumps(results, indent=2).encode('utf-8')
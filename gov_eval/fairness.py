@@ -0,0 +1,164 @@
+"""Group fairness metrics for the Fairness Evaluation evaluator
+
+A labeled dataset, one row per decision with the protected group, the true
+label and the model's prediction, is reduced in one pass to a confusion table
+per group; the metrics and their bootstrap intervals only use that table.
+Metrics are scaled so 1.0 is perfectly fair, like the other evaluators' scores.
+"""
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
+import math
+import warnings
+
+import numpy as np
+
+from gov_eval.datasets import DatasetSource, read_dataset
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FAIRNESS_EVALUATOR = "Fairness Evaluation"
+FAIRNESS_METRICS = ['demographic_parity', 'equalized_odds', 'statistical_parity']
+
+# Bootstrap resamples behind each confidence interval
+FAIRNESS_RESAMPLES = 1000
+FAIRNESS_CONFIDENCE = 0.95
+
+CONFUSION_COLUMNS = ['tp', 'fp', 'fn', 'tn']
+
+
+def load_labeled_dataset(source: DatasetSource, group_column: str = 'group', label_column: str = 'label',
+                         prediction_column: str = 'prediction', name: Optional[str] = None) -> 'pd.DataFrame':
+    """Read the group, label and prediction columns of a CSV or Parquet dataset"""
+    return read_dataset(source, [group_column, label_column, prediction_column], name)
+
+
+def _binary(values: 'pd.Series', positive_label: Any) -> np.ndarray:
+    import pandas as pd
+
+    if pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=bool)
+    return (values == positive_label).to_numpy()
+
+
+def confusion_counts(frame: 'pd.DataFrame', group_column: str = 'group', label_column: str = 'label',
+                     prediction_column: str = 'prediction', positive_label: Any = 1) -> 'pd.DataFrame':
+    """Confusion table per group, indexed by group, in one pass over the rows.
+
+    Labels and predictions equal to ``positive_label`` (or ``True``) are the
+    favourable outcome. Rows missing any of the three columns are skipped.
+    """
+    import pandas as pd
+
+    frame = frame[[group_column, label_column, prediction_column]].dropna()
+    codes, groups = pd.factorize(frame[group_column], sort=True)
+    label = _binary(frame[label_column], positive_label)
+    prediction = _binary(frame[prediction_column], positive_label)
+    # Cell order within a group matches CONFUSION_COLUMNS: tp, fp, fn, tn
+    cell = codes * 4 + (~prediction) * 2 + (~label)
+    counts = np.bincount(cell, minlength=len(groups) * 4).reshape(len(groups), 4)
+    return pd.DataFrame(counts, index=pd.Index(groups, name=group_column), columns=CONFUSION_COLUMNS)
+
+
+def _metrics(table: np.ndarray) -> Dict[str, np.ndarray]:
+    """Fairness metrics of ``(..., groups, 4)`` confusion tables, over the leading axes.
+
+    ``demographic_parity`` is the lowest group selection rate divided by the
+    highest (the disparate impact ratio), ``statistical_parity`` one minus
+    their gap and ``equalized_odds`` one minus the larger of the true and
+    false positive rate gaps between groups.
+    """
+    tp, fp, fn, tn = (table[..., i].astype(float) for i in range(4))
+
+    def spread(rate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Undefined rates are NaN and skipped; groups can only be compared
+        # when at least two of them define the rate, otherwise both are NaN
+        comparable = np.count_nonzero(~np.isnan(rate), axis=-1) >= 2
+        return (np.where(comparable, np.nanmin(rate, axis=-1), np.nan),
+                np.where(comparable, np.nanmax(rate, axis=-1), np.nan))
+
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lowest, highest = spread((tp + fp) / (tp + fp + fn + tn))
+        tpr_low, tpr_high = spread(tp / (tp + fn))
+        fpr_low, fpr_high = spread(fp / (fp + tn))
+        return {
+            'demographic_parity': np.where(highest == 0, 1.0, lowest / highest),
+            'equalized_odds': 1.0 - np.fmax(tpr_high - tpr_low, fpr_high - fpr_low),
+            'statistical_parity': 1.0 - (highest - lowest),
+        }
+
+
+def group_rates(counts: 'pd.DataFrame') -> 'pd.DataFrame':
+    """Rows, selection rate and true and false positive rates per group"""
+    import pandas as pd
+
+    rows = counts.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return pd.DataFrame({
+            'rows': rows,
+            'selection_rate': (counts['tp'] + counts['fp']) / rows,
+            'true_positive_rate': counts['tp'] / (counts['tp'] + counts['fn']),
+            'false_positive_rate': counts['fp'] / (counts['fp'] + counts['tn']),
+        })
+
+
+def bootstrap_intervals(counts: 'pd.DataFrame', confidence: float = FAIRNESS_CONFIDENCE,
+                        resamples: int = FAIRNESS_RESAMPLES, seed: Optional[int] = None) -> Dict[str, List[float]]:
+    """Percentile bootstrap ``[low, high]`` interval of every metric at the ``confidence`` level.
+
+    Resampling the rows with replacement only changes the confusion table,
+    and the resampled table is a multinomial draw over its cells, so every
+    resample is drawn at once from the table, at a cost that does not grow
+    with the dataset.
+    """
+    cells = counts.to_numpy().ravel()
+    total = int(cells.sum())
+    rng = np.random.default_rng(seed)
+    tables = rng.multinomial(total, cells / total, size=resamples).reshape(resamples, *counts.shape)
+    tail = (1.0 - min(max(confidence, 0.0), 1.0)) / 2 * 100
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return {
+            metric: [float(bound) for bound in np.nanpercentile(values, [tail, 100 - tail])]
+            for metric, values in _metrics(tables).items()
+        }
+
+
+def _rounded(value: float) -> Optional[float]:
+    """``value`` rounded for the result, or None where it is undefined (NaN)"""
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
+def confidence_level(config: Dict[str, Any]) -> float:
+    """Interval level from the config's ``fairness_confidence``"""
+    return float(config.get('fairness_confidence', FAIRNESS_CONFIDENCE))
+
+
+def evaluate_fairness(counts: 'pd.DataFrame', confidence: float = FAIRNESS_CONFIDENCE,
+                      resamples: int = FAIRNESS_RESAMPLES, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Fairness Evaluation result for a labeled dataset's confusion table"""
+    if len(counts) < 2:
+        return {'status': 'failed', 'error': f"Fairness needs at least two groups, found {len(counts)}"}
+
+    point = _metrics(counts.to_numpy())
+    intervals = bootstrap_intervals(counts, confidence, resamples, seed)
+    rates = group_rates(counts)
+    result: Dict[str, Any] = {metric: _rounded(point[metric]) for metric in FAIRNESS_METRICS}
+    result['confidence_intervals'] = {metric: [_rounded(bound) for bound in intervals[metric]]
+                                      for metric in FAIRNESS_METRICS}
+    result['groups'] = {str(group): {'rows': int(row['rows']), **{name: _rounded(value)
+                                                                  for name, value in row.drop('rows').items()}}
+                        for group, row in rates.iterrows()}
+    result['status'] = 'completed'
+    return result
+
+
+def run_fairness(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Fairness Evaluation for ``config['fairness_counts']``; a seeded or deterministic config seeds the bootstrap"""
+    seed = config.get('seed')
+    if seed is None and config.get('deterministic', False):
+        seed = 0
+    return evaluate_fairness(config['fairness_counts'], confidence_level(config),
+                             seed=None if seed is None else int(seed))
@@ -0,0 +1,287 @@
+"""Real-time guardrails engine
+
+The checks themselves are ``Detector`` units from ``gov_eval.detectors``; this
+module runs the ones enabled in ``guardrails_config`` and combines their
+verdicts. Disabled detectors are neither loaded nor run.
+
+Two modes are supported. ``report`` scores every enabled detector, for the
+results view and exports. ``gate`` is for screening: detectors run in order
+of measured cost and a prompt stops at its first violation, so blocked
+prompts usually cost one cheap check instead of a full scan.
+
+Scoring is columnar: ``evaluate_guardrails_batch`` screens a whole Series of
+prompts and returns one row per prompt. Large batches are matched with
+vectorized pandas string methods, small ones prompt by prompt with compiled
+scanners; both feed the same NumPy scoring core, which
+``evaluate_guardrails_realtime`` also wraps for a single prompt without
+importing pandas.
+"""
+from typing import TYPE_CHECKING, Dict, List, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple, Union
+import codecs
+
+import numpy as np
+
+from gov_eval.cache import ResultCache, guardrails_cache_key
+from gov_eval.detectors import (Detector, DetectorScores, Hit, PreparedTexts, as_string_series, by_cost,
+                                detector_names, enabled_detectors, get_detector, prepare_texts, simple_lower)
+from gov_eval.instrumentation import record_event, time_stage, timed
+from gov_eval.scoring import Scorer, make_scorer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# ``report`` runs every enabled detector; ``gate`` stops at the first violation
+GUARDRAIL_MODES = ('report', 'gate')
+
+# Streaming: text is read in chunks of STREAM_CHUNK_CHARS and every window
+# keeps STREAM_OVERLAP_CHARS of context on each side of the range it scans,
+# which bounds the longest single match that is guaranteed to be seen whole.
+# evaluate_guardrails_realtime streams prompts longer than STREAM_MIN_CHARS.
+STREAM_CHUNK_CHARS = 64 * 1024
+STREAM_OVERLAP_CHARS = 1024
+STREAM_MIN_CHARS = 1024 * 1024
+
+
+def scan_text(prompt_text: str, detectors: Optional[Sequence[str]] = None) -> Dict[str, List[Hit]]:
+    """Scan a prompt with the named detectors (default: all registered) and group hits by detector"""
+    prompt_lower = simple_lower(prompt_text)
+    return {name: get_detector(name).scan(prompt_text, prompt_lower) for name in (detectors or detector_names())}
+
+
+def _run_detectors(detectors: List[Detector], prepared: PreparedTexts, config: Dict, scorer: Scorer,
+                   row_keys: np.ndarray, mode: str):
+    """Run detectors over prepared prompts and combine their verdicts"""
+    guardrails_config = config.get('guardrails_config', {})
+    n = len(row_keys)
+
+    def evaluate(detector: Detector, rows: np.ndarray) -> DetectorScores:
+        if len(rows) == n:
+            return detector.evaluate(prepared, guardrails_config, scorer, row_keys)
+        return detector.evaluate(prepared.subset(rows), guardrails_config, scorer, row_keys[rows])
+
+    return _combine_verdicts(detectors, evaluate, n, mode, prepared.vectorized)
+
+
+def _combine_verdicts(detectors: List[Detector], evaluate: Callable[[Detector, np.ndarray], DetectorScores], n: int,
+                      mode: str, vectorized: bool = False):
+    """Collect ``evaluate(detector, rows)`` verdicts into scores, pass flags, violation messages and per-detector violation flags.
+
+    In ``report`` mode every detector scores every row. In ``gate`` mode the
+    detectors run cheapest first and each one only sees the rows that have
+    not failed yet, so a violating prompt stops at its first violation;
+    scores a detector never computed are NaN.
+    """
+    if mode not in GUARDRAIL_MODES:
+        raise ValueError(f"Unknown guardrails mode: {mode}")
+
+    scores: Dict[str, np.ndarray] = {}
+    violated: Dict[str, np.ndarray] = {}
+    passed = np.ones(n, dtype=bool)
+    violations: List[List[str]] = [[] for _ in range(n)]
+    gate = mode == 'gate'
+    rows = np.arange(n)
+
+    # Simulate real-time guardrails evaluation
+    # In actual implementation, this would use watsonx governance SDK
+    for detector in (by_cost(detectors, vectorized) if gate else detectors):
+        if not len(rows):
+            break
+        with time_stage(f"guardrails.{detector.name}"):
+            result = evaluate(detector, rows)
+        if len(rows) == n:
+            scores[detector.name] = result.scores
+        else:
+            scores[detector.name] = np.full(n, np.nan)
+            scores[detector.name][rows] = result.scores
+
+        violated[detector.name] = np.zeros(n, dtype=bool)
+        if result.messages:
+            violated_rows = rows[result.violated]
+            violated[detector.name][violated_rows] = True
+            passed[violated_rows] = False
+            for row, message in zip(violated_rows, result.messages):
+                violations[row].append(message)
+            if gate:
+                rows = rows[~result.violated]
+
+    # Update message based on results
+    messages = [
+        f"Guardrails violations: {'; '.join(row_violations)}" if row_violations else 'All guardrails passed'
+        for row_violations in violations
+    ]
+    # Report scores in registry order whatever order the detectors ran in
+    scores = {detector.name: np.round(scores[detector.name], 3) for detector in detectors if detector.name in scores}
+    violated = {detector.name: violated[detector.name] for detector in detectors if detector.name in violated}
+    return scores, passed, violations, messages, violated
+
+
+@timed('guardrails.batch')
+def evaluate_guardrails_batch(prompts: Union['pd.Series', Iterable[str]], config: Dict,
+                              scorer: Optional[Scorer] = None, mode: str = 'report') -> 'pd.DataFrame':
+    """Evaluate guardrails for many prompts at once.
+
+    Returns one row per prompt (keeping the index of a Series input) with a
+    score column per enabled detector, a ``passed`` bool column, a
+    ``violations`` column holding each row's list of messages and a
+    ``message`` column. Simulated scores come from ``scorer``, by default
+    the one selected by the config's ``deterministic`` and ``seed`` keys.
+    In ``gate`` mode each row stops at its first violation and the scores
+    it skipped are NaN.
+    """
+    import pandas as pd
+
+    texts = as_string_series(prompts)
+
+    if not config.get('enable_guardrails', False):
+        return pd.DataFrame({
+            'passed': np.ones(len(texts), dtype=bool),
+            'violations': [[] for _ in range(len(texts))],
+            'message': 'Guardrails disabled'
+        }, index=texts.index)
+
+    detectors = enabled_detectors(config.get('guardrails_config', {}))
+    scorer = scorer or make_scorer(config)
+    scores, passed, violations, messages, _ = _run_detectors(
+        detectors, prepare_texts(texts), config, scorer, scorer.prepare(texts), mode
+    )
+
+    # Detectors a gate run never reached still get a column, so the schema is stable
+    results = pd.DataFrame({detector.name: scores.get(detector.name, np.nan) for detector in detectors},
+                           index=texts.index)
+    results['passed'] = passed
+    results['violations'] = violations
+    results['message'] = messages
+    return results
+
+
+def iter_text_chunks(source: Union[str, Iterable[str], Any], chunk_size: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """Yield text chunks from a string, an iterable of strings or a text or binary file-like object"""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, 'read'):
+        decoder = None
+        for chunk in iter(lambda: source.read(chunk_size), source.read(0)):
+            if isinstance(chunk, bytes):
+                decoder = decoder or codecs.getincrementaldecoder('utf-8')(errors='replace')
+                chunk = decoder.decode(chunk)
+            yield chunk
+        if decoder is not None:
+            yield decoder.decode(b'', final=True)
+    else:
+        yield from source
+
+
+def iter_windows(chunks: Iterable[str], overlap: int = STREAM_OVERLAP_CHARS) -> Iterator[Tuple[str, str, int, int, int]]:
+    """Cut a chunk stream into overlapping scan windows.
+
+    Yields ``(window, window_lower, start, stop, offset)``: each window owns
+    ``window[start:stop]`` and carries up to ``overlap`` characters of context
+    on either side; ``offset`` is the window's position in the whole text.
+    Owned ranges tile the text exactly once and the buffer never holds more
+    than one chunk plus twice the overlap.
+    """
+    window = window_lower = ''
+    start = offset = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        window += chunk
+        window_lower += simple_lower(chunk)
+        if len(window) - start > overlap:
+            stop = len(window) - overlap
+            yield window, window_lower, start, stop, offset
+            cut = max(stop - overlap, 0)
+            window, window_lower = window[cut:], window_lower[cut:]
+            start, offset = stop - cut, offset + cut
+    yield window, window_lower, start, len(window), offset
+
+
+@timed('guardrails.stream')
+def evaluate_guardrails_stream(source: Union[str, Iterable[str], Any], config: Dict, scorer: Optional[Scorer] = None,
+                               mode: str = 'report', chunk_size: int = STREAM_CHUNK_CHARS,
+                               overlap: int = STREAM_OVERLAP_CHARS) -> Dict[str, Any]:
+    """Evaluate guardrails over text read in chunks, with memory bounded by ``chunk_size`` and ``overlap``.
+
+    ``source`` is a string, an iterable of text chunks or a text or binary
+    (UTF-8) file-like object. Returns the same dict as
+    ``evaluate_guardrails_realtime``; matches that straddle chunk boundaries
+    are found as long as they are no longer than ``overlap`` characters.
+    """
+    if not config.get('enable_guardrails', False):
+        return {'passed': True, 'message': 'Guardrails disabled'}
+
+    scorer = scorer or make_scorer(config)
+    detectors = enabled_detectors(config.get('guardrails_config', {}))
+    states = [detector.stream_state() for detector in detectors]
+    key = scorer.stream_key()
+
+    for window, window_lower, start, stop, offset in iter_windows(iter_text_chunks(source, chunk_size), overlap):
+        key.update(window[start:stop])
+        for detector, state in zip(detectors, states):
+            detector.feed(state, window, window_lower, start, stop, offset)
+
+    guardrails_config = config.get('guardrails_config', {})
+    row_keys = key.prepared()
+    features = {detector.name: detector.stream_features(state) for detector, state in zip(detectors, states)}
+    scores, passed, violations, messages, violated = _combine_verdicts(
+        detectors,
+        lambda detector, rows: detector.score_features(features[detector.name], guardrails_config, scorer, row_keys),
+        1, mode
+    )
+    return _realtime_result(detectors, scores, passed, violations, messages, violated, mode)
+
+
+def _realtime_result(detectors: List[Detector], scores: Dict[str, np.ndarray], passed: np.ndarray,
+                     violations: List[List[str]], messages: List[str], violated: Dict[str, np.ndarray],
+                     mode: str) -> Dict[str, Any]:
+    """Single-prompt result dict from one-row verdicts"""
+    results = {
+        'passed': bool(passed[0]),
+        'violations': violations[0],
+        'violated': [name for name, flags in violated.items() if flags[0]],
+        'scores': {name: float(values[0]) for name, values in scores.items()},
+        'message': messages[0]
+    }
+    if mode == 'gate':
+        results['skipped'] = [detector.name for detector in detectors if detector.name not in scores]
+    return results
+
+
+@timed('guardrails.realtime')
+def evaluate_guardrails_realtime(prompt_text: str, config: Dict, cache: Optional[ResultCache] = None,
+                                 scorer: Optional[Scorer] = None, mode: str = 'report') -> Dict[str, Any]:
+    """Evaluate guardrails in real-time before model inference, reusing ``cache`` when given.
+
+    ``report`` mode scores every enabled detector. ``gate`` mode runs them
+    cheapest first and stops at the first violation, listing the detectors
+    it did not run under ``skipped``. ``violated`` names the detectors that
+    failed the prompt. Prompts longer than ``STREAM_MIN_CHARS``
+    are scanned in windows by ``evaluate_guardrails_stream`` so no full
+    lowercased copy is made.
+    """
+    if not config.get('enable_guardrails', False):
+        return {'passed': True, 'message': 'Guardrails disabled'}
+
+    if cache is not None:
+        key = guardrails_cache_key(prompt_text, config, mode)
+        cached = cache.get(key)
+        if cached is not None:
+            record_event('guardrails.cache_hit')
+            return cached
+
+    if len(prompt_text) > STREAM_MIN_CHARS:
+        results = evaluate_guardrails_stream(prompt_text, config, scorer, mode)
+    else:
+        # evaluate_guardrails_batch([prompt_text]) would give the same verdicts
+        # through the same _run_detectors core, but would build a one-row
+        # DataFrame and import pandas for every prompt typed in the app
+        scorer = scorer or make_scorer(config)
+        detectors = enabled_detectors(config.get('guardrails_config', {}))
+        results = _realtime_result(detectors, *_run_detectors(
+            detectors, prepare_texts([prompt_text]), config, scorer, scorer.prepare([prompt_text]), mode
+        ), mode)
+
+    if cache is not None:
+        cache.set(key, results)
+    return results
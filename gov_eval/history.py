@@ -0,0 +1,263 @@
+"""Append-only, columnar evaluation history
+
+Every finished run is flattened to one row per (run, evaluator, metric) and
+appended to an SQLite table indexed on model, evaluator and timestamp, so
+months of evaluations can be filtered and aggregated without loading them
+all. ``GOV_EVAL_HISTORY_PATH`` sets the SQLite file; without it the history
+is kept in memory for the life of the process.
+"""
+from typing import TYPE_CHECKING, Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from gov_eval.cache import content_hash
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+GUARDRAILS_EVALUATOR = 'guardrails'
+
+COLUMNS = ['run_id', 'timestamp', 'session_id', 'model', 'prompt_hash', 'evaluator', 'metric', 'value', 'status',
+           'error']
+
+_default_history: Optional['EvaluationHistory'] = None
+_default_history_pid: Optional[int] = None
+_default_history_lock = threading.Lock()
+
+
+def flatten_results(results: Dict[str, Any]) -> List[tuple]:
+    """``(evaluator, metric, value, status, error)`` tuples for one results dict.
+
+    Guardrail scores go under the ``guardrails`` evaluator, with the detector
+    as the metric and ``violated`` or ``passed`` as the status. An evaluator
+    without metrics (failed, timed out, cancelled) gets one row with no
+    metric, so failure rates stay queryable.
+    """
+    rows = []
+    guardrails = results.get('guardrails')
+    if guardrails and guardrails.get('scores'):
+        if 'violated' in guardrails:
+            violated = set(guardrails['violated'])
+            rows.extend((GUARDRAILS_EVALUATOR, detector, float(score), 'violated' if detector in violated else 'passed',
+                         None) for detector, score in guardrails['scores'].items())
+        else:
+            # Results cached before per-detector verdicts were recorded only have the overall verdict
+            status = 'passed' if guardrails['passed'] else 'failed'
+            rows.extend((GUARDRAILS_EVALUATOR, detector, float(score), status, None)
+                        for detector, score in guardrails['scores'].items())
+
+    for evaluator, evaluation in results.get('evaluations', {}).items():
+        status = evaluation.get('status')
+        metrics = [(evaluator, metric, float(value), status, None) for metric, value in evaluation.items()
+                   if metric != 'status' and isinstance(value, (int, float)) and not isinstance(value, bool)]
+        rows.extend(metrics or [(evaluator, None, None, status, evaluation.get('error'))])
+    return rows
+
+
+def results_frame(results: Dict[str, Any]) -> 'pd.DataFrame':
+    """Flatten one results dict to ``evaluator``, ``metric``, ``value``, ``status`` and ``error`` columns"""
+    import pandas as pd
+
+    frame = pd.DataFrame(flatten_results(results), columns=['evaluator', 'metric', 'value', 'status', 'error'])
+    frame['value'] = frame['value'].astype(float)
+    return frame
+
+
+class EvaluationHistory:
+    """Append-only evaluation history in SQLite; safe to share between threads"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ':memory:'
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS evaluation_metrics ("
+            "run_id TEXT NOT NULL, timestamp REAL NOT NULL, session_id TEXT, model TEXT, prompt_hash TEXT, "
+            "evaluator TEXT NOT NULL, metric TEXT, value REAL, status TEXT, error TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS metrics_model ON evaluation_metrics (model, timestamp)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS metrics_evaluator ON evaluation_metrics (evaluator, timestamp)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS metrics_timestamp ON evaluation_metrics (timestamp)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS metrics_session ON evaluation_metrics (session_id, timestamp)")
+        self._db.commit()
+
+    def _rows(self, results: Dict[str, Any], session_id: Optional[str], timestamp: float) -> List[tuple]:
+        run = (uuid.uuid4().hex, timestamp, session_id, results.get('model'), content_hash(results.get('prompt')))
+        return [run + row for row in flatten_results(results)]
+
+    def append(self, results: Dict[str, Any], session_id: Optional[str] = None,
+               timestamp: Optional[float] = None) -> int:
+        """Append one run; returns the number of rows written"""
+        return self.extend([results], session_id, timestamp)
+
+    def extend(self, runs: Iterable[Dict[str, Any]], session_id: Optional[str] = None,
+               timestamp: Optional[float] = None) -> int:
+        """Append many runs in one transaction; returns the number of rows written"""
+        timestamp = time.time() if timestamp is None else timestamp
+        rows = [row for results in runs for row in self._rows(results, session_id, timestamp)]
+        with self._lock:
+            self._db.executemany(f"INSERT INTO evaluation_metrics ({', '.join(COLUMNS)}) VALUES "
+                                 f"({', '.join('?' * len(COLUMNS))})", rows)
+            self._db.commit()
+        return len(rows)
+
+    @staticmethod
+    def _where(model: Optional[str] = None, evaluator: Optional[str] = None, metric: Optional[str] = None,
+               session_id: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+               after_row_id: Optional[int] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column, value in (('model', model), ('evaluator', evaluator), ('metric', metric), ('session_id', session_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if after_row_id is not None:
+            clauses.append("rowid > ?")
+            params.append(after_row_id)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(self, model: Optional[str] = None, evaluator: Optional[str] = None, metric: Optional[str] = None,
+              session_id: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+              after_row_id: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> 'pd.DataFrame':
+        """Rows matching every given filter, oldest first.
+
+        The frame has a ``row_id`` column and a UTC ``timestamp``.
+        ``columns`` limits the history columns read; ``row_id`` is always
+        included.
+        """
+        import pandas as pd
+
+        columns = list(columns or COLUMNS)
+        unknown = [column for column in columns if column not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown history columns: {', '.join(unknown)}")
+        where, params = self._where(model, evaluator, metric, session_id, since, until, after_row_id)
+        with self._lock:
+            frame = pd.read_sql_query(
+                f"SELECT rowid AS row_id, {', '.join(columns)} FROM evaluation_metrics {where} ORDER BY rowid",
+                self._db, params=params
+            )
+        if 'value' in frame:
+            frame['value'] = frame['value'].astype(float)
+        if 'timestamp' in frame:
+            frame['timestamp'] = pd.to_datetime(frame['timestamp'], unit='s', utc=True)
+        return frame
+
+    def iter_rows(self, model: Optional[str] = None, evaluator: Optional[str] = None, metric: Optional[str] = None,
+                  session_id: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+                  chunk_size: int = 10000) -> Iterator[List[tuple]]:
+        """Rows matching every given filter, oldest first, in chunks.
+
+        Each chunk is a list of up to ``chunk_size`` ``COLUMNS`` tuples and is
+        its own query keyed on the last row id read, so the lock is never
+        held between chunks and memory stays bounded by one chunk however
+        large the history is.
+        """
+        last_row_id = 0
+        while True:
+            where, params = self._where(model, evaluator, metric, session_id, since, until, last_row_id)
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT rowid, {', '.join(COLUMNS)} FROM evaluation_metrics {where} ORDER BY rowid LIMIT ?",
+                    params + [chunk_size]
+                ).fetchall()
+            if not rows:
+                return
+            last_row_id = rows[-1][0]
+            yield [row[1:] for row in rows]
+
+    def bucket_stats(self, bucket_seconds: float, model: Optional[str] = None, evaluator: Optional[str] = None,
+                     metric: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None) -> 'pd.DataFrame':
+        """Per (model, evaluator, metric, time bucket) aggregates, computed in SQLite.
+
+        Columns are ``count`` (rows with a value), ``mean``, ``min``, ``max``,
+        ``rows`` and ``failures`` (rows whose status is not ``completed``,
+        ``passed`` or ``baseline``, such as violated guardrails or failed
+        evaluators), plus the bucket start as a UTC ``bucket``. Only the
+        aggregates leave the database, however many rows they cover.
+        """
+        import pandas as pd
+
+        where, params = self._where(model, evaluator, metric, since=since, until=until)
+        with self._lock:
+            frame = pd.read_sql_query(
+                "SELECT model, evaluator, metric, CAST(timestamp / ? AS INTEGER) * ? AS bucket, "
+                "COUNT(value) AS count, AVG(value) AS mean, MIN(value) AS min, MAX(value) AS max, COUNT(*) AS rows, "
+                "SUM(CASE WHEN status IN ('completed', 'passed', 'baseline') THEN 0 ELSE 1 END) AS failures "
+                f"FROM evaluation_metrics {where} GROUP BY model, evaluator, metric, bucket ORDER BY bucket",
+                self._db, params=[bucket_seconds, bucket_seconds] + params
+            )
+        frame['bucket'] = pd.to_datetime(frame['bucket'], unit='s', utc=True)
+        return frame
+
+    def distinct(self, column: str) -> List[Any]:
+        """Sorted distinct non-null values of ``model``, ``evaluator``, ``metric`` or ``session_id``"""
+        if column not in ('model', 'evaluator', 'metric', 'session_id'):
+            raise ValueError(f"Unknown history column: {column}")
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT DISTINCT {column} FROM evaluation_metrics WHERE {column} IS NOT NULL ORDER BY {column}"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def time_bounds(self) -> Tuple[Optional[float], Optional[float]]:
+        """Epoch seconds of the oldest and newest rows, or ``(None, None)`` when empty"""
+        with self._lock:
+            return tuple(self._db.execute("SELECT MIN(timestamp), MAX(timestamp) FROM evaluation_metrics").fetchone())
+
+    def last_row_id(self) -> int:
+        """Highest row id so far; changes whenever rows are appended, so it can version cached aggregates"""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(rowid), 0) FROM evaluation_metrics").fetchone()[0]
+
+    def count(self, model: Optional[str] = None, evaluator: Optional[str] = None, metric: Optional[str] = None,
+              session_id: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None) -> int:
+        """Number of stored rows matching every given filter"""
+        where, params = self._where(model, evaluator, metric, session_id, since, until)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM evaluation_metrics {where}", params).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class HistoryView:
+    """Cached DataFrame of the history rows matching fixed filters, refreshed incrementally"""
+
+    def __init__(self, history: EvaluationHistory, **filters: Any):
+        self.history = history
+        self.filters = filters
+        self.frame = history.query(**filters)
+        self._last_row_id = int(self.frame['row_id'].max()) if len(self.frame) else 0
+
+    def refresh(self) -> 'pd.DataFrame':
+        """Read rows added since the last refresh and return the full frame"""
+        import pandas as pd
+
+        new_rows = self.history.query(after_row_id=self._last_row_id, **self.filters)
+        if len(new_rows):
+            self.frame = pd.concat([self.frame, new_rows], ignore_index=True) if len(self.frame) else new_rows
+            self._last_row_id = int(new_rows['row_id'].max())
+        return self.frame
+
+
+def get_history() -> EvaluationHistory:
+    """Return the process-wide evaluation history, opened from ``GOV_EVAL_HISTORY_PATH`` on first use"""
+    global _default_history, _default_history_pid
+    with _default_history_lock:
+        if _default_history is None or _default_history_pid != os.getpid():
+            _default_history_pid = os.getpid()
+            _default_history = EvaluationHistory(os.getenv("GOV_EVAL_HISTORY_PATH") or None)
+        return _default_history
@@ -0,0 +1,295 @@
+"""Hot-path timing instrumentation
+
+Stages are named with dotted prefixes (``guardrails.<detector>``,
+``evaluator.<name>``, ``render.*``) and keep a latency histogram plus call and
+error counts; ``record_event`` counts anything else, such as cache hits.
+Instrumentation is off unless ``GOV_EVAL_INSTRUMENTATION`` or
+``GOV_EVAL_METRICS_PATH`` is set, and the hooks cost one attribute check while
+it is off.
+"""
+from contextlib import nullcontext
+from typing import Dict, List, Any, Callable, Optional
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+# Upper bounds, in seconds, of the latency histogram buckets; a final bucket catches the rest
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+
+# write_metrics_file rewrites the file at most this often unless forced
+METRICS_WRITE_INTERVAL_SECONDS = 5.0
+
+_NOOP = nullcontext()
+
+
+class StageStats:
+    """Latency histogram, call count and error count of one stage"""
+
+    __slots__ = ('buckets', 'count', 'errors', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float, failed: bool = False):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Latency at quantile ``q``, interpolated within its histogram bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket in enumerate(self.buckets):
+            if bucket and seen + bucket >= rank:
+                low = LATENCY_BUCKETS[i - 1] if i else 0.0
+                high = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+                return min(low + (high - low) * (rank - seen) / bucket, self.max)
+            seen += bucket
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'errors': self.errors, 'sum': self.total, 'max': self.max,
+                'buckets': list(self.buckets)}
+
+    def merge(self, stats: Dict[str, Any]):
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, stats['buckets'])]
+        self.count += stats['count']
+        self.errors += stats['errors']
+        self.total += stats['sum']
+        self.max = max(self.max, stats['max'])
+
+
+class _StageTimer:
+    """Context manager that records the time spent in its block, and whether it raised"""
+
+    __slots__ = ('instrumentation', 'stage', 'started')
+
+    def __init__(self, instrumentation: 'Instrumentation', stage: str):
+        self.instrumentation = instrumentation
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.instrumentation.observe(self.stage, time.perf_counter() - self.started, exc_type is not None)
+        return False
+
+
+class Instrumentation:
+    """Per-stage latency statistics and event counters; thread-safe"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._stages: Dict[str, StageStats] = {}
+        self._events: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.written_at: Optional[float] = None
+
+    def timer(self, stage: str):
+        """Context manager timing its block as ``stage``; a no-op while disabled"""
+        return _StageTimer(self, stage) if self.enabled else _NOOP
+
+    def observe(self, stage: str, seconds: float, failed: bool = False):
+        """Record one call of ``stage`` that took ``seconds``"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.observe(seconds, failed)
+
+    def event(self, name: str, count: int = 1):
+        """Add ``count`` to the ``name`` event counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events[name] = self._events.get(name, 0) + count
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._events = {}
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable copy of every stage's statistics and every event counter"""
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'bucket_bounds': list(LATENCY_BUCKETS),
+                'stages': {stage: stats.to_dict() for stage, stats in self._stages.items()},
+                'events': dict(self._events),
+            }
+
+    def drain(self) -> Dict[str, Any]:
+        """Snapshot and reset in one step, for shipping a worker's statistics to its parent"""
+        with self._lock:
+            snapshot = {
+                'started_at': self.started_at,
+                'bucket_bounds': list(LATENCY_BUCKETS),
+                'stages': {stage: stats.to_dict() for stage, stats in self._stages.items()},
+                'events': self._events,
+            }
+            self._stages = {}
+            self._events = {}
+            return snapshot
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add another instance's ``snapshot`` or ``drain`` into this one"""
+        with self._lock:
+            for stage, stats in snapshot['stages'].items():
+                mine = self._stages.get(stage)
+                if mine is None:
+                    mine = self._stages[stage] = StageStats()
+                mine.merge(stats)
+            for name, count in snapshot['events'].items():
+                self._events[name] = self._events.get(name, 0) + count
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per stage with call and error counts and mean, p50, p95 and max latency in milliseconds"""
+        with self._lock:
+            stages = sorted(self._stages.items())
+            return [{
+                'stage': stage,
+                'calls': stats.count,
+                'errors': stats.errors,
+                'total_s': round(stats.total, 3),
+                'mean_ms': round(stats.total / stats.count * 1000, 3) if stats.count else 0.0,
+                'p50_ms': round(stats.quantile(0.5) * 1000, 3),
+                'p95_ms': round(stats.quantile(0.95) * 1000, 3),
+                'max_ms': round(stats.max * 1000, 3),
+            } for stage, stats in stages]
+
+    def events(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._events)
+
+    def to_prometheus(self) -> str:
+        """Statistics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP gov_eval_stage_seconds Latency of instrumented stages.",
+            "# TYPE gov_eval_stage_seconds histogram",
+        ]
+        for stage, stats in sorted(snapshot['stages'].items()):
+            label = _label_value(stage)
+            cumulative = 0
+            for bound, bucket in zip(list(LATENCY_BUCKETS) + ['+Inf'], stats['buckets']):
+                cumulative += bucket
+                lines.append(f'gov_eval_stage_seconds_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'gov_eval_stage_seconds_sum{{stage="{label}"}} {stats["sum"]!r}')
+            lines.append(f'gov_eval_stage_seconds_count{{stage="{label}"}} {stats["count"]}')
+        lines += [
+            "# HELP gov_eval_stage_errors_total Instrumented stage calls that raised or failed.",
+            "# TYPE gov_eval_stage_errors_total counter",
+        ]
+        lines += [f'gov_eval_stage_errors_total{{stage="{_label_value(stage)}"}} {stats["errors"]}'
+                  for stage, stats in sorted(snapshot['stages'].items())]
+        lines += [
+            "# HELP gov_eval_events_total Counted events such as cache hits.",
+            "# TYPE gov_eval_events_total counter",
+        ]
+        lines += [f'gov_eval_events_total{{event="{_label_value(name)}"}} {count}'
+                  for name, count in sorted(snapshot['events'].items())]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write the statistics to ``path``, as JSON for a ``.json`` file and Prometheus text otherwise"""
+        if path.endswith('.json'):
+            content = json.dumps(self.snapshot(), indent=2)
+        else:
+            content = self.to_prometheus()
+        # Written to a temporary name and renamed, so scrapers never read a partial file
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        os.replace(temporary, path)
+        self.written_at = time.monotonic()
+
+
+def _label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _enabled_from_env() -> bool:
+    flag = os.getenv("GOV_EVAL_INSTRUMENTATION", "").strip().lower()
+    return flag in ('1', 'true', 'yes', 'on') or bool(os.getenv("GOV_EVAL_METRICS_PATH"))
+
+
+_instrumentation = Instrumentation(enabled=_enabled_from_env())
+
+
+def _reset_after_fork():
+    # A forked worker reports only its own calls; the parent's are already counted
+    global _instrumentation
+    _instrumentation = Instrumentation(enabled=_instrumentation.enabled)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_instrumentation() -> Instrumentation:
+    """Return the process-wide instrumentation"""
+    return _instrumentation
+
+
+def set_enabled(enabled: bool):
+    """Switch process-wide instrumentation on or off; statistics collected so far are kept"""
+    _instrumentation.enabled = enabled
+
+
+def time_stage(stage: str):
+    """Context manager timing its block as ``stage`` on the process-wide instrumentation"""
+    return _instrumentation.timer(stage)
+
+
+def record_event(name: str, count: int = 1):
+    """Count an event on the process-wide instrumentation"""
+    if _instrumentation.enabled:
+        _instrumentation.event(name, count)
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of the function as ``stage``"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _instrumentation.enabled:
+                return func(*args, **kwargs)
+            with _StageTimer(_instrumentation, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def write_metrics_file(path: Optional[str] = None, force: bool = False) -> Optional[str]:
+    """Write the process-wide statistics to ``path`` (default ``GOV_EVAL_METRICS_PATH``).
+
+    Unless ``force`` is set, the file is rewritten at most once every
+    ``METRICS_WRITE_INTERVAL_SECONDS``. Returns the path written, if any.
+    """
+    path = path or os.getenv("GOV_EVAL_METRICS_PATH")
+    if not path or not _instrumentation.enabled:
+        return None
+    written_at = _instrumentation.written_at
+    if not force and written_at is not None and time.monotonic() - written_at < METRICS_WRITE_INTERVAL_SECONDS:
+        return None
+    _instrumentation.write(path)
+    return path
@@ -0,0 +1,231 @@
+"""Background evaluation jobs
+
+``JobManager.submit_evaluation`` starts ``simulate_evaluation`` on a shared
+job thread pool and returns a job id straight away, so a Streamlit script run
+never blocks on evaluators. The UI keeps only the id in ``st.session_state``
+and polls ``Job.snapshot()``, which holds each evaluator's result as soon as
+it finishes. Jobs can be cancelled, and finished jobs are forgotten after
+``JOB_RETENTION_SECONDS``.
+
+``JobManager.submit_matrix`` does the same for an evaluation matrix (see
+``gov_eval.matrix``). A ``MatrixJob`` keeps its results as flattened rows
+that only ever grow, so each poll copies a list instead of every cell.
+
+Job runners have their own pool, separate from the evaluator pool they
+submit to, so a burst of jobs can never occupy every evaluator thread with
+runners waiting on evaluators.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence
+import copy
+import threading
+import time
+import uuid
+
+from gov_eval.cache import ResultCache
+from gov_eval.coalescer import RequestCoalescer
+from gov_eval.evaluators import simulate_evaluation
+from gov_eval.matrix import BLOCKED, MATRIX_MAX_WORKERS, evaluation_rows, run_matrix
+from gov_eval.scoring import Scorer
+
+JOB_MAX_WORKERS = 8
+JOB_RETENTION_SECONDS = 60 * 60
+
+# How often the UI reruns to pick up new results while a job is running
+JOB_POLL_SECONDS = 0.5
+
+# Job statuses; every status but ``running`` is final
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_CANCELLED = 'cancelled'
+JOB_FAILED = 'failed'
+
+_default_manager: Optional['JobManager'] = None
+_default_manager_lock = threading.Lock()
+
+
+class Job:
+    """One background evaluation and its results so far"""
+
+    def __init__(self, results: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.status = JOB_RUNNING
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+        self._results = results
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status != JOB_RUNNING
+
+    def record(self, evaluator: str, evaluation: Dict[str, Any]):
+        """Store one evaluator's result as it arrives"""
+        with self._lock:
+            self._results['evaluations'][evaluator] = evaluation
+
+    def finish(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the results so far, safe to render while the job runs"""
+        with self._lock:
+            return copy.deepcopy(self._results)
+
+    def progress(self) -> float:
+        """Share of evaluators that have a final result"""
+        with self._lock:
+            evaluations = self._results['evaluations']
+            finished = sum(1 for evaluation in evaluations.values() if evaluation.get('status') != 'pending')
+            return finished / len(evaluations) if evaluations else 1.0
+
+
+class MatrixJob(Job):
+    """One background evaluation matrix and its results so far, as ``MATRIX_COLUMNS`` rows"""
+
+    def __init__(self, prompts: Sequence[str], models: Sequence[str], evaluators: Sequence[str]):
+        super().__init__({'prompts': list(prompts), 'models': list(models), 'evaluators': list(evaluators),
+                          'guardrails': {}})
+        self._rows: List[tuple] = []
+        self._cells: List[Dict[str, Any]] = []
+        self._finished = 0
+        self._total = len(prompts) * len(models) * len(evaluators)
+
+    def record_guardrails(self, index: int, result: Dict[str, Any]):
+        with self._lock:
+            self._results['guardrails'][index] = result
+
+    def record_result(self, index: int, model: str, evaluator: str, evaluation: Dict[str, Any]):
+        """Store one evaluator's result for one cell as it arrives"""
+        rows = evaluation_rows(index, model, evaluator, evaluation)
+        with self._lock:
+            self._rows.extend(rows)
+            self._finished += 1
+
+    def record_cell(self, index: int, model: str, results: Dict[str, Any]):
+        """Keep a finished cell's results dict, for the history"""
+        with self._lock:
+            self._cells.append(results)
+            if results['status'] == BLOCKED:
+                self._finished += len(self._results['evaluators'])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Prompts, models, evaluators, guardrails by prompt index and the result rows so far"""
+        with self._lock:
+            return {**self._results, 'guardrails': dict(self._results['guardrails']), 'rows': list(self._rows)}
+
+    def cells(self) -> List[Dict[str, Any]]:
+        """Results dicts of the cells finished so far, in completion order"""
+        with self._lock:
+            return list(self._cells)
+
+    def progress(self) -> float:
+        """Share of (prompt, model, evaluator) results that are final, counting blocked cells"""
+        with self._lock:
+            return min(self._finished / self._total, 1.0) if self._total else 1.0
+
+
+class JobManager:
+    """Runs evaluations in the background and tracks them by id"""
+
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS, retention_seconds: float = JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='evaluation-job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit_evaluation(self, config: Dict, prompt_config: Dict, evaluators: List[str],
+                          cache: Optional[ResultCache] = None, scorer: Optional[Scorer] = None,
+                          extra: Optional[Dict[str, Any]] = None,
+                          coalescer: Optional[RequestCoalescer] = None) -> str:
+        """Start an evaluation and return its job id.
+
+        ``extra`` entries (such as the guardrails result) are added to the
+        job's results as they are, and its guardrails result is used for
+        drift detection. ``coalescer`` is passed on to ``simulate_evaluation``.
+        """
+        job = Job({
+            'prompt': prompt_config['prompt_text'],
+            'model': prompt_config['model_name'],
+            'evaluations': {evaluator: {'status': 'pending'} for evaluator in evaluators},
+            **(extra or {})
+        })
+
+        def run():
+            try:
+                simulate_evaluation(config, prompt_config, evaluators, on_result=job.record, cache=cache,
+                                    scorer=scorer, cancel=job.cancel_event, coalescer=coalescer,
+                                    guardrails=(extra or {}).get('guardrails'))
+                job.finish(JOB_CANCELLED if job.cancel_event.is_set() else JOB_COMPLETED)
+            except Exception as e:
+                job.finish(JOB_FAILED, str(e))
+
+        self.prune()
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(run)
+        return job.id
+
+    def submit_matrix(self, config: Dict, prompt_config: Dict, prompts: Sequence[str], models: Sequence[str],
+                      evaluators: List[str], cache: Optional[ResultCache] = None, scorer: Optional[Scorer] = None,
+                      coalescer: Optional[RequestCoalescer] = None, max_workers: int = MATRIX_MAX_WORKERS) -> str:
+        """Start an evaluation matrix of every prompt on every model and return its job id"""
+        job = MatrixJob(prompts, models, evaluators)
+
+        def run():
+            try:
+                run_matrix(config, prompt_config, prompts, models, evaluators, max_workers=max_workers, cache=cache,
+                           scorer=scorer, cancel=job.cancel_event, coalescer=coalescer,
+                           on_guardrails=job.record_guardrails, on_result=job.record_result, on_cell=job.record_cell)
+                job.finish(JOB_CANCELLED if job.cancel_event.is_set() else JOB_COMPLETED)
+            except Exception as e:
+                job.finish(JOB_FAILED, str(e))
+
+        self.prune()
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(run)
+        return job.id
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        """The job with ``job_id``, or None if it is unknown or was pruned"""
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def cancel(self, job_id: Optional[str]) -> bool:
+        """Ask a running job to stop; returns whether there was one to cancel"""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel_event.set()
+        # A job still queued behind other runners never starts
+        if job.future is not None and job.future.cancel():
+            job.finish(JOB_CANCELLED)
+        return True
+
+    def active_jobs(self) -> int:
+        """Number of jobs still running"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.done)
+
+    def prune(self):
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < cutoff]:
+                del self._jobs[job_id]
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager shared by every session"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = JobManager()
+        return _default_manager
@@ -0,0 +1,177 @@
+"""Evaluation matrix: many prompts on many models in one run
+
+``run_matrix`` runs ``simulate_evaluation`` for every (prompt, model) cell
+on a bounded pool of threads, and ``matrix_frame`` and ``matrix_pivot`` turn
+its results into tables that can be shown while the grid fills in.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Any, Callable, Optional, Sequence, Tuple
+import json
+import threading
+
+from gov_eval.cache import ResultCache
+from gov_eval.coalescer import RequestCoalescer
+from gov_eval.datasets import DatasetSource, dataset_columns, read_dataset
+from gov_eval.evaluators import simulate_evaluation
+from gov_eval.guardrails import evaluate_guardrails_realtime
+from gov_eval.history import flatten_results
+from gov_eval.instrumentation import time_stage
+from gov_eval.scoring import Scorer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Cells evaluated at once
+MATRIX_MAX_WORKERS = 8
+
+MATRIX_COLUMNS = ['prompt_index', 'model', 'evaluator', 'metric', 'value', 'status', 'error']
+
+# Status of the cells of a prompt that failed guardrails
+BLOCKED = 'blocked'
+
+
+def load_prompts(source: DatasetSource, name: Optional[str] = None, column: Optional[str] = None) -> List[str]:
+    """Distinct non-blank prompts, in first-seen order, from a text, JSONL, CSV or Parquet file.
+
+    A text file holds one prompt per line; JSONL records use ``prompt`` or
+    ``prompt_text`` like the batch CLI's input. CSV and Parquet files use
+    ``column``, by default ``prompt`` if there is one and the first column
+    otherwise.
+    """
+    name = str(name or getattr(source, 'name', source)).lower()
+    if name.endswith(('.txt', '.jsonl')):
+        if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+            with open(source, 'rb') as handle:
+                content = handle.read()
+        else:
+            content = source.read()
+        lines = (content.decode('utf-8') if isinstance(content, bytes) else content).splitlines()
+        if name.endswith('.jsonl'):
+            records = (json.loads(line) for line in lines if line.strip())
+            prompts = [record.get('prompt', record.get('prompt_text', '')) for record in records]
+        else:
+            prompts = lines
+    else:
+        if column is None:
+            columns = dataset_columns(source, name)
+            column = 'prompt' if 'prompt' in columns else columns[0]
+            if hasattr(source, 'seek'):
+                source.seek(0)
+        prompts = read_dataset(source, [column], name, keep_default_na=False)[column].astype(str).tolist()
+    return list(dict.fromkeys(prompt for prompt in prompts if prompt and prompt.strip()))
+
+
+def screen_prompts(prompts: Sequence[str], config: Dict, cache: Optional[ResultCache] = None,
+                   scorer: Optional[Scorer] = None) -> List[Optional[Dict[str, Any]]]:
+    """Guardrails result of every prompt, or None for all when guardrails are off; each distinct prompt is screened once"""
+    if not config.get('enable_guardrails', False):
+        return [None] * len(prompts)
+    mode = config.get('guardrails_mode', 'report')
+    screened: Dict[str, Dict[str, Any]] = {}
+    for prompt in prompts:
+        if prompt not in screened:
+            screened[prompt] = evaluate_guardrails_realtime(prompt, config, cache=cache, scorer=scorer, mode=mode)
+    return [screened[prompt] for prompt in prompts]
+
+
+def run_matrix(config: Dict, prompt_config: Dict, prompts: Sequence[str], models: Sequence[str],
+               evaluators: List[str], max_workers: int = MATRIX_MAX_WORKERS,
+               cache: Optional[ResultCache] = None, scorer: Optional[Scorer] = None,
+               cancel: Optional[threading.Event] = None, coalescer: Optional[RequestCoalescer] = None,
+               on_guardrails: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+               on_result: Optional[Callable[[int, str, str, Dict[str, Any]], None]] = None,
+               on_cell: Optional[Callable[[int, str, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """Evaluate every prompt with every model and return one results dict per cell, prompt by prompt.
+
+    ``prompt_config`` supplies the settings shared by every cell (system
+    prompt, model type, temperature, max tokens); each cell overrides its
+    prompt text and model name. ``on_guardrails`` is called with each
+    prompt's index and guardrails result, ``on_result`` with the prompt
+    index, model, evaluator and result as each evaluator finishes, and
+    ``on_cell`` with the prompt index, model and results dict of each
+    finished cell. Once ``cancel`` is set, cells that have not started are
+    skipped and running ones stop as in ``simulate_evaluation``.
+    Guardrails run once per distinct prompt before any cell starts; the
+    cells of a prompt that fails them have status ``blocked`` and no
+    evaluations.
+    """
+    with time_stage('matrix.guardrails'):
+        guardrails = screen_prompts(prompts, config, cache, scorer)
+    if on_guardrails is not None:
+        for index, result in enumerate(guardrails):
+            if result is not None:
+                on_guardrails(index, result)
+
+    def cell_results(index: int, model: str, status: str, evaluations: Dict[str, Any]) -> Dict[str, Any]:
+        results = {'prompt': prompts[index], 'model': model, 'status': status, 'evaluations': evaluations}
+        if guardrails[index] is not None:
+            results['guardrails'] = guardrails[index]
+        return results
+
+    def run_cell(index: int, model: str) -> Dict[str, Any]:
+        if cancel is not None and cancel.is_set():
+            results = cell_results(index, model, 'cancelled',
+                                   {evaluator: {'status': 'cancelled'} for evaluator in evaluators})
+        else:
+            cell_config = {**prompt_config, 'prompt_text': prompts[index], 'model_name': model}
+            evaluations = simulate_evaluation(
+                config, cell_config, evaluators, cache=cache, scorer=scorer, cancel=cancel, coalescer=coalescer,
+                guardrails=guardrails[index],
+                on_result=None if on_result is None else (
+                    lambda evaluator, evaluation: on_result(index, model, evaluator, evaluation))
+            )['evaluations']
+            cancelled = cancel is not None and cancel.is_set()
+            results = cell_results(index, model, 'cancelled' if cancelled else 'evaluated', evaluations)
+        if on_cell is not None:
+            on_cell(index, model, results)
+        return results
+
+    cells: Dict[Tuple[int, str], Any] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='matrix') as pool:
+        for index in range(len(prompts)):
+            for model in models:
+                if guardrails[index] is not None and not guardrails[index]['passed']:
+                    cells[(index, model)] = cell_results(index, model, BLOCKED, {})
+                    if on_cell is not None:
+                        on_cell(index, model, cells[(index, model)])
+                else:
+                    cells[(index, model)] = pool.submit(run_cell, index, model)
+    return [cell if isinstance(cell, dict) else cell.result() for cell in cells.values()]
+
+
+def evaluation_rows(index: int, model: str, evaluator: str, evaluation: Dict[str, Any]) -> List[tuple]:
+    """``MATRIX_COLUMNS`` rows for one evaluator's result in one cell"""
+    return [(index, model) + row for row in flatten_results({'evaluations': {evaluator: evaluation}})]
+
+
+def matrix_frame(rows: Sequence[tuple], prompts: Sequence[str]) -> 'pd.DataFrame':
+    """Long table of matrix results with a ``prompt`` column, from ``MATRIX_COLUMNS`` rows"""
+    import pandas as pd
+
+    frame = pd.DataFrame(list(rows), columns=MATRIX_COLUMNS)
+    frame['value'] = frame['value'].astype(float)
+    frame.insert(1, 'prompt', pd.Series(list(prompts), dtype=object).reindex(frame['prompt_index']).to_numpy())
+    return frame
+
+
+def matrix_pivot(frame: 'pd.DataFrame', prompts: Sequence[str], models: Sequence[str],
+                 blocked: Sequence[int] = ()) -> 'pd.DataFrame':
+    """Metric values by (prompt, model) row and (evaluator, metric) column.
+
+    Every cell of prompts not in ``blocked`` gets a row, so cells still
+    running show up empty until their results arrive.
+    """
+    import pandas as pd
+
+    blocked = set(blocked)
+    grid = pd.MultiIndex.from_tuples([(index, model) for index in range(len(prompts)) if index not in blocked
+                                      for model in models], names=['prompt_index', 'model'])
+    metrics = frame[frame['metric'].notna()]
+    if metrics.empty:
+        pivot = pd.DataFrame(index=grid)
+    else:
+        pivot = metrics.pivot_table(index=['prompt_index', 'model'], columns=['evaluator', 'metric'], values='value',
+                                    aggfunc='first', sort=False).reindex(grid)
+    pivot.index = pd.MultiIndex.from_arrays([[prompts[index] for index in grid.get_level_values(0)],
+                                             grid.get_level_values(1)], names=['prompt', 'model'])
+    return pivot
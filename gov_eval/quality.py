@@ -0,0 +1,205 @@
+"""Reference-based quality metrics for the Quality Evaluation evaluator
+
+Quality is measured on a dataset of model outputs paired with reference
+answers, optionally tagged with a slice (such as a task type or language).
+The whole dataset is scored at once, overall and per slice.
+"""
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+import re
+
+import numpy as np
+
+from gov_eval.datasets import DatasetSource, read_dataset
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+QUALITY_EVALUATOR = "Quality Evaluation"
+QUALITY_AVERAGES = ('macro', 'micro')
+
+TOKEN_PATTERN = r'\w+'
+# Joins a column into one string for tokenizing; never part of a token
+ROW_SEPARATOR = '\x1e'
+_TOKEN_OR_SEPARATOR = re.compile(f"{TOKEN_PATTERN}|{ROW_SEPARATOR}")
+
+
+def load_quality_dataset(source: DatasetSource, reference_column: str = 'reference', output_column: str = 'output',
+                         slice_column: Optional[str] = None, name: Optional[str] = None) -> 'pd.DataFrame':
+    """Read the reference, output and optional slice columns of a CSV or Parquet dataset.
+
+    Empty CSV cells are read as empty text rather than missing values, since
+    an empty output is still an answer.
+    """
+    columns = [reference_column, output_column] + ([slice_column] if slice_column else [])
+    return read_dataset(source, columns, name, keep_default_na=False, dtype=str)
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray, empty: float = 0.0) -> np.ndarray:
+    """Elementwise ratio that is ``empty`` where the denominator is zero"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), empty)
+
+
+def _f1(precision: np.ndarray, recall: np.ndarray) -> np.ndarray:
+    return _divide(2 * precision * recall, precision + recall)
+
+
+def flat_tokens(texts: 'pd.Series') -> Tuple[np.ndarray, np.ndarray]:
+    """Row positions and lowercased word tokens of ``texts``, flattened in row order"""
+    corpus = ROW_SEPARATOR.join(texts.tolist())
+    if corpus.count(ROW_SEPARATOR) != len(texts) - 1:
+        corpus = ROW_SEPARATOR.join(texts.str.replace(ROW_SEPARATOR, ' ', regex=False).tolist())
+    # One regex pass over the whole column; separators mark where each row's tokens end
+    pieces = np.array(_TOKEN_OR_SEPARATOR.findall(corpus.lower()), dtype=object)
+    separators = pieces == ROW_SEPARATOR
+    return np.cumsum(separators)[~separators], pieces[~separators]
+
+
+def token_overlap(references: 'pd.Series', outputs: 'pd.Series') -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-row overlapping token count, reference and output token counts, and exact token sequence match"""
+    import pandas as pd
+
+    n = len(references)
+    reference_rows, reference_tokens = flat_tokens(references)
+    output_rows, output_tokens = flat_tokens(outputs)
+
+    codes, vocabulary = pd.factorize(np.concatenate([reference_tokens, output_tokens]))
+    codes = codes.astype(np.int64)
+    reference_codes, output_codes = codes[:len(reference_tokens)], codes[len(reference_tokens):]
+    vocabulary_size = max(len(vocabulary), 1)
+    # One key per (row, token); counting keys gives each token's multiplicity within its row
+    reference_keys, reference_counts = np.unique(reference_rows * vocabulary_size + reference_codes,
+                                                 return_counts=True)
+    output_keys, output_counts = np.unique(output_rows * vocabulary_size + output_codes, return_counts=True)
+    common, in_reference, in_output = np.intersect1d(reference_keys, output_keys, assume_unique=True,
+                                                     return_indices=True)
+    overlap = np.bincount(common // vocabulary_size,
+                          weights=np.minimum(reference_counts[in_reference], output_counts[in_output]), minlength=n)
+    reference_length = np.bincount(reference_rows, minlength=n)
+    output_length = np.bincount(output_rows, minlength=n)
+
+    # Rows of equal length line up token for token in both flat arrays, so
+    # the sequences match where none of their aligned tokens differ
+    same_length = reference_length == output_length
+    aligned = same_length[reference_rows]
+    mismatched = np.bincount(reference_rows[aligned],
+                             weights=reference_codes[aligned] != output_codes[same_length[output_rows]], minlength=n)
+    exact = (same_length & (mismatched == 0)).astype(float)
+    return overlap, reference_length.astype(float), output_length.astype(float), exact
+
+
+def _classification(reference_codes: np.ndarray, output_codes: np.ndarray, slice_codes: np.ndarray,
+                    classes: int, slices: int, average: str) -> Dict[str, np.ndarray]:
+    """Accuracy, precision, recall and F1 per slice from per-class counts.
+
+    Counts are kept only for the (slice, class) pairs that occur, so memory
+    follows the number of rows rather than ``slices * classes``, which is
+    large when outputs are free text and every distinct answer is a class.
+    """
+    n = len(slice_codes)
+    correct = reference_codes == output_codes
+    rows = np.bincount(slice_codes, minlength=slices)
+    accuracy = _divide(np.bincount(slice_codes[correct], minlength=slices), rows)
+
+    if average == 'micro':
+        # With one label per row, pooled precision and recall both equal accuracy
+        return {'accuracy': accuracy, 'precision': accuracy, 'recall': accuracy, 'f1_score': accuracy}
+
+    # Every (slice, class) pair a reference or output falls in is a present class of that slice
+    pairs, pair_index = np.unique(np.concatenate([slice_codes * classes + reference_codes,
+                                                  slice_codes * classes + output_codes]), return_inverse=True)
+    reference_pairs, output_pairs = pair_index[:n], pair_index[n:]
+    true_positives = np.bincount(reference_pairs[correct], minlength=len(pairs))
+    precision = _divide(true_positives, np.bincount(output_pairs, minlength=len(pairs)))
+    recall = _divide(true_positives, np.bincount(reference_pairs, minlength=len(pairs)))
+    f1 = _f1(precision, recall)
+
+    pair_slices = pairs // classes
+    present_classes = np.bincount(pair_slices, minlength=slices)
+
+    def macro(values: np.ndarray) -> np.ndarray:
+        return _divide(np.bincount(pair_slices, weights=values, minlength=slices), present_classes)
+
+    return {'accuracy': accuracy, 'precision': macro(precision), 'recall': macro(recall), 'f1_score': macro(f1)}
+
+
+def _token_metrics(overlap: np.ndarray, reference_length: np.ndarray, output_length: np.ndarray,
+                   exact: np.ndarray, slice_codes: np.ndarray, slices: int, average: str) -> Dict[str, np.ndarray]:
+    """Token precision, recall, F1 and exact match per slice"""
+    def per_slice(values: np.ndarray) -> np.ndarray:
+        return np.bincount(slice_codes, weights=values, minlength=slices)
+
+    rows = per_slice(np.ones(len(overlap)))
+    if average == 'micro':
+        precision = _divide(per_slice(overlap), per_slice(output_length))
+        recall = _divide(per_slice(overlap), per_slice(reference_length))
+        f1 = _f1(precision, recall)
+    else:
+        # Two empty texts agree perfectly
+        both_empty = (reference_length == 0) & (output_length == 0)
+        row_precision = np.where(both_empty, 1.0, _divide(overlap, output_length))
+        row_recall = np.where(both_empty, 1.0, _divide(overlap, reference_length))
+        row_f1 = np.where(both_empty, 1.0, _f1(row_precision, row_recall))
+        precision = _divide(per_slice(row_precision), rows)
+        recall = _divide(per_slice(row_recall), rows)
+        f1 = _divide(per_slice(row_f1), rows)
+    return {
+        'exact_match': _divide(per_slice(exact), rows),
+        'token_precision': precision,
+        'token_recall': recall,
+        'token_f1': f1,
+    }
+
+
+def quality_metrics(frame: 'pd.DataFrame', reference_column: str = 'reference', output_column: str = 'output',
+                    slice_column: Optional[str] = None, average: str = 'macro') -> Dict[str, Any]:
+    """Quality Evaluation result for a dataset of outputs and references, overall and per slice.
+
+    Classification metrics treat each distinct reference or output as a
+    class: ``accuracy`` is the share of exact matches, and ``precision``,
+    ``recall`` and ``f1_score`` are averaged over classes (``macro``) or
+    pooled over rows (``micro``). Token metrics compare lowercased word
+    tokens and are averaged over rows or pooled over tokens the same way;
+    ``exact_match`` compares the normalized token sequences. Per-slice
+    metrics go under ``slices``.
+    """
+    import pandas as pd
+
+    if average not in QUALITY_AVERAGES:
+        raise ValueError(f"Unknown average {average!r}; expected one of {', '.join(QUALITY_AVERAGES)}")
+    columns = [reference_column, output_column] + ([slice_column] if slice_column else [])
+    frame = frame[columns].dropna(subset=[reference_column, output_column])
+    if frame.empty:
+        return {'status': 'failed', 'error': "The quality dataset has no rows with both a reference and an output"}
+
+    references = frame[reference_column].astype(str)
+    outputs = frame[output_column].astype(str)
+    labels, classes = pd.factorize(pd.concat([references, outputs], ignore_index=True))
+    reference_codes, output_codes = labels[:len(frame)], labels[len(frame):]
+    if slice_column:
+        slice_codes, slice_names = pd.factorize(frame[slice_column].astype(str), sort=True)
+    else:
+        slice_codes, slice_names = np.zeros(len(frame), dtype=np.int64), pd.Index(['all'])
+    slice_codes = slice_codes.astype(np.int64)
+    no_slices = np.zeros(len(frame), dtype=np.int64)
+
+    overlap, reference_length, output_length, exact = token_overlap(references, outputs)
+    overall = {
+        **_classification(reference_codes, output_codes, no_slices, len(classes), 1, average),
+        **_token_metrics(overlap, reference_length, output_length, exact, no_slices, 1, average),
+    }
+    result: Dict[str, Any] = {metric: round(float(values[0]), 4) for metric, values in overall.items()}
+    result['average'] = average
+
+    if slice_column:
+        per_slice = {
+            **_classification(reference_codes, output_codes, slice_codes, len(classes), len(slice_names), average),
+            **_token_metrics(overlap, reference_length, output_length, exact, slice_codes, len(slice_names), average),
+        }
+        rows = np.bincount(slice_codes, minlength=len(slice_names))
+        result['slices'] = {
+            str(name): {'rows': int(rows[i]), **{metric: round(float(values[i]), 4) for metric, values in per_slice.items()}}
+            for i, name in enumerate(slice_names)
+        }
+    result['status'] = 'completed'
+    return result
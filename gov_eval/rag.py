@@ -0,0 +1,358 @@
+"""Offline RAG metrics for the RAG Metrics Evaluation evaluator
+
+A RAG dataset has one row per answered question: the ``question``, the
+``contexts`` the retriever returned (in rank order; a list column, or a JSON
+list in CSV), the generated ``answer`` and optionally a ``ground_truth``
+answer. Texts are embedded locally and scored with batched similarity.
+"""
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Sequence, Tuple
+import hashlib
+import itertools
+import json
+import os
+import threading
+
+import numpy as np
+
+from gov_eval.datasets import DatasetSource, read_dataset
+from gov_eval.quality import flat_tokens
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RAG_EVALUATOR = "RAG Metrics Evaluation"
+
+HASHING_DIM = 512
+# Similarity at which a retrieved context counts as relevant to its question
+RAG_RELEVANCE_THRESHOLD = 0.2
+
+# Texts embedded per embedder call, and queries scored per index matrix product
+EMBED_BATCH_SIZE = 4096
+SEARCH_BATCH_SIZE = 1024
+
+STORE_INITIAL_CAPACITY = 1024
+KEY_BYTES = 16
+# Embeddings kept by a store without a path before the least recently used are
+# evicted; about 200 MB of 512-dimensional vectors
+EMBEDDING_STORE_MAX_ROWS = 100_000
+
+_stores: Dict[int, 'EmbeddingStore'] = {}
+_stores_lock = threading.Lock()
+
+
+class HashingEmbedder:
+    """Signed feature hashing of word unigrams and bigrams, log-scaled and L2-normalized.
+
+    Deterministic and needs no model or network. Any object with ``name``,
+    ``dim`` and a call taking a list of texts can be used in its place.
+    """
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _buckets(self, features: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(feature.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+             for feature in features), dtype=np.uint64, count=len(features))
+        signs = np.where(hashes >> np.uint64(63), 1.0, -1.0)
+        return (hashes % np.uint64(self.dim)).astype(np.int64), signs
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        import pandas as pd
+
+        rows, tokens = flat_tokens(pd.Series(list(texts), dtype=object))
+        # Bigrams join neighbouring tokens of the same text
+        same_text = rows[:-1] == rows[1:]
+        bigrams = tokens[:-1][same_text] + ' ' + tokens[1:][same_text]
+        feature_rows = np.concatenate([rows, rows[:-1][same_text]])
+        codes, features = pd.factorize(np.concatenate([tokens, bigrams]))
+        # Each distinct feature is hashed once
+        buckets, signs = self._buckets(list(features))
+        counts = np.bincount(feature_rows * self.dim + buckets[codes], weights=signs[codes],
+                             minlength=len(texts) * self.dim).reshape(len(texts), self.dim)
+        vectors = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+class EmbeddingStore:
+    """Embeddings keyed by content hash, in memory or in memory-mapped files under ``path``; thread-safe
+
+    In memory, at most ``max_rows`` embeddings are kept and the least recently
+    used are evicted to make room. The memory-mapped files keep every
+    embedding and are what long-running deployments should use.
+    """
+
+    def __init__(self, dim: int, path: Optional[str] = None, max_rows: Optional[int] = None):
+        if max_rows is not None and max_rows < 1:
+            raise ValueError(f"max_rows must be at least 1, got {max_rows}")
+        self.dim = dim
+        self.path = path
+        self.max_rows = None if path else max_rows
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._rows: 'OrderedDict[bytes, int]' = OrderedDict()
+        self._count = 0
+        self._keys = np.zeros((0, KEY_BYTES), dtype=np.uint8)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        if path:
+            os.makedirs(path, exist_ok=True)
+            meta_path = os.path.join(path, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding='utf-8') as handle:
+                    meta = json.load(handle)
+                if meta['dim'] != dim:
+                    raise ValueError(f"Embedding store {path} holds {meta['dim']}-dimensional vectors, not {dim}")
+                self._count = meta['count']
+            self._open(max(self._count, STORE_INITIAL_CAPACITY))
+            self._rows = OrderedDict((self._keys[row].tobytes(), row) for row in range(self._count))
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _open(self, capacity: int):
+        """Map the key and vector files with room for ``capacity`` rows, growing them if needed"""
+        for name, row_bytes in (('keys.bin', KEY_BYTES), ('vectors.f32', self.dim * 4)):
+            with open(self._file(name), 'ab') as handle:
+                if handle.tell() < capacity * row_bytes:
+                    handle.truncate(capacity * row_bytes)
+        self._keys = np.memmap(self._file('keys.bin'), dtype=np.uint8, mode='r+', shape=(capacity, KEY_BYTES))
+        self._vectors = np.memmap(self._file('vectors.f32'), dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _reserve(self, rows: int):
+        needed = self._count + rows
+        if needed <= len(self._vectors):
+            return
+        capacity = max(needed, 2 * len(self._vectors), STORE_INITIAL_CAPACITY)
+        if self.path:
+            self._keys.flush()
+            self._vectors.flush()
+            self._open(capacity)
+        else:
+            if self.max_rows is not None:
+                capacity = min(capacity, self.max_rows)
+            self._keys = np.concatenate([self._keys[:self._count],
+                                         np.zeros((capacity - self._count, KEY_BYTES), dtype=np.uint8)])
+            self._vectors = np.concatenate([self._vectors[:self._count],
+                                            np.zeros((capacity - self._count, self.dim), dtype=np.float32)])
+
+    def _find(self, keys: Sequence[bytes]) -> np.ndarray:
+        """Row of every key or -1, marking found keys as recently used; call with the lock held"""
+        rows = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is None:
+                rows[i] = -1
+            else:
+                self._rows.move_to_end(key)
+                rows[i] = row
+        found = int((rows >= 0).sum())
+        self.hits += found
+        self.misses += len(keys) - found
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def lookup(self, keys: Sequence[bytes]) -> np.ndarray:
+        """Row of every key, or -1 where it is not stored
+
+        Rows of a store with ``max_rows`` may be reused by the next ``add``;
+        use ``fetch`` to read vectors safely.
+        """
+        with self._lock:
+            return self._find(keys)
+
+    def fetch(self, keys: Sequence[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectors of ``keys``, zero where not stored, and a mask of the keys that were stored"""
+        with self._lock:
+            rows = self._find(keys)
+            found = rows >= 0
+            vectors = np.zeros((len(keys), self.dim), dtype=np.float32)
+            vectors[found] = self._vectors[rows[found]]
+            return vectors, found
+
+    def add(self, keys: Sequence[bytes], vectors: np.ndarray) -> np.ndarray:
+        """Store vectors under keys not stored yet; returns the row of every key, or -1 where it was evicted"""
+        with self._lock:
+            new = []
+            appended = 0
+            for i, key in enumerate(keys):
+                if key in self._rows:
+                    self._rows.move_to_end(key)
+                    continue
+                if self.max_rows is None or self._count + appended < self.max_rows:
+                    row = self._count + appended
+                    appended += 1
+                else:
+                    # Full: the least recently used key gives up its row
+                    _, row = self._rows.popitem(last=False)
+                self._rows[key] = row
+                new.append((i, row))
+            # A key evicted by a later key of the same call is not written
+            new = [(i, row) for i, row in new if self._rows.get(keys[i]) == row]
+            if new:
+                self._reserve(appended)
+                indices = [i for i, _ in new]
+                rows = np.array([row for _, row in new], dtype=np.int64)
+                self._keys[rows] = np.frombuffer(b''.join(keys[i] for i in indices), dtype=np.uint8).reshape(-1, KEY_BYTES)
+                self._vectors[rows] = vectors[indices]
+            self._count += appended
+            if new and self.path:
+                self._keys.flush()
+                self._vectors.flush()
+                # The count is published last, so a crash never exposes rows that were not written
+                temporary = self._file('meta.json.tmp')
+                with open(temporary, 'w', encoding='utf-8') as handle:
+                    json.dump({'dim': self.dim, 'count': self._count}, handle)
+                os.replace(temporary, self._file('meta.json'))
+            return np.fromiter((self._rows.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+
+    def get(self, rows: np.ndarray) -> np.ndarray:
+        """Copy of the vectors at ``rows``"""
+        with self._lock:
+            return np.asarray(self._vectors[rows])
+
+
+def get_embedding_store(dim: int) -> EmbeddingStore:
+    """Return the process-wide store for ``dim``-dimensional embeddings, under ``GOV_EVAL_EMBEDDING_PATH`` if set"""
+    with _stores_lock:
+        store = _stores.get(dim)
+        if store is None:
+            root = os.getenv("GOV_EVAL_EMBEDDING_PATH")
+            store = _stores[dim] = EmbeddingStore(
+                dim, os.path.join(root, f"dim-{dim}") if root else None,
+                max_rows=int(os.getenv("GOV_EVAL_EMBEDDING_MAX_ROWS", EMBEDDING_STORE_MAX_ROWS)))
+        return store
+
+
+def _key(embedder_name: str, text: str) -> bytes:
+    return hashlib.blake2b(f"{embedder_name}\0{text}".encode('utf-8', 'surrogatepass'), digest_size=KEY_BYTES).digest()
+
+
+def embed_texts(texts: Sequence[str], embedder: Optional[Any] = None,
+                store: Optional[EmbeddingStore] = None) -> np.ndarray:
+    """Embeddings of ``texts``, one row each; only texts missing from ``store`` are embedded"""
+    import pandas as pd
+
+    embedder = embedder or HashingEmbedder()
+    if store is None:
+        store = get_embedding_store(embedder.dim)
+    codes, unique = pd.factorize(pd.Series(list(texts), dtype=object))
+    keys = [_key(embedder.name, text) for text in unique]
+    vectors, found = store.fetch(keys)
+    missing = np.flatnonzero(~found)
+    for start in range(0, len(missing), EMBED_BATCH_SIZE):
+        batch = missing[start:start + EMBED_BATCH_SIZE]
+        vectors[batch] = np.asarray(embedder([unique[i] for i in batch]), dtype=np.float32)
+        store.add([keys[i] for i in batch], vectors[batch])
+    return vectors[codes] if len(codes) else np.zeros((0, embedder.dim), dtype=np.float32)
+
+
+class VectorIndex:
+    """Exact nearest-neighbour search by inner product over vectors held in memory"""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def search(self, queries: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and scores of the ``k`` best matches of every query, best first"""
+        k = min(k, len(self.vectors))
+        indices = np.zeros((len(queries), k), dtype=np.int64)
+        scores = np.zeros((len(queries), k), dtype=np.float32)
+        for start in range(0, len(queries), SEARCH_BATCH_SIZE):
+            similarity = queries[start:start + SEARCH_BATCH_SIZE] @ self.vectors.T
+            top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            indices[start:start + len(top)] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + len(top)] = np.take_along_axis(top_scores, order, axis=1)
+        return indices, scores
+
+
+def load_rag_dataset(source: DatasetSource, question_column: str = 'question', contexts_column: str = 'contexts',
+                     answer_column: str = 'answer', ground_truth_column: Optional[str] = None,
+                     name: Optional[str] = None) -> 'pd.DataFrame':
+    """Read the question, contexts, answer and optional ground truth columns of a CSV or Parquet dataset"""
+    columns = [question_column, contexts_column, answer_column] + ([ground_truth_column] if ground_truth_column else [])
+    return read_dataset(source, columns, name, keep_default_na=False)
+
+
+def _context_list(value: Any) -> List[str]:
+    """Retrieved contexts of one row: a list, a JSON list string or a single context"""
+    if isinstance(value, str):
+        if value.lstrip().startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return [value]
+        else:
+            return [value] if value else []
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [str(context) for context in value]
+
+
+def rag_metrics(frame: 'pd.DataFrame', question_column: str = 'question', contexts_column: str = 'contexts',
+                answer_column: str = 'answer', ground_truth_column: Optional[str] = None,
+                embedder: Optional[Any] = None, store: Optional[EmbeddingStore] = None,
+                relevance_threshold: float = RAG_RELEVANCE_THRESHOLD) -> Dict[str, Any]:
+    """RAG Metrics Evaluation result for a dataset of questions, retrieved contexts and answers.
+
+    ``context_precision`` is the average precision of each row's ranked
+    contexts, where a context is relevant if its similarity to the question
+    reaches ``relevance_threshold``. ``answer_relevance`` is the similarity
+    between each question and its answer. ``retrieval_accuracy`` is the
+    share of rows whose contexts include the corpus context closest to the
+    ground truth, or to the answer when there is none.
+    """
+    import pandas as pd
+
+    if frame.empty:
+        return {'status': 'failed', 'error': "The RAG dataset has no rows"}
+    n = len(frame)
+    questions = frame[question_column].fillna('').astype(str).tolist()
+    answers = frame[answer_column].fillna('').astype(str).tolist()
+    contexts = [_context_list(value) for value in frame[contexts_column]]
+    lengths = np.fromiter((len(row) for row in contexts), dtype=np.int64, count=n)
+    context_rows = np.repeat(np.arange(n), lengths)
+    context_codes, corpus = pd.factorize(pd.Series(list(itertools.chain.from_iterable(contexts)), dtype=object))
+
+    embedder = embedder or HashingEmbedder()
+    question_vectors = embed_texts(questions, embedder, store)
+    answer_vectors = embed_texts(answers, embedder, store)
+    corpus_vectors = embed_texts(list(corpus), embedder, store)
+    if ground_truth_column:
+        target_vectors = embed_texts(frame[ground_truth_column].fillna('').astype(str).tolist(), embedder, store)
+    else:
+        target_vectors = answer_vectors
+
+    # Similarity of every retrieved context to its own question, as one batched row-wise product
+    context_similarity = np.einsum('ij,ij->i', corpus_vectors[context_codes], question_vectors[context_rows])
+    relevant = (context_similarity >= relevance_threshold).astype(float)
+    row_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    rank = np.arange(len(context_rows)) - row_starts[context_rows] + 1
+    relevant_so_far = np.cumsum(relevant) - (np.cumsum(relevant) - relevant)[row_starts[context_rows]]
+    relevant_count = np.bincount(context_rows, weights=relevant, minlength=n)
+    average_precision = np.bincount(context_rows, weights=relevant * relevant_so_far / rank, minlength=n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        context_precision = np.where(relevant_count > 0, average_precision / np.maximum(relevant_count, 1), 0.0)
+
+    answer_relevance = np.clip(np.einsum('ij,ij->i', question_vectors, answer_vectors), 0.0, 1.0)
+
+    if len(corpus):
+        best, _ = VectorIndex(corpus_vectors).search(target_vectors, k=1)
+        hits = np.bincount(context_rows, weights=(context_codes == best[context_rows, 0]).astype(float),
+                           minlength=n) > 0
+    else:
+        hits = np.zeros(n, dtype=bool)
+
+    return {
+        'retrieval_accuracy': round(float(hits.mean()), 4),
+        'answer_relevance': round(float(answer_relevance.mean()), 4),
+        'context_precision': round(float(context_precision.mean()), 4),
+        'status': 'completed'
+    }
@@ -0,0 +1,164 @@
+"""Sources of simulated scores
+
+Guardrails and evaluators draw their placeholder scores from a ``Scorer``
+instead of the global ``random`` module, so a run can be made reproducible:
+
+- ``RandomScorer`` wraps a NumPy ``Generator``. Unseeded it behaves like the
+  old global RNG; seeded it reproduces a run given the same inputs in the
+  same order.
+- ``ContentScorer`` is fully deterministic: every value is a function of the
+  seed, a stream name (detector or metric) and a hash of the scored content,
+  so the same prompt gets the same scores regardless of batching, ordering,
+  concurrency or caching.
+
+Both take keys through ``prepare`` first so batch callers hash each row once.
+Input too large to hold as one string is keyed through ``stream_key``, which
+takes the text in pieces and prepares the same key.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, Sequence, Union
+import hashlib
+
+import numpy as np
+
+Bound = Union[float, np.ndarray]
+
+# 2**-53: turns the top 53 bits of a uint64 into a float in [0, 1)
+_UNIT = 1.0 / (1 << 53)
+
+
+class StreamKey:
+    """Builds one prepared row key from text fed in pieces"""
+
+    def __init__(self, scorer: 'Scorer'):
+        self.scorer = scorer
+        self.parts = []
+
+    def update(self, text: str):
+        self.parts.append(text)
+
+    def prepared(self) -> np.ndarray:
+        return self.scorer.prepare([''.join(self.parts)])
+
+
+class Scorer(ABC):
+    """Draws simulated scores for keyed rows"""
+
+    @abstractmethod
+    def prepare(self, keys: Sequence[str]) -> np.ndarray:
+        """Turn row keys (prompt text or a content hash) into this scorer's per-row state"""
+
+    @abstractmethod
+    def uniform(self, low: Bound, high: Bound, prepared: np.ndarray, stream: str) -> np.ndarray:
+        """One uniform draw in ``[low, high)`` per prepared row for the named stream"""
+
+    def value(self, low: float, high: float, key: str, stream: str) -> float:
+        """Single uniform draw for one key"""
+        return float(self.uniform(low, high, self.prepare([key]), stream)[0])
+
+    def child(self, name: str) -> 'Scorer':
+        """Independent scorer for work that runs concurrently with its siblings"""
+        return self
+
+    def stream_key(self) -> StreamKey:
+        """Incremental equivalent of ``prepare`` for a single key"""
+        return StreamKey(self)
+
+
+class RandomScorer(Scorer):
+    """Scores from a NumPy Generator, optionally seeded per run"""
+
+    def __init__(self, seed: Optional[int] = None, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+    def prepare(self, keys: Sequence[str]) -> np.ndarray:
+        return np.zeros(len(keys), dtype=np.uint64)
+
+    def stream_key(self) -> StreamKey:
+        return _ZeroKey(self)
+
+    def uniform(self, low: Bound, high: Bound, prepared: np.ndarray, stream: str) -> np.ndarray:
+        return self.rng.uniform(low, high, len(prepared))
+
+    def child(self, name: str) -> 'RandomScorer':
+        # Children are seeded from the parent in creation order, so a seeded
+        # run stays reproducible even when children draw concurrently
+        return RandomScorer(rng=np.random.default_rng(self.rng.integers(1 << 63)))
+
+
+class ContentScorer(Scorer):
+    """Deterministic scores derived from a hash of the content being scored"""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._hash_key = hashlib.blake2b(str(seed).encode('utf-8'), digest_size=16).digest()
+
+    def _hash(self, text: str) -> int:
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=8, key=self._hash_key).digest()
+        return int.from_bytes(digest, 'little')
+
+    def prepare(self, keys: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self._hash(key) for key in keys), dtype=np.uint64, count=len(keys))
+
+    def stream_key(self) -> StreamKey:
+        return _HashKey(self)
+
+    # Scores depend only on the seed and the content, so scorers with the same
+    # seed are interchangeable (the coalescer shares results between them)
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ContentScorer) and other.seed == self.seed
+
+    def __hash__(self) -> int:
+        return hash((ContentScorer, self.seed))
+
+    def uniform(self, low: Bound, high: Bound, prepared: np.ndarray, stream: str) -> np.ndarray:
+        # splitmix64 finalizer over the row hash xor a per-stream salt
+        with np.errstate(over='ignore'):
+            mixed = prepared ^ np.uint64(self._hash(stream))
+            mixed = (mixed ^ (mixed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            mixed = (mixed ^ (mixed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            mixed = mixed ^ (mixed >> np.uint64(31))
+        unit = (mixed >> np.uint64(11)).astype(np.float64) * _UNIT
+        return low + unit * (np.asarray(high) - np.asarray(low))
+
+
+class _ZeroKey(StreamKey):
+    """Random scores ignore the key, so nothing is kept"""
+
+    def update(self, text: str):
+        pass
+
+    def prepared(self) -> np.ndarray:
+        return np.zeros(1, dtype=np.uint64)
+
+
+class _HashKey(StreamKey):
+    """Feeds the content hash incrementally instead of keeping the text"""
+
+    def __init__(self, scorer: ContentScorer):
+        super().__init__(scorer)
+        self.digest = hashlib.blake2b(digest_size=8, key=scorer._hash_key)
+
+    def update(self, text: str):
+        self.digest.update(text.encode('utf-8', 'surrogatepass'))
+
+    def prepared(self) -> np.ndarray:
+        return np.array([int.from_bytes(self.digest.digest(), 'little')], dtype=np.uint64)
+
+
+_unseeded = RandomScorer()
+
+
+def make_scorer(config: Dict[str, Any]) -> Scorer:
+    """Build the scorer selected by the ``deterministic`` and ``seed`` config keys"""
+    seed = config.get('seed')
+    if config.get('deterministic', False):
+        return ContentScorer(int(seed or 0))
+    if seed is None:
+        return _unseeded
+    return RandomScorer(int(seed))
+
+
+def scoring_signature(config: Dict[str, Any]) -> tuple:
+    """Scoring mode and seed, for cache keys that must not mix modes"""
+    return ('deterministic' if config.get('deterministic', False) else 'random', config.get('seed'))
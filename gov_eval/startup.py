@@ -0,0 +1,163 @@
+"""Streamlit app cold start benchmark
+
+Usage::
+
+    python -m gov_eval startup --repeat 5 --output startup.json
+
+Every sample runs in a fresh interpreter, so nothing is already imported or
+cached, and times the phases of a cold start listed in ``PHASES``.
+"""
+from typing import Dict, List, Any, Callable
+import argparse
+import datetime
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+# ``import`` covers importing streamlit (also reported alone as
+# ``streamlit_import``) and the app script's top-level imports, as a new
+# server process pays before it can draw anything. ``first_render`` is the
+# first run of the script under ``AppTest``, and ``rerun`` a second run, which
+# every widget interaction costs once the process is warm.
+PHASES = ['streamlit_import', 'import', 'first_render', 'rerun']
+
+# Reported for each phase, to show whether they are still imported eagerly
+HEAVY_MODULES = ['pandas', 'pyarrow', 'plotly.express', 'requests']
+
+DEFAULT_APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+# Runs in the fresh interpreter of one sample; argv: app path, timeout, prompt, heavy modules
+_PROBE = r'''
+import ast, json, os, sys, time
+
+app_path, timeout, prompt, heavy = sys.argv[1], float(sys.argv[2]), sys.argv[3], sys.argv[4].split(',')
+sys.path.insert(0, os.path.dirname(app_path))
+
+def loaded():
+    return [name for name in heavy if name in sys.modules]
+
+started = time.perf_counter()
+import streamlit
+streamlit_done = time.perf_counter()
+with open(app_path, encoding='utf-8') as handle:
+    tree = ast.parse(handle.read(), app_path)
+imports = ast.Module(body=[node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))],
+                     type_ignores=[])
+exec(compile(imports, app_path, 'exec'), {'__name__': '__startup__'})
+imported = time.perf_counter()
+modules = {'import': loaded()}
+
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(app_path, default_timeout=timeout)
+render_started = time.perf_counter()
+app.run()
+rendered = time.perf_counter()
+modules['first_render'] = loaded()
+if prompt and app.text_area:
+    app.text_area[0].input(prompt)
+rerun_started = time.perf_counter()
+app.run()
+rerun_done = time.perf_counter()
+modules['rerun'] = loaded()
+
+print(json.dumps({
+    'seconds': {
+        'streamlit_import': streamlit_done - started,
+        'import': imported - started,
+        'first_render': rendered - render_started,
+        'rerun': rerun_done - rerun_started,
+    },
+    'modules': modules,
+    'exceptions': [str(exception.value) for exception in app.exception],
+}))
+'''
+
+
+def run_sample(app_path: str, env: Dict[str, str], timeout: float = 60.0, prompt: str = '') -> Dict[str, Any]:
+    """Time one cold start of the app in a new interpreter"""
+    completed = subprocess.run(
+        [sys.executable, '-c', _PROBE, app_path, str(timeout), prompt, ','.join(HEAVY_MODULES)],
+        cwd=os.path.dirname(app_path), env=env, capture_output=True, text=True, timeout=timeout * 4
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize_phase(seconds: List[float]) -> Dict[str, Any]:
+    """Min, median, mean and max of one phase in milliseconds"""
+    values = [value * 1000.0 for value in seconds]
+    return {
+        'samples': len(values),
+        'min_ms': round(min(values), 2),
+        'p50_ms': round(statistics.median(values), 2),
+        'mean_ms': round(statistics.fmean(values), 2),
+        'max_ms': round(max(values), 2),
+    }
+
+
+def sample_env(configured: bool = True) -> Dict[str, str]:
+    """Environment of a sample: placeholder credentials where none are set when ``configured``, else empty ones"""
+    env = dict(os.environ)
+    for name in ('WATSONX_API_KEY', 'WATSONX_PROJECT_ID', 'WATSONX_INSTANCE_ID'):
+        if not configured:
+            # Empty rather than unset, so the app's .env cannot fill them back in
+            env[name] = ''
+        elif not env.get(name):
+            env[name] = 'startup-benchmark'
+    return env
+
+
+def run_startup_benchmark(app_path: str = DEFAULT_APP_PATH, repeat: int = 5, configured: bool = True,
+                          prompt: str = '', timeout: float = 60.0,
+                          log: Callable[[str], None] = lambda message: None) -> Dict[str, Any]:
+    """Run ``repeat`` cold starts and return the JSON-serializable report"""
+    env = sample_env(configured)
+    samples = []
+    for index in range(repeat):
+        sample = run_sample(app_path, env, timeout, prompt)
+        if sample['exceptions']:
+            raise RuntimeError(f"The app raised during the startup probe: {sample['exceptions'][0]}")
+        samples.append(sample)
+        log(f"sample {index + 1}: " + ", ".join(f"{phase} {sample['seconds'][phase] * 1000:.0f} ms" for phase in PHASES))
+
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'streamlit': importlib.metadata.version('streamlit'),
+            'app': app_path,
+            'repeat': repeat,
+            'configured': configured,
+            'prompt': bool(prompt),
+        },
+        'results': {phase: summarize_phase([sample['seconds'][phase] for sample in samples]) for phase in PHASES},
+        # Heavy modules loaded by the end of each phase, from the last sample
+        'modules': samples[-1]['modules'],
+    }
+
+
+def run_startup_command(args: argparse.Namespace) -> int:
+    """``python -m gov_eval startup`` handler"""
+    app = args.app or DEFAULT_APP_PATH
+    if not os.path.exists(app):
+        print(f"App script not found: {app}", file=sys.stderr)
+        return 2
+
+    report = run_startup_benchmark(os.path.abspath(app), args.repeat, configured=not args.unconfigured,
+                                   prompt=args.prompt or '', timeout=args.timeout,
+                                   log=lambda message: print(message, file=sys.stderr))
+
+    output = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output + '\n')
+        print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
@@ -0,0 +1,189 @@
+"""Local stub of the watsonx endpoints used by ``gov_eval.client``
+
+Serves the IAM token endpoint and the batched evaluations endpoint over
+HTTP/1.1 with keep-alive on localhost, so the client's pooling, token
+caching, retries and rate limiting can be tested and benchmarked offline::
+
+    with StubServer(latency=0.05, error_rate=0.1) as server:
+        client = GovernanceClient('key', server.url, 'project', iam_url=server.iam_url)
+        client.evaluate('Quality Evaluation', prompt_config)
+
+or from the command line with ``python -m gov_eval stub --port 8080``.
+Scores are deterministic: each is derived from a hash of the prompt, the
+evaluator and the metric, like ``--deterministic`` simulated scores.
+Injected failures (``fail_first`` requests, then ``error_rate`` of the rest)
+answer with ``fail_status`` and a ``Retry-After`` of ``retry_after``
+seconds, and ``revoke_tokens`` makes every issued token answer 401, as a
+revoked token would. ``stats()`` counts
+connections, token grants, requests and evaluations.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+import json
+import random
+import threading
+import time
+import uuid
+
+from gov_eval.cache import evaluator_content_key
+from gov_eval.client import EVALUATIONS_PATH
+from gov_eval.evaluators import get_available_evaluators
+from gov_eval.scoring import ContentScorer
+
+IAM_PATH = "/identity/token"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this each response waits on a delayed ACK
+    disable_nagle_algorithm = True
+    server: '_StubHTTPServer'
+
+    def setup(self):
+        super().setup()
+        self.server.stub.count('connections')
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        path = urlparse(self.path).path
+        if path == IAM_PATH:
+            self._send(200, self.server.stub.grant_token())
+        elif path == EVALUATIONS_PATH:
+            status, payload, headers = self.server.stub.evaluations(self.headers.get('Authorization', ''), body)
+            self._send(status, payload, headers)
+        else:
+            self._send(404, {'error': f"Unknown path {path}"})
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: 'StubServer'
+
+
+class StubServer:
+    """In-process stub watsonx server on ``127.0.0.1``; ``port=0`` picks a free port"""
+
+    def __init__(self, port: int = 0, token_ttl: float = 3600.0, latency: float = 0.0, error_rate: float = 0.0,
+                 fail_first: int = 0, fail_status: int = 503, max_batch_size: Optional[int] = None, seed: int = 0,
+                 retry_after: float = 0.0):
+        self.token_ttl = token_ttl
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.max_batch_size = max_batch_size
+        self.retry_after = retry_after
+        self._scorer = ContentScorer(seed)
+        self._rng = random.Random(seed)
+        self._tokens: Dict[str, float] = {}
+        self._stats = {'connections': 0, 'token_requests': 0, 'requests': 0, 'evaluations': 0, 'failures': 0}
+        self._lock = threading.Lock()
+        self._httpd = _StubHTTPServer(('127.0.0.1', port), _StubHandler)
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def iam_url(self) -> str:
+        return self.url + IAM_PATH
+
+    def count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def grant_token(self) -> Dict[str, Any]:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._stats['token_requests'] += 1
+            self._tokens[token] = time.time() + self.token_ttl
+        return {'access_token': token, 'token_type': 'Bearer', 'expires_in': self.token_ttl,
+                'expiration': int(time.time() + self.token_ttl)}
+
+    def revoke_tokens(self):
+        """Invalidate every token issued so far"""
+        with self._lock:
+            self._tokens.clear()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self._stats['requests'] += 1
+            fail = self._stats['requests'] <= self.fail_first or self._rng.random() < self.error_rate
+            if fail:
+                self._stats['failures'] += 1
+            return fail
+
+    def evaluations(self, authorization: str, body: bytes):
+        """Status, payload and headers for a POST to the evaluations endpoint"""
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else ''
+        with self._lock:
+            expires_at = self._tokens.get(token)
+        if expires_at is None or expires_at < time.time():
+            return 401, {'error': 'Invalid or expired token'}, None
+        if self._should_fail():
+            return self.fail_status, {'error': 'Injected failure'}, {'Retry-After': f"{self.retry_after:g}"}
+
+        items = json.loads(body or b'{}').get('evaluations', [])
+        if self.max_batch_size is not None and len(items) > self.max_batch_size:
+            return 413, {'error': f"At most {self.max_batch_size} evaluations per request"}, None
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._stats['evaluations'] += len(items)
+        return 200, {'results': [self.score(item['evaluator'], item['prompt']) for item in items]}, None
+
+    def score(self, evaluator: str, prompt_config: Dict[str, Any]) -> Dict[str, Any]:
+        catalog = get_available_evaluators()
+        if evaluator not in catalog:
+            return {'status': 'failed', 'error': f"Unknown evaluator: {evaluator}"}
+        key = evaluator_content_key(prompt_config, evaluator)
+        metrics: Dict[str, Any] = {
+            metric: round(self._scorer.value(0.7, 0.95, key, metric), 3) for metric in catalog[evaluator]['metrics']
+        }
+        metrics['status'] = 'completed'
+        return metrics
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
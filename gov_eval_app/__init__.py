@@ -0,0 +1,19 @@
+"""Streamlit UI of the watsonx Governance Prompt Evaluator
+
+``app.py`` configures the page and calls ``ui.main``; the page itself is
+split by concern:
+
+- ``ui``: session state, header, configuration sidebar, prompt inputs and
+  the page flow of both modes
+- ``guardrails``: the shared detector registry and the real-time guardrails
+  check
+- ``evaluators``: evaluator selection, dataset inputs and the background
+  evaluation job
+- ``results``: the results view, session history and exports
+- ``matrix``: evaluation matrix mode, imported only when it is selected
+
+Streamlit executes ``app.py`` on every rerun, but these modules are imported
+once per process. pandas, the API client and matrix mode are imported inside
+the functions that first need them, so a cold start only loads what the
+first render draws: a fresh session with no prompt yet never imports pandas.
+"""
@@ -0,0 +1,161 @@
+"""Evaluator selection, dataset inputs and the background evaluation job"""
+from typing import TYPE_CHECKING, Dict, Any, Optional
+import io
+
+import streamlit as st
+
+from gov_eval.datasets import dataset_columns
+from gov_eval.evaluators import get_available_evaluators
+from gov_eval.fairness import FAIRNESS_CONFIDENCE, FAIRNESS_EVALUATOR, confusion_counts, load_labeled_dataset
+from gov_eval.jobs import get_job_manager
+from gov_eval.quality import QUALITY_AVERAGES, QUALITY_EVALUATOR, load_quality_dataset, quality_metrics
+from gov_eval.rag import RAG_EVALUATOR, load_rag_dataset, rag_metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def cancel_evaluation_job():
+    """Cancel this session's running evaluation job, if any"""
+    get_job_manager().cancel(st.session_state.evaluation_job_id)
+    st.session_state.evaluation_job_id = None
+
+@st.cache_resource
+def load_evaluator_catalog():
+    """Evaluator catalog shared by every session"""
+    return get_available_evaluators()
+
+@st.cache_data(show_spinner="Summarizing labeled dataset...", max_entries=8)
+def load_fairness_counts(data: bytes, name: str, group_column: str, label_column: str,
+                         prediction_column: str) -> 'pd.DataFrame':
+    """Per-group confusion counts of an uploaded labeled dataset"""
+    frame = load_labeled_dataset(io.BytesIO(data), group_column, label_column, prediction_column, name=name)
+    return confusion_counts(frame, group_column, label_column, prediction_column)
+
+@st.cache_data(show_spinner="Scoring quality dataset...", max_entries=8)
+def load_quality_scores(data: bytes, name: str, reference_column: str, output_column: str,
+                        slice_column: Optional[str], average: str) -> Dict[str, Any]:
+    """Quality Evaluation result for an uploaded dataset of outputs and references"""
+    frame = load_quality_dataset(io.BytesIO(data), reference_column, output_column, slice_column, name=name)
+    return quality_metrics(frame, reference_column, output_column, slice_column, average)
+
+@st.cache_data(show_spinner="Embedding RAG dataset...", max_entries=8)
+def load_rag_scores(data: bytes, name: str, question_column: str, contexts_column: str, answer_column: str,
+                    ground_truth_column: Optional[str]) -> Dict[str, Any]:
+    """RAG Metrics Evaluation result for an uploaded dataset of questions, contexts and answers"""
+    columns = (question_column, contexts_column, answer_column, ground_truth_column)
+    return rag_metrics(load_rag_dataset(io.BytesIO(data), *columns, name=name), *columns)
+
+def render_fairness_dataset():
+    """Render the labeled dataset inputs for Fairness Evaluation; returns its confusion counts (or None) and interval level"""
+    upload = st.file_uploader("Labeled dataset (CSV or Parquet):", type=['csv', 'parquet'], key="fairness_dataset",
+                              help="One row per decision with group, true label and prediction columns")
+    if upload is None:
+        st.caption("Without a dataset, fairness scores are simulated")
+        return None, FAIRNESS_CONFIDENCE
+    
+    data = upload.getvalue()
+    columns = dataset_columns(io.BytesIO(data), upload.name)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        group_column = st.selectbox("Group column", columns, key="fairness_group_column")
+    with col2:
+        label_column = st.selectbox("Label column", columns, index=min(1, len(columns) - 1), key="fairness_label_column")
+    with col3:
+        prediction_column = st.selectbox("Prediction column", columns, index=min(2, len(columns) - 1),
+                                         key="fairness_prediction_column")
+    
+    counts = load_fairness_counts(data, upload.name, group_column, label_column, prediction_column)
+    st.caption(f"{int(counts.to_numpy().sum()):,} rows across {len(counts)} groups; a label or prediction of 1 "
+               f"is the favourable outcome")
+    confidence = st.slider("Interval confidence", 0.5, 0.99, FAIRNESS_CONFIDENCE, 0.01, key="fairness_confidence",
+                           help="Confidence level of the bootstrap intervals around each metric")
+    return counts, confidence
+
+def render_quality_dataset():
+    """Render the reference dataset inputs for Quality Evaluation; returns its scores or None"""
+    upload = st.file_uploader("Reference dataset (CSV or Parquet):", type=['csv', 'parquet'], key="quality_dataset",
+                              help="One row per example with the model output and the reference answer")
+    if upload is None:
+        st.caption("Without a dataset, quality scores are simulated")
+        return None
+    
+    data = upload.getvalue()
+    columns = dataset_columns(io.BytesIO(data), upload.name)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        reference_column = st.selectbox("Reference column", columns, key="quality_reference_column")
+    with col2:
+        output_column = st.selectbox("Output column", columns, index=min(1, len(columns) - 1),
+                                     key="quality_output_column")
+    with col3:
+        slice_column = st.selectbox("Slice column", [None] + columns, format_func=lambda column: column or "None",
+                                    key="quality_slice_column")
+    average = st.radio("Averaging", QUALITY_AVERAGES, horizontal=True, key="quality_average",
+                       help="macro: mean over classes and rows; micro: pooled over all rows and tokens")
+    
+    return load_quality_scores(data, upload.name, reference_column, output_column, slice_column, average)
+
+def render_rag_dataset():
+    """Render the retrieval dataset inputs for RAG Metrics Evaluation; returns its scores or None"""
+    upload = st.file_uploader("Retrieval dataset (CSV or Parquet):", type=['csv', 'parquet'], key="rag_dataset",
+                              help="One row per question with its retrieved contexts (a JSON list in CSV) and answer")
+    if upload is None:
+        st.caption("Without a dataset, RAG scores are simulated")
+        return None
+    
+    data = upload.getvalue()
+    columns = dataset_columns(io.BytesIO(data), upload.name)
+    col1, col2 = st.columns(2)
+    with col1:
+        question_column = st.selectbox("Question column", columns, key="rag_question_column")
+        answer_column = st.selectbox("Answer column", columns, index=min(2, len(columns) - 1), key="rag_answer_column")
+    with col2:
+        contexts_column = st.selectbox("Contexts column", columns, index=min(1, len(columns) - 1),
+                                       key="rag_contexts_column")
+        ground_truth_column = st.selectbox("Ground truth column", [None] + columns,
+                                           format_func=lambda column: column or "None", key="rag_ground_truth_column")
+    
+    return load_rag_scores(data, upload.name, question_column, contexts_column, answer_column, ground_truth_column)
+
+def render_evaluator_selection():
+    """Render evaluator selection interface; returns the selected evaluators and their extra config"""
+    st.header("🎯 Evaluation Configuration")
+    
+    evaluators = load_evaluator_catalog()
+    
+    col1, col2 = st.columns([2, 3])
+    
+    with col1:
+        st.subheader("Select Evaluators")
+        selected_evaluators = []
+        
+        for eval_name, eval_info in evaluators.items():
+            if st.checkbox(eval_name, key=f"eval_{eval_name}"):
+                selected_evaluators.append(eval_name)
+    
+    with col2:
+        st.subheader("Evaluator Details")
+        evaluator_config = {}
+        for eval_name in selected_evaluators:
+            if eval_name in evaluators:
+                with st.expander(f"{eval_name} Configuration"):
+                    st.write(f"**Description:** {evaluators[eval_name]['description']}")
+                    st.write(f"**Available Metrics:** {', '.join(evaluators[eval_name]['metrics'])}")
+                    
+                    # Allow metric selection
+                    selected_metrics = st.multiselect(
+                        f"Select metrics for {eval_name}:",
+                        evaluators[eval_name]['metrics'],
+                        default=evaluators[eval_name]['metrics'][:2],  # Default to first 2 metrics
+                        key=f"metrics_{eval_name}"
+                    )
+                    
+                    if eval_name == FAIRNESS_EVALUATOR:
+                        (evaluator_config['fairness_counts'],
+                         evaluator_config['fairness_confidence']) = render_fairness_dataset()
+                    elif eval_name == QUALITY_EVALUATOR:
+                        evaluator_config['quality_scores'] = render_quality_dataset()
+                    elif eval_name == RAG_EVALUATOR:
+                        evaluator_config['rag_scores'] = render_rag_dataset()
+    
+    return selected_evaluators, evaluator_config
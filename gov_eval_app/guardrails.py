@@ -0,0 +1,50 @@
+"""Guardrail detectors and the real-time guardrails check of the single prompt mode"""
+from typing import Dict, Any
+
+import streamlit as st
+
+from gov_eval.cache import get_result_cache
+from gov_eval.detectors import get_detectors
+from gov_eval.guardrails import evaluate_guardrails_realtime
+
+@st.cache_resource
+def load_guardrail_detectors():
+    """Registered guardrail detectors, with the default checks loaded once per process"""
+    detectors = get_detectors()
+    for detector in detectors:
+        if detector.default_enabled:
+            detector.ensure_loaded()
+    return detectors
+
+def render_guardrails_check(prompt_text: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Render the real-time guardrails check of a prompt; returns the guardrails result"""
+    import pandas as pd
+
+    st.header("🛡️ Real-time Guardrails Check")
+
+    guardrails_results = evaluate_guardrails_realtime(prompt_text, config, cache=get_result_cache(),
+                                                      mode=config.get('guardrails_mode', 'gate'))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if guardrails_results['passed']:
+            st.success("✅ Guardrails Passed")
+            st.write(guardrails_results['message'])
+        else:
+            st.error("❌ Guardrails Violations Detected")
+            st.write(guardrails_results['message'])
+            for violation in guardrails_results['violations']:
+                st.warning(f"⚠️ {violation}")
+            if guardrails_results.get('skipped'):
+                st.caption(f"Screening stopped at the first violation; not run: {', '.join(guardrails_results['skipped'])}")
+
+    with col2:
+        if guardrails_results['scores']:
+            st.subheader("Guardrails Scores")
+            scores_df = pd.DataFrame([
+                {"Check": k.replace('_', ' ').title(), "Score": v}
+                for k, v in guardrails_results['scores'].items()
+            ])
+            st.dataframe(scores_df, use_container_width=True)
+
+    return guardrails_results
@@ -0,0 +1,113 @@
+"""Evaluation matrix mode: many prompts on many models as one background job"""
+from typing import Dict, Any
+import io
+import time
+
+import streamlit as st
+
+from gov_eval.cache import get_result_cache
+from gov_eval.evaluators import get_simulated_coalescer
+from gov_eval.history import get_history
+from gov_eval.instrumentation import timed
+from gov_eval.jobs import JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_POLL_SECONDS, get_job_manager
+from gov_eval.matrix import load_prompts, matrix_frame, matrix_pivot
+from gov_eval_app.evaluators import render_evaluator_selection
+from gov_eval_app.ui import WATSONX_MODELS
+
+def cancel_matrix_job():
+    """Cancel this session's running matrix job, if any"""
+    get_job_manager().cancel(st.session_state.matrix_job_id)
+    st.session_state.matrix_job_id = None
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_matrix_prompts(data: bytes, name: str) -> list:
+    """Distinct prompts of an uploaded prompt file"""
+    return load_prompts(io.BytesIO(data), name)
+
+def render_matrix_inputs():
+    """Render the prompt file and model inputs of matrix mode; returns the prompts, models and shared prompt settings"""
+    st.header("🧮 Evaluation Matrix")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        upload = st.file_uploader("Prompts (TXT, JSONL, CSV or Parquet):", type=['txt', 'jsonl', 'csv', 'parquet'],
+                                  key="matrix_prompts",
+                                  help="One prompt per line, a prompt field per JSONL record, or a prompt column")
+        prompts = load_matrix_prompts(upload.getvalue(), upload.name) if upload is not None else []
+        system_prompt = st.text_area("System Prompt (optional):", height=100, key="matrix_system_prompt",
+                                     placeholder="Enter system prompt if applicable...")
+    with col2:
+        models = st.multiselect("Models:", WATSONX_MODELS, default=WATSONX_MODELS, key="matrix_models")
+        temperature = st.slider("Temperature", 0.0, 2.0, 0.7, 0.1, key="matrix_temperature")
+        max_tokens = st.number_input("Max Tokens", 1, 4000, 100, key="matrix_max_tokens")
+    
+    prompt_config = {
+        'system_prompt': system_prompt,
+        'model_type': "IBM watsonx.ai",
+        'temperature': temperature,
+        'max_tokens': max_tokens
+    }
+    return prompts, models, prompt_config
+
+@timed('render.matrix')
+def render_matrix_results(snapshot: Dict[str, Any]):
+    """Render a matrix job's results so far as a (prompt, model) by (evaluator, metric) pivot"""
+    st.header("📊 Matrix Results")
+    prompts = snapshot['prompts']
+    blocked = sorted(index for index, guardrails in snapshot['guardrails'].items() if not guardrails['passed'])
+    pivot = matrix_pivot(matrix_frame(snapshot['rows'], prompts), prompts, snapshot['models'], blocked)
+    pivot.columns = [f"{evaluator} · {metric}" for evaluator, metric in pivot.columns]
+    st.dataframe(pivot.reset_index(), use_container_width=True, hide_index=True)
+    
+    if blocked:
+        with st.expander(f"🚫 {len(blocked)} prompts blocked by guardrails"):
+            for index in blocked:
+                st.warning(f"{prompts[index][:200]} — {snapshot['guardrails'][index]['message']}")
+
+def render_matrix_mode(config: Dict[str, Any]):
+    """Matrix mode: evaluate many prompts on many models as one background job"""
+    prompts, models, prompt_config = render_matrix_inputs()
+    selected_evaluators, evaluator_config = render_evaluator_selection()
+    
+    st.divider()
+    st.caption(f"{len(prompts)} prompts × {len(models)} models × {len(selected_evaluators)} evaluators = "
+               f"{len(prompts) * len(models) * len(selected_evaluators):,} evaluations; guardrails run once per prompt")
+    col1, col2, col3, col4 = st.columns([1, 1.5, 1.5, 1])
+    with col2:
+        if st.button("🚀 Run Matrix", type="primary", use_container_width=True):
+            if not prompts or not models or not selected_evaluators:
+                st.error("Please upload prompts and select at least one model and one evaluator.")
+                return
+            cancel_matrix_job()
+            st.session_state.matrix_job_id = get_job_manager().submit_matrix(
+                {**config, **evaluator_config}, prompt_config, prompts, models, selected_evaluators,
+                cache=get_result_cache(), coalescer=get_simulated_coalescer(config)
+            )
+    with col3:
+        if st.button("⏹️ Cancel Matrix", use_container_width=True):
+            cancel_matrix_job()
+    
+    job = get_job_manager().get(st.session_state.matrix_job_id)
+    if job is None:
+        return
+    done = job.done
+    snapshot = job.snapshot()
+    if not done:
+        st.progress(job.progress(), text="Running evaluation matrix...")
+    elif st.session_state.matrix_recorded != job.id:
+        # Record the finished cells once, however often the results are shown again
+        st.session_state.matrix_recorded = job.id
+        if job.status != JOB_CANCELLED:
+            get_history().extend([cell for cell in job.cells() if cell['status'] == 'evaluated'],
+                                 session_id=st.session_state.session_id)
+        if job.status == JOB_COMPLETED:
+            st.success("✅ Evaluation matrix completed!")
+        elif job.status == JOB_FAILED:
+            st.error(f"❌ Evaluation matrix failed: {job.error}")
+    
+    st.divider()
+    render_matrix_results(snapshot)
+    
+    if not done:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
@@ -0,0 +1,191 @@
+"""Evaluation results view, session history and their exports"""
+from typing import TYPE_CHECKING, Dict, Any
+
+import streamlit as st
+
+from gov_eval.cache import content_hash
+from gov_eval.export import EXPORT_FORMATS, EXPORT_MIME_TYPES, RESULT_COLUMNS, export_bytes, json_report, result_chunks
+from gov_eval.history import COLUMNS, GUARDRAILS_EVALUATOR, HistoryView, get_history, results_frame
+from gov_eval.instrumentation import timed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+@timed('render.results_frame')
+def set_evaluation_results(results):
+    """Store the current results together with their flattened metrics frame"""
+    st.session_state.evaluation_results = results
+    st.session_state.evaluation_frame = results_frame(results) if results else None
+    st.session_state.evaluation_hash = content_hash(results) if results else None
+
+@st.cache_data(show_spinner="Preparing export...", max_entries=16)
+def export_results(results_hash: str, export_format: str, _results: Dict[str, Any]) -> bytes:
+    """One run's report as JSON or streamed rows, cached by the hash of its results"""
+    if export_format == 'json':
+        return json_report(_results)
+    return export_bytes(result_chunks(_results), RESULT_COLUMNS, export_format)
+
+@st.cache_data(show_spinner="Preparing export...", max_entries=8)
+def export_session_history(session_id: str, last_row_id: int, export_format: str) -> bytes:
+    """A session's stored history streamed from the database; ``last_row_id`` keeps the cached copy current"""
+    return export_bytes(get_history().iter_rows(session_id=session_id), COLUMNS, export_format)
+
+@timed('render.results')
+def render_results(results: Dict[str, Any], frame: 'pd.DataFrame', results_hash: str):
+    """Render evaluation results"""
+    import pandas as pd
+    
+    st.header("📊 Evaluation Results")
+    
+    if not results:
+        st.info("No evaluation results to display. Run an evaluation first.")
+        return
+    
+    # Summary section
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Model Evaluated", results['model'])
+    with col2:
+        st.metric("Evaluations Run", len(results['evaluations']))
+    with col3:
+        completed = sum(1 for eval_result in results['evaluations'].values() if eval_result.get('status') == 'completed')
+        st.metric("Completed", f"{completed}/{len(results['evaluations'])}")
+    with col4:
+        if 'guardrails' in results:
+            guardrails_status = "✅ Passed" if results['guardrails']['passed'] else "❌ Failed"
+            st.metric("Guardrails", guardrails_status)
+        else:
+            st.metric("Guardrails", "Disabled")
+    
+    st.divider()
+    
+    # Guardrails results section
+    if 'guardrails' in results:
+        with st.expander("🛡️ Guardrails Results", expanded=True):
+            guardrails = results['guardrails']
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if guardrails['passed']:
+                    st.success("✅ All guardrails passed")
+                else:
+                    st.error("❌ Guardrails violations detected")
+                
+                st.write(f"**Status:** {guardrails['message']}")
+                
+                if guardrails['violations']:
+                    st.subheader("Violations:")
+                    for violation in guardrails['violations']:
+                        st.warning(f"⚠️ {violation}")
+            
+            with col2:
+                if guardrails['scores']:
+                    st.subheader("Guardrails Scores")
+                    guardrails_rows = frame[frame['evaluator'] == GUARDRAILS_EVALUATOR]
+                    guardrails_df = pd.DataFrame({
+                        "Check": guardrails_rows['metric'].str.replace('_', ' ').str.title(),
+                        "Score": guardrails_rows['value']
+                    }).reset_index(drop=True)
+                    st.dataframe(guardrails_df, use_container_width=True)
+        
+        st.divider()
+    
+    # Detailed results
+    metric_rows = frame[frame['metric'].notna() & (frame['evaluator'] != GUARDRAILS_EVALUATOR)]
+    metrics_by_evaluator = {
+        name: group.rename(columns={'metric': 'Metric', 'value': 'Value'})[['Metric', 'Value']].reset_index(drop=True)
+        for name, group in metric_rows.groupby('evaluator', sort=False)
+    }
+    for eval_name, eval_results in results['evaluations'].items():
+        with st.expander(f"📈 {eval_name} Results", expanded=True):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Metrics")
+                metrics_df = metrics_by_evaluator.get(eval_name, pd.DataFrame())
+                
+                if not metrics_df.empty:
+                    st.dataframe(metrics_df, use_container_width=True)
+                
+                if eval_results.get('confidence_intervals'):
+                    intervals_df = pd.DataFrame(eval_results['confidence_intervals'], index=['Low', 'High']).T
+                    st.caption("Bootstrap confidence intervals")
+                    st.dataframe(intervals_df, use_container_width=True)
+                if eval_results.get('groups'):
+                    st.caption("Rates by group")
+                    st.dataframe(pd.DataFrame(eval_results['groups']).T, use_container_width=True)
+                if eval_results.get('slices'):
+                    st.caption(f"Metrics by slice ({eval_results.get('average', 'macro')} average)")
+                    st.dataframe(pd.DataFrame(eval_results['slices']).T, use_container_width=True)
+            
+            with col2:
+                st.subheader("Status")
+                if eval_results.get('status') == 'completed':
+                    st.success("✅ Evaluation completed successfully")
+                elif eval_results.get('status') == 'failed':
+                    st.error(f"❌ Evaluation failed: {eval_results.get('error', 'unknown error')}")
+                elif eval_results.get('status') == 'timeout':
+                    st.error(f"⏱️ Evaluation timed out: {eval_results.get('error', '')}")
+                elif eval_results.get('status') == 'cancelled':
+                    st.info("⏹️ Evaluation cancelled")
+                elif eval_results.get('status') == 'baseline':
+                    st.info(f"📏 {eval_results.get('message', 'Collecting drift reference')}")
+                else:
+                    st.warning("⏳ Evaluation in progress")
+    
+    # Export options; a report is only built once requested, then served from the cache
+    st.subheader("📥 Export Results")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        export_format = st.radio("Format", ('json',) + EXPORT_FORMATS, format_func=str.upper, horizontal=True,
+                                 key="results_export_format")
+    
+    with col2:
+        request = (results_hash, export_format)
+        if st.button("Prepare Report"):
+            st.session_state.results_export_request = request
+        if st.session_state.results_export_request == request:
+            st.download_button(
+                label=f"Download {export_format.upper()}",
+                data=export_results(results_hash, export_format, results),
+                file_name=f"evaluation_results.{export_format}",
+                mime=EXPORT_MIME_TYPES[export_format]
+            )
+
+@timed('render.session_history')
+def render_session_history():
+    """Render this session's evaluation history"""
+    if st.session_state.history_view is None:
+        # A session has no stored runs before its first evaluation finishes; skip building the frame until then
+        if not get_history().count(session_id=st.session_state.session_id):
+            return
+        st.session_state.history_view = HistoryView(get_history(), session_id=st.session_state.session_id)
+    history = st.session_state.history_view.refresh()
+    if history.empty:
+        return
+    
+    with st.expander(f"🕘 Session History ({history['run_id'].nunique()} runs)"):
+        metrics = history[history['metric'].notna() & (history['evaluator'] != GUARDRAILS_EVALUATOR)]
+        if metrics.empty:
+            st.info("No evaluator metrics recorded yet.")
+            return
+        summary = metrics.pivot_table(index=['timestamp', 'model'], columns='evaluator', values='value', aggfunc='mean')
+        st.dataframe(summary.sort_index(ascending=False).round(3), use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            export_format = st.radio("History format", EXPORT_FORMATS, format_func=str.upper, horizontal=True,
+                                     key="history_export_format")
+        with col2:
+            last_row_id = int(history['row_id'].max())
+            request = (last_row_id, export_format)
+            if st.button("Prepare History Export"):
+                st.session_state.history_export_request = request
+            if st.session_state.history_export_request == request:
+                st.download_button(
+                    label=f"Download {export_format.upper()}",
+                    data=export_session_history(st.session_state.session_id, last_row_id, export_format),
+                    file_name=f"evaluation_history.{export_format}",
+                    mime=EXPORT_MIME_TYPES[export_format]
+                )
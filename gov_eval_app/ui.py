@@ -0,0 +1,327 @@
+"""Page flow, session state, configuration sidebar and prompt inputs"""
+import os
+import time
+import uuid
+
+import streamlit as st
+
+from gov_eval.cache import get_result_cache
+from gov_eval.evaluators import get_simulated_coalescer
+from gov_eval.history import get_history
+from gov_eval.instrumentation import get_instrumentation, set_enabled, write_metrics_file
+from gov_eval.jobs import JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_POLL_SECONDS, get_job_manager
+from gov_eval_app.evaluators import cancel_evaluation_job, render_evaluator_selection
+from gov_eval_app.guardrails import load_guardrail_detectors, render_guardrails_check
+from gov_eval_app.results import render_results, render_session_history, set_evaluation_results
+
+WATSONX_MODELS = ["meta-llama/llama-2-70b-chat", "ibm/granite-13b-chat-v2", "google/flan-t5-xxl",
+                  "meta-llama/llama-2-13b-chat"]
+
+def initialize_session_state():
+    """Initialize session state variables"""
+    if 'evaluation_results' not in st.session_state:
+        st.session_state.evaluation_results = None
+        st.session_state.evaluation_frame = None
+        st.session_state.evaluation_hash = None
+        st.session_state.results_export_request = None
+        st.session_state.history_export_request = None
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+        st.session_state.history_view = None
+    if 'config_valid' not in st.session_state:
+        st.session_state.config_valid = False
+    if 'last_prompt' not in st.session_state:
+        st.session_state.last_prompt = ''
+    if 'evaluation_job_id' not in st.session_state:
+        st.session_state.evaluation_job_id = None
+    if 'matrix_job_id' not in st.session_state:
+        st.session_state.matrix_job_id = None
+        st.session_state.matrix_recorded = None
+
+def refresh_client(credentials: tuple):
+    """Hold the pooled client for these credentials, releasing the one held for the previous credentials.
+
+    The hold is a ``ClientLease`` in the session state, so a session that
+    ends also releases its client once Streamlit drops the session.
+    """
+    # The HTTP client stack is only loaded once valid credentials are entered
+    from gov_eval.client import ClientLease, get_client
+    
+    lease = st.session_state.get('client_lease')
+    if lease is not None and st.session_state.client_credentials == credentials:
+        return get_client(*credentials)
+    if lease is not None:
+        # Other sessions may hold the same client; it is closed only by the last one
+        lease.release()
+    st.session_state.client_credentials = credentials
+    st.session_state.client_lease = ClientLease(*credentials)
+    return st.session_state.client_lease.client
+
+def render_header():
+    """Render the application header"""
+    st.title("🔍 watsonx Governance Prompt Evaluator")
+    st.markdown("Evaluate prompts and models using IBM watsonx Governance framework")
+    st.divider()
+
+def render_configuration_sidebar():
+    """Render configuration inputs in sidebar"""
+    st.sidebar.header("⚙️ Configuration")
+    
+    # watsonx configuration
+    st.sidebar.subheader("watsonx Settings")
+    api_key = st.sidebar.text_input("API Key", type="password", value=os.getenv("WATSONX_API_KEY", ""))
+    project_id = st.sidebar.text_input("Project ID", value=os.getenv("WATSONX_PROJECT_ID", ""))
+    instance_id = st.sidebar.text_input("Instance ID", value=os.getenv("WATSONX_INSTANCE_ID", ""))
+    
+    # Optional URL configuration
+    st.sidebar.subheader("Optional Settings")
+    base_url = st.sidebar.text_input("Base URL", value=os.getenv("WATSONX_BASE_URL", "https://us-south.ml.cloud.ibm.com"))
+    
+    # Real-time Guardrails Configuration
+    st.sidebar.subheader("🛡️ Real-time Guardrails")
+    enable_guardrails = st.sidebar.checkbox("Enable Real-time Guardrails", value=True)
+    
+    guardrails_config = {}
+    guardrails_mode = 'gate'
+    if enable_guardrails:
+        st.sidebar.markdown("**Content Safety Filters:**")
+        for detector in load_guardrail_detectors():
+            guardrails_config[detector.name] = st.sidebar.checkbox(
+                detector.label, value=detector.default_enabled, help=detector.description or None
+            )
+        
+        st.sidebar.markdown("**Thresholds:**")
+        guardrails_config['toxicity_threshold'] = st.sidebar.slider(
+            "Toxicity Threshold", 0.0, 1.0, 0.7, 0.1, 
+            help="Block content above this toxicity score"
+        )
+        guardrails_config['confidence_threshold'] = st.sidebar.slider(
+            "Confidence Threshold", 0.0, 1.0, 0.8, 0.1,
+            help="Minimum confidence for guardrail decisions"
+        )
+        guardrails_mode = st.sidebar.radio(
+            "Screening Mode", ['gate', 'report'], horizontal=True,
+            help="gate: run the cheapest checks first and stop at the first violation; report: score every check"
+        )
+    
+    # Scoring mode
+    st.sidebar.subheader("🎲 Scoring")
+    deterministic = st.sidebar.checkbox(
+        "Deterministic Mode", value=False,
+        help="Derive simulated scores from a hash of the inputs so reruns and comparisons are reproducible"
+    )
+    seed = None
+    if deterministic:
+        seed = int(st.sidebar.number_input("Seed", min_value=0, value=0, step=1))
+    
+    # Validate configuration
+    config_valid = bool(api_key and project_id and instance_id)
+    st.session_state.config_valid = config_valid
+    
+    if not config_valid:
+        st.sidebar.error("⚠️ Please provide all required configuration fields")
+    else:
+        refresh_client((api_key, base_url, project_id, instance_id))
+        st.sidebar.success("✅ Configuration valid")
+    
+    cache_stats = get_result_cache().stats()
+    st.sidebar.caption(
+        f"Result cache: {cache_stats['hits'] + cache_stats['disk_hits']} hits / "
+        f"{cache_stats['misses']} misses ({cache_stats['entries']} entries)"
+    )
+    
+    render_performance_panel()
+    
+    return {
+        'api_key': api_key,
+        'project_id': project_id,
+        'instance_id': instance_id,
+        'base_url': base_url,
+        'enable_guardrails': enable_guardrails,
+        'guardrails_config': guardrails_config,
+        'guardrails_mode': guardrails_mode,
+        'deterministic': deterministic,
+        'seed': seed
+    }
+
+def render_performance_panel():
+    """Render the sidebar switch and table for hot-path timings"""
+    instrumentation = get_instrumentation()
+    st.sidebar.subheader("⏱️ Performance")
+    st.sidebar.checkbox(
+        "Collect timings", value=instrumentation.enabled, key="collect_timings",
+        on_change=lambda: set_enabled(st.session_state.collect_timings),
+        help="Time guardrail detectors, evaluators, rendering and exports; applies to every session on this server"
+    )
+    if not instrumentation.enabled:
+        return
+    
+    import pandas as pd
+    
+    write_metrics_file()
+    with st.sidebar.expander("Stage timings", expanded=False):
+        summary = pd.DataFrame(instrumentation.summary())
+        if summary.empty:
+            st.caption("No timings recorded yet")
+        else:
+            st.dataframe(summary.set_index('stage')[['calls', 'errors', 'mean_ms', 'p95_ms', 'max_ms', 'total_s']],
+                         use_container_width=True)
+        events = instrumentation.events()
+        if events:
+            st.caption(", ".join(f"{name}: {count}" for name, count in sorted(events.items())))
+        st.download_button("Download Prometheus metrics", instrumentation.to_prometheus(),
+                           file_name="gov_eval_metrics.prom", mime="text/plain")
+        if st.button("Reset timings"):
+            instrumentation.reset()
+            st.rerun()
+
+def render_prompt_input():
+    """Render prompt and model input section"""
+    st.header("📝 Prompt & Model Configuration")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Prompt Input")
+        prompt_text = st.text_area(
+            "Enter your prompt:",
+            height=150,
+            placeholder="Enter the prompt you want to evaluate..."
+        )
+        
+        # Optional: System prompt
+        system_prompt = st.text_area(
+            "System Prompt (optional):",
+            height=100,
+            placeholder="Enter system prompt if applicable..."
+        )
+    
+    with col2:
+        st.subheader("Model Configuration")
+        model_type = st.selectbox(
+            "Model Type:",
+            ["IBM watsonx.ai", "External Model", "Custom Model"]
+        )
+        
+        if model_type == "IBM watsonx.ai":
+            model_name = st.selectbox("Model Name:", WATSONX_MODELS)
+        else:
+            model_name = st.text_input("Model Name/ID:")
+        
+        # Model parameters
+        st.subheader("Model Parameters")
+        temperature = st.slider("Temperature", 0.0, 2.0, 0.7, 0.1)
+        max_tokens = st.number_input("Max Tokens", 1, 4000, 100)
+        
+    return {
+        'prompt_text': prompt_text,
+        'system_prompt': system_prompt,
+        'model_type': model_type,
+        'model_name': model_name,
+        'temperature': temperature,
+        'max_tokens': max_tokens
+    }
+
+def main():
+    """Main application function"""
+    initialize_session_state()
+    render_header()
+    
+    # Configuration sidebar
+    config = render_configuration_sidebar()
+    
+    # Main content
+    if not st.session_state.config_valid:
+        st.warning("⚠️ Please configure your watsonx settings in the sidebar to continue.")
+        st.info("💡 You can set environment variables WATSONX_API_KEY, WATSONX_PROJECT_ID, and WATSONX_INSTANCE_ID to pre-fill the configuration.")
+        return
+    
+    mode = st.radio("Mode", ["Single prompt", "Evaluation matrix"], horizontal=True, key="evaluation_mode",
+                    help="Evaluation matrix runs every uploaded prompt on every selected model")
+    if mode == "Evaluation matrix":
+        from gov_eval_app.matrix import render_matrix_mode
+        render_matrix_mode(config)
+        render_session_history()
+        return
+    
+    # Prompt and model input
+    prompt_config = render_prompt_input()
+    
+    # Check if prompt has changed and clear results if so
+    current_prompt = prompt_config['prompt_text']
+    if current_prompt != st.session_state.last_prompt:
+        cancel_evaluation_job()
+        set_evaluation_results(None)
+        st.session_state.last_prompt = current_prompt
+    
+    # Real-time guardrails check
+    if config.get('enable_guardrails', False) and prompt_config['prompt_text'].strip():
+        guardrails_results = render_guardrails_check(prompt_config['prompt_text'], config)
+        
+        # If guardrails failed, don't proceed with model evaluation
+        if not guardrails_results['passed']:
+            st.error("🚫 Model evaluation blocked due to guardrails violations. Please modify your prompt and try again.")
+            return
+        
+        st.divider()
+    
+    # Evaluator selection
+    selected_evaluators, evaluator_config = render_evaluator_selection()
+    
+    # Evaluation and reset buttons
+    st.divider()
+    col1, col2, col3, col4 = st.columns([1, 1.5, 1.5, 1])
+    
+    with col2:
+        if st.button("🚀 Run Evaluation", type="primary", use_container_width=True):
+            if not prompt_config['prompt_text'].strip():
+                st.error("Please enter a prompt to evaluate.")
+                return
+            
+            if not selected_evaluators:
+                st.error("Please select at least one evaluator.")
+                return
+            
+            # Start the evaluation in the background; progress is polled below
+            cancel_evaluation_job()
+            extra = {'guardrails': guardrails_results} if config.get('enable_guardrails', False) else None
+            st.session_state.evaluation_job_id = get_job_manager().submit_evaluation(
+                {**config, **evaluator_config}, prompt_config, selected_evaluators, cache=get_result_cache(), extra=extra,
+                coalescer=get_simulated_coalescer(config)
+            )
+    
+    with col3:
+        if st.button("🔄 Reset Results", use_container_width=True):
+            cancel_evaluation_job()
+            set_evaluation_results(None)
+            st.rerun()
+    
+    # Pick up the latest results of a running evaluation
+    job = get_job_manager().get(st.session_state.evaluation_job_id)
+    if job is not None:
+        # Check before snapshotting: a job seen done has recorded every result
+        done = job.done
+        set_evaluation_results(job.snapshot())
+        if not done:
+            st.progress(job.progress(), text="Running evaluation...")
+        else:
+            st.session_state.evaluation_job_id = None
+            if job.status != JOB_CANCELLED:
+                get_history().append(st.session_state.evaluation_results, session_id=st.session_state.session_id)
+            if job.status == JOB_COMPLETED:
+                st.success("✅ Evaluation completed successfully!")
+            elif job.status == JOB_FAILED:
+                st.error(f"❌ Evaluation failed: {job.error}")
+    
+    # Display results
+    if st.session_state.evaluation_results:
+        st.divider()
+        render_results(st.session_state.evaluation_results, st.session_state.evaluation_frame,
+                       st.session_state.evaluation_hash)
+    
+    render_session_history()
+    
+    # Rerun until the job finishes so results appear as each evaluator completes
+    if job is not None and not done:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
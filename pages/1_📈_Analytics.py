@@ -0,0 +1,154 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import time
+from typing import Optional
+from dotenv import load_dotenv
+
+from gov_eval.analytics import (MAX_PLOT_POINTS, choose_bucket_seconds, downsample, failure_rates, metric_histogram,
+                                metric_percentiles, rolling_trend)
+from gov_eval.history import GUARDRAILS_EVALUATOR, get_history
+from gov_eval.instrumentation import timed
+
+# Load environment variables; the history location may come from .env when
+# this page is the first one a process serves
+load_dotenv()
+
+st.set_page_config(
+    page_title="Evaluation Analytics",
+    page_icon="📈",
+    layout="wide"
+)
+
+TIME_RANGES = {
+    "Last 24 hours": 24 * 60 * 60,
+    "Last 7 days": 7 * 24 * 60 * 60,
+    "Last 30 days": 30 * 24 * 60 * 60,
+    "Last 90 days": 90 * 24 * 60 * 60,
+    "All time": None
+}
+ANALYTICS_CACHE_SECONDS = 60
+
+@st.cache_data(ttl=ANALYTICS_CACHE_SECONDS, show_spinner=False)
+def load_bucket_stats(bucket_seconds: int, since: Optional[float], version: int) -> pd.DataFrame:
+    """Per-bucket aggregates of every series; ``version`` changes when rows are appended"""
+    return get_history().bucket_stats(bucket_seconds, since=since)
+
+@st.cache_data(ttl=ANALYTICS_CACHE_SECONDS, show_spinner=False)
+def load_distribution(evaluator: str, metric: str, since: Optional[float], version: int):
+    """Percentile table and histogram of one metric per model"""
+    values = get_history().query(evaluator=evaluator, metric=metric, since=since, columns=['model', 'value'])
+    return metric_percentiles(values), metric_histogram(values)
+
+def render_filters():
+    """Render the time range and series filters in the sidebar"""
+    st.sidebar.header("📈 Analytics Filters")
+    time_range = st.sidebar.selectbox("Time Range", list(TIME_RANGES), index=2)
+    window = st.sidebar.slider("Rolling Window (buckets)", 1, 30, 5)
+    return TIME_RANGES[time_range], window
+
+@timed('render.analytics')
+def main():
+    """Analytics page"""
+    st.title("📈 Evaluation Analytics")
+    st.markdown("Trends and distributions across the stored evaluation history")
+    st.divider()
+
+    history = get_history()
+    version = history.last_row_id()
+    oldest, _ = history.time_bounds()
+    if oldest is None:
+        st.info("No evaluations recorded yet. Run an evaluation to start building history.")
+        return
+
+    range_seconds, window = render_filters()
+    now = time.time()
+    span = range_seconds or max(now - oldest, 60)
+    bucket_seconds = choose_bucket_seconds(span)
+    # Align the start to a bucket so the cached aggregates are reused between reruns
+    since = (now - range_seconds) // bucket_seconds * bucket_seconds if range_seconds else None
+
+    stats = load_bucket_stats(bucket_seconds, since, version)
+    if stats.empty:
+        st.info("No evaluations in the selected time range.")
+        return
+
+    models = sorted(stats['model'].dropna().unique())
+    selected_models = st.sidebar.multiselect("Models", models, default=models)
+    stats = stats[stats['model'].isin(selected_models)]
+
+    evaluator_stats = stats[stats['evaluator'] != GUARDRAILS_EVALUATOR]
+    guardrails_stats = stats[stats['evaluator'] == GUARDRAILS_EVALUATOR]
+
+    # Summary section
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Models", len(selected_models))
+    with col2:
+        st.metric("Metric Values", f"{int(evaluator_stats['count'].sum()):,}")
+    with col3:
+        failed = evaluator_stats[evaluator_stats['metric'].isna()]['rows'].sum()
+        st.metric("Failed Evaluations", f"{int(failed):,}")
+    with col4:
+        st.metric("Bucket Size", f"{bucket_seconds // 60:,} min" if bucket_seconds < 3600 else f"{bucket_seconds // 3600:,} h")
+
+    st.divider()
+
+    # Metric trends
+    st.header("📉 Metric Trends")
+    metric_stats = evaluator_stats[evaluator_stats['metric'].notna()]
+    if metric_stats.empty:
+        st.info("No evaluator metrics in the selected range.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            evaluator = st.selectbox("Evaluator", sorted(metric_stats['evaluator'].unique()))
+        with col2:
+            metric = st.selectbox("Metric", sorted(metric_stats[metric_stats['evaluator'] == evaluator]['metric'].unique()))
+
+        series = rolling_trend(metric_stats[(metric_stats['evaluator'] == evaluator) & (metric_stats['metric'] == metric)],
+                               window)
+        series = downsample(series, 'bucket', 'rolling_mean', MAX_PLOT_POINTS, by=['model'])
+        trend_fig = px.line(series, x='bucket', y='rolling_mean', color='model', markers=len(series) < 100,
+                            labels={'bucket': 'Time', 'rolling_mean': f"{metric} (rolling mean)", 'model': 'Model'})
+        st.plotly_chart(trend_fig, use_container_width=True)
+
+        percentiles, histogram = load_distribution(evaluator, metric, since, version)
+        percentiles = percentiles[percentiles['model'].isin(selected_models)]
+        histogram = histogram[histogram['model'].isin(selected_models)]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Distribution")
+            histogram_fig = px.bar(histogram, x='bin_start', y='count', color='model', barmode='overlay', opacity=0.6,
+                                   labels={'bin_start': metric, 'count': 'Evaluations', 'model': 'Model'})
+            st.plotly_chart(histogram_fig, use_container_width=True)
+        with col2:
+            st.subheader("Percentiles")
+            st.dataframe(percentiles.set_index('model').round(3), use_container_width=True)
+
+    st.divider()
+
+    # Guardrail violation rates
+    st.header("🛡️ Guardrail Violation Rates")
+    if guardrails_stats.empty:
+        st.info("No guardrail results in the selected range.")
+        return
+
+    overall = failure_rates(guardrails_stats, keys=['metric'], over_time=False)
+    over_time = failure_rates(guardrails_stats, keys=['metric'])
+    over_time = downsample(over_time, 'bucket', 'rate', MAX_PLOT_POINTS, by=['metric'])
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        rates_fig = px.bar(overall, x='metric', y='rate', labels={'metric': 'Check', 'rate': 'Violation Rate'})
+        rates_fig.update_yaxes(tickformat='.0%')
+        st.plotly_chart(rates_fig, use_container_width=True)
+    with col2:
+        rates_trend_fig = px.line(over_time, x='bucket', y='rate', color='metric',
+                                  labels={'bucket': 'Time', 'rate': 'Violation Rate', 'metric': 'Check'})
+        rates_trend_fig.update_yaxes(tickformat='.0%')
+        st.plotly_chart(rates_trend_fig, use_container_width=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""GovernanceClient pooling, tokens, retries, rate limiting and batching against the stub server"""
+import gc
+import time
+import uuid
+
+import pytest
+
+from gov_eval import client as client_module
+from gov_eval.client import (ClientLease, GovernanceAPIError, GovernanceClient, TOKEN_REFRESH_FRACTION,
+                             acquire_client, client_key, get_client, get_rate_limiter, invalidate_client,
+                             release_client)
+from gov_eval.stub_server import StubServer
+
+CREDENTIALS = ('key', 'http://127.0.0.1:9', 'project', 'instance')
+
+PROMPT = {'prompt_text': "What is the capital of France?", 'model_name': 'ibm/granite-13b-chat-v2'}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Seconds the client slept between retries, without sleeping"""
+    slept = []
+    monkeypatch.setattr(client_module.time, 'sleep', slept.append)
+    return slept
+
+
+def stub_client(server, **kwargs):
+    return GovernanceClient('key', server.url, 'project', iam_url=server.iam_url, **kwargs)
+
+
+def test_lease_released_when_collected():
+    lease = ClientLease(*CREDENTIALS)
+    del lease
+    gc.collect()
+
+    assert client_key(*CREDENTIALS) not in client_module._clients
+
+
+def test_lease_release_keeps_client_for_other_holders():
+    acquire_client(*CREDENTIALS)
+    lease = ClientLease(*CREDENTIALS)
+
+    assert not lease.release()
+    assert lease.released
+    assert not lease.release()
+    assert client_key(*CREDENTIALS) in client_module._clients
+    assert release_client(*CREDENTIALS)
+
+
+def test_token_reused_then_refreshed_before_expiry():
+    with StubServer(token_ttl=0.5) as server:
+        client = stub_client(server)
+        client.evaluate('Quality Evaluation', PROMPT)
+        client.evaluate('Quality Evaluation', PROMPT)
+        assert server.stats()['token_requests'] == 1
+
+        # Past the refresh point but before the token expires
+        time.sleep(0.5 * TOKEN_REFRESH_FRACTION + 0.05)
+        client.evaluate('Quality Evaluation', PROMPT)
+
+        assert server.stats()['token_requests'] == 2
+        # No request was answered 401: each got its result on the first try
+        assert client.stats()['requests'] == 3
+
+
+def test_revoked_token_refreshed_once():
+    with StubServer() as server:
+        client = stub_client(server)
+        client.evaluate('Quality Evaluation', PROMPT)
+        server.revoke_tokens()
+
+        assert client.evaluate('Quality Evaluation', PROMPT)['status'] == 'completed'
+        assert server.stats()['token_requests'] == 2
+        assert client.stats()['retries'] == 0
+
+
+def test_persistent_401_is_not_retried_forever():
+    # Tokens that are already expired when issued
+    with StubServer(token_ttl=-1) as server:
+        client = stub_client(server)
+        with pytest.raises(GovernanceAPIError) as error:
+            client.evaluate('Quality Evaluation', PROMPT)
+
+        assert error.value.status_code == 401
+        assert client.stats()['requests'] == 2
+
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_retries_honour_retry_after(status, sleeps):
+    with StubServer(fail_first=2, fail_status=status, retry_after=1.5) as server:
+        client = stub_client(server)
+
+        assert client.evaluate('Quality Evaluation', PROMPT)['status'] == 'completed'
+        assert sleeps == [1.5, 1.5]
+        assert client.stats()['retries'] == 2
+
+
+def test_retries_give_up_after_max_retries(sleeps):
+    with StubServer(fail_first=10, fail_status=503) as server:
+        client = stub_client(server, max_retries=2)
+        with pytest.raises(GovernanceAPIError) as error:
+            client.evaluate('Quality Evaluation', PROMPT)
+
+        assert error.value.status_code == 503
+        assert server.stats()['requests'] == 3
+        assert sleeps == [0.0, 0.0]
+
+
+def test_client_error_is_not_retried(sleeps):
+    with StubServer(max_batch_size=1) as server:
+        client = stub_client(server)
+        with pytest.raises(GovernanceAPIError) as error:
+            client.evaluate_batch([('Quality Evaluation', PROMPT)] * 2)
+
+        assert error.value.status_code == 413
+        assert sleeps == []
+
+
+def test_rate_limit_shared_per_project(monkeypatch):
+    monkeypatch.setenv('WATSONX_RATE_LIMIT_PER_SECOND', '50')
+    monkeypatch.setenv('WATSONX_RATE_LIMIT_BURST', '1')
+    project, other_project = uuid.uuid4().hex, uuid.uuid4().hex
+
+    with StubServer() as server:
+        clients = [get_client(api_key, server.url, project, iam_url=server.iam_url) for api_key in ('a', 'b')]
+        other = get_client('a', server.url, other_project, iam_url=server.iam_url)
+        try:
+            assert clients[0] is not clients[1]
+            assert clients[0].rate_limiter is clients[1].rate_limiter is get_rate_limiter(project)
+            assert other.rate_limiter is not clients[0].rate_limiter
+
+            started = time.monotonic()
+            for _ in range(3):
+                for client in clients:
+                    client.evaluate('Quality Evaluation', PROMPT)
+            # One request fits the burst; the other five wait for the bucket to refill
+            assert time.monotonic() - started >= 5 / 50 * 0.9
+            assert sum(client.stats()['throttled_seconds'] for client in clients) > 0
+
+            other.evaluate('Quality Evaluation', PROMPT)
+            assert other.stats()['throttled_seconds'] == 0
+        finally:
+            for api_key, project_id in (('a', project), ('b', project), ('a', other_project)):
+                invalidate_client(api_key, server.url, project_id, iam_url=server.iam_url)
+
+
+def test_evaluate_batch_chunks_requests():
+    items = [(evaluator, dict(PROMPT, prompt_text=f"Prompt {index}"))
+             for index in range(5) for evaluator in ('Quality Evaluation', 'Fairness Evaluation')]
+
+    with StubServer(max_batch_size=4) as server:
+        results = stub_client(server, max_batch_size=4).evaluate_batch(items)
+
+        assert server.stats()['requests'] == 3
+        assert server.stats()['evaluations'] == len(items)
+        assert results == [server.score(evaluator, prompt_config) for evaluator, prompt_config in items]
@@ -0,0 +1,26 @@
+"""RequestCoalescer backed by the API client"""
+from gov_eval.client import GovernanceClient
+from gov_eval.coalescer import RequestCoalescer
+from gov_eval.evaluators import simulate_evaluation
+from gov_eval.scoring import make_scorer
+from gov_eval.stub_server import StubServer
+
+PROMPT = {'prompt_text': "What is the capital of France?", 'model_name': 'ibm/granite-13b-chat-v2'}
+EVALUATORS = ['Quality Evaluation', 'Fairness Evaluation', 'Guardrails Evaluation']
+
+
+def test_client_backs_coalescer_with_scored_requests():
+    with StubServer() as server:
+        client = GovernanceClient('key', server.url, 'project', iam_url=server.iam_url)
+        coalescer = RequestCoalescer(client.evaluate_batch)
+        try:
+            # simulate_evaluation submits every request with its own child scorer
+            results = simulate_evaluation({'seed': 3}, PROMPT, EVALUATORS, coalescer=coalescer)
+            direct = coalescer.evaluate('Quality Evaluation', PROMPT, timeout=5,
+                                        scorer=make_scorer({'seed': 3}).child('Quality Evaluation'))
+        finally:
+            coalescer.close()
+
+        assert results['evaluations'] == {evaluator: server.score(evaluator, PROMPT) for evaluator in EVALUATORS}
+        assert direct == server.score('Quality Evaluation', PROMPT)
+        assert server.stats()['requests'] == coalescer.stats()['batches']
@@ -0,0 +1,17 @@
+"""Concurrent evaluation runner"""
+from gov_eval import evaluators
+from gov_eval.drift import DRIFT_EVALUATOR
+
+PROMPT = {'prompt_text': "What is the capital of France?", 'model_name': 'ibm/granite-13b-chat-v2'}
+
+
+def test_drift_failure_is_recorded(monkeypatch):
+    class BrokenMonitor:
+        def update(self, run):
+            raise ValueError("bad drift state")
+
+    monkeypatch.setattr(evaluators, 'get_drift_monitor', lambda model: BrokenMonitor())
+    results = evaluators.simulate_evaluation({}, PROMPT, ['Quality Evaluation', DRIFT_EVALUATOR], latency=0)
+
+    assert results['evaluations'][DRIFT_EVALUATOR] == {'status': 'failed', 'error': "bad drift state"}
+    assert results['evaluations']['Quality Evaluation']['status'] == 'completed'
@@ -0,0 +1,52 @@
+"""Group fairness metrics"""
+import warnings
+
+import pandas as pd
+
+from gov_eval.fairness import FAIRNESS_CONFIDENCE, confidence_level, confusion_counts, evaluate_fairness, run_fairness
+
+
+def fairness(groups, labels, predictions, **kwargs):
+    frame = pd.DataFrame({'group': groups, 'label': labels, 'prediction': predictions})
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        return evaluate_fairness(confusion_counts(frame), seed=0, **kwargs)
+
+
+def test_metrics():
+    result = fairness(['a', 'a', 'b', 'b'], [1, 0, 1, 0], [1, 1, 1, 0])
+
+    assert result['demographic_parity'] == 0.5
+    assert result['statistical_parity'] == 0.5
+    assert result['equalized_odds'] == 0.0
+    assert result['groups']['b'] == {'rows': 2, 'selection_rate': 0.5, 'true_positive_rate': 1.0,
+                                     'false_positive_rate': 0.0}
+
+
+def test_rate_defined_for_one_group_is_undefined():
+    # Only a has positive labels and only b negative ones, so neither rate can be compared
+    result = fairness(['a', 'a', 'b'], [1, 1, 0], [1, 0, 0])
+
+    assert result['equalized_odds'] is None
+    assert result['confidence_intervals']['equalized_odds'] == [None, None]
+    assert result['groups']['b']['true_positive_rate'] is None
+    assert result['statistical_parity'] == 0.5
+
+
+def test_equalized_odds_uses_the_comparable_rate():
+    # Both groups have negative labels but only a has positive ones
+    result = fairness(['a', 'a', 'b', 'b'], [1, 0, 0, 0], [1, 1, 0, 0])
+
+    assert result['equalized_odds'] == 0.0
+
+
+def test_confidence_is_its_own_setting():
+    counts = confusion_counts(pd.DataFrame({'group': ['a', 'b'] * 50, 'label': [1, 0, 0, 1] * 25,
+                                            'prediction': [1, 1, 0, 0] * 25}))
+
+    assert confidence_level({'enable_guardrails': False}) == FAIRNESS_CONFIDENCE
+    assert confidence_level({'guardrails_config': {'confidence_threshold': 0.5}}) == FAIRNESS_CONFIDENCE
+    narrow = run_fairness({'fairness_counts': counts, 'fairness_confidence': 0.5, 'seed': 1})
+    wide = run_fairness({'fairness_counts': counts, 'fairness_confidence': 0.99, 'seed': 1})
+    low, high = narrow['confidence_intervals']['statistical_parity']
+    assert wide['confidence_intervals']['statistical_parity'][0] <= low <= high
@@ -0,0 +1,57 @@
+"""Embedding store and memoized embedding"""
+import numpy as np
+
+from gov_eval.rag import EmbeddingStore, HashingEmbedder, embed_texts
+
+
+def test_memoized_embeddings_match_fresh_ones():
+    embedder = HashingEmbedder(64)
+    store = EmbeddingStore(embedder.dim)
+    texts = ['alpha beta', 'gamma', 'alpha beta', 'delta epsilon']
+
+    first = embed_texts(texts, embedder, store)
+    second = embed_texts(texts, embedder, store)
+
+    np.testing.assert_array_equal(first, embedder(texts))
+    np.testing.assert_array_equal(second, first)
+    assert len(store) == 3
+    assert store.hits == 3
+
+
+def test_memory_store_evicts_least_recently_used():
+    embedder = HashingEmbedder(64)
+    store = EmbeddingStore(embedder.dim, max_rows=2)
+
+    embed_texts(['one', 'two'], embedder, store)
+    embed_texts(['one'], embedder, store)
+    embed_texts(['three'], embedder, store)
+
+    assert len(store) == 2
+    assert store.hits == 1
+    # two was least recently used, so it is embedded again
+    embed_texts(['one', 'three', 'two'], embedder, store)
+    assert store.hits == 3
+
+
+def test_batch_larger_than_memory_store():
+    embedder = HashingEmbedder(64)
+    store = EmbeddingStore(embedder.dim, max_rows=3)
+    texts = [f'text {i}' for i in range(10)]
+
+    vectors = embed_texts(texts + texts[:2], embedder, store)
+
+    np.testing.assert_array_equal(vectors, embedder(texts + texts[:2]))
+    assert len(store) == 3
+    np.testing.assert_array_equal(embed_texts(texts[-3:], embedder, store), embedder(texts[-3:]))
+    assert store.hits == 3
+
+
+def test_store_on_disk_is_unbounded(tmp_path):
+    embedder = HashingEmbedder(64)
+    texts = [f'text {i}' for i in range(5)]
+    embed_texts(texts, embedder, EmbeddingStore(embedder.dim, str(tmp_path), max_rows=2))
+
+    reopened = EmbeddingStore(embedder.dim, str(tmp_path))
+    np.testing.assert_array_equal(embed_texts(texts, embedder, reopened), embedder(texts))
+    assert len(reopened) == 5
+    assert reopened.hits == 5